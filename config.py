@@ -47,10 +47,51 @@ MODO_ESTRITO = False  # Default: False
 # Separador para arquivos CSV
 CSV_SEPARATOR = ";"
 
+# Linhas lidas por bloco na leitura em fluxo de CSVs (ProcessadorCSV.carregar_em_fluxo)
+TAMANHO_BLOCO_CSV = 1000
+
+# Bytes por faixa na leitura paralela de CSVs (ProcessadorCSV.carregar_em_paralelo)
+TAMANHO_FAIXA_CSV_PARALELO = 16 * 1024 * 1024
+
+# Grava o índice de linhas ("<csv>.idx") usado na leitura de registros específicos (main.py --registros)
+PERSISTIR_INDICE_CSV = True
+
+# Leitura em fluxo de registros JSON, NDJSON e arrays JSON (src/leitor_json.py):
+# bytes lidos por vez e registros entre mensagens de progresso
+TAMANHO_BUFFER_JSON = 1024 * 1024
+INTERVALO_PROGRESSO_LEITURA = 10000
+
 # Para uso com o processador CSV (legado)
 ENTREVISTAS_CSV = os.path.join(BASE_DIR, "dados", "dados.csv")
 DEFINICAO_CAMPOS_CSV = CAMPOS_CSV
 
+# Backend de renderização dos documentos:
+# "docx" (python-docx, suporta seções condicionais) ou "xml" (substituição direta no XML do pacote)
+BACKEND_RENDERIZACAO = "docx"
+
+# Processamento paralelo de lotes CSV (main.py --workers):
+# quantidade padrão de processos e de registros enviados a cada processo por vez
+WORKERS_PADRAO = 1
+TAMANHO_BLOCO_WORKERS = 32
+
+# Gravação do lote em um único arquivo ZIP/TAR (main.py --saida-arquivo):
+# compressão padrão ("nenhuma", "deflate", "bzip2" ou "lzma", opcionalmente com ":nível"; None = padrão
+# do formato) e documentos que podem aguardar na fila da thread de gravação
+COMPRESSAO_ARQUIVO_SAIDA = None
+TAMANHO_FILA_GRAVACAO = 64
+
+# Snapshot compilado do modelo relacional de campos (src/snapshot_modelo.py): lido no lugar
+# dos CSVs de CAMPOS_DEFINICAO_DIR enquanto eles não mudarem
+SNAPSHOT_MODELO_CAMPOS = os.path.join(CAMPOS_DEFINICAO_DIR, "modelo_campos.snapshot")
+USAR_SNAPSHOT_MODELO = True
+
+# Leitura dos CSVs sem o pandas (src/leitor_csv_simples.py):
+# carregador das tabelas do modelo ("csv" ou "pandas"), carregador dos CSVs de entrevistas
+# ("auto", "csv" ou "pandas") e tamanho máximo do arquivo lido com o módulo csv no modo "auto"
+CARREGADOR_MODELO = "csv"
+CARREGADOR_CSV = "auto"
+LIMITE_CARREGADOR_SIMPLES_CSV = 4 * 1024 * 1024
+
 # Arquivos de metadados
 TEMPLATE_METADATA_CSV = os.path.join(CAMPOS_DEFINICAO_DIR, "template_metadata.csv")
 
@@ -8,6 +8,11 @@ Este script carrega os dados de um arquivo CSV ou JSON, processa as regras e ger
 Uso:
     python main.py --template <arquivo_template> --csv <arquivo_csv> --saida <arquivo_output>
     python main.py --template <arquivo_template> --dados <arquivo_json> --saida <arquivo_output>
+    python main.py --template <arquivo_template> --dados <arquivo_ndjson_ou_array_json>
+    python main.py --template <arquivo_template> --csv <arquivo_csv> --workers 8
+    python main.py --template <arquivo_template> --csv <arquivo_csv> --registros 1000-1999
+    python main.py --template <arquivo_template> --csv <planilha.xlsx> --planilha Entrevistas
+    cat registros.ndjson | python main.py --template <arquivo_template> --stdin --stdout-zip > lote.zip
 """
 
 import os
@@ -15,7 +20,8 @@ import sys
 import json
 import argparse
 import logging
-from typing import Dict, Any, Optional, List, Union, cast
+from itertools import chain, islice
+from typing import Dict, Any, Iterator, Optional, List, Tuple, Union, cast
 
 # Adiciona o diretório atual ao path
 # Garante que o diretório do script seja o primeiro no sys.path para priorizar módulos locais.
@@ -32,7 +38,13 @@ sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 import config # Carrega as configurações globais do projeto
 from src.motor_regras import MotorRegras # Responsável por carregar e avaliar regras
 from src.documento_processor import DocumentoProcessor # Responsável por processar o template DOCX
-from src.processador_csv import ProcessadorCSV # Responsável por processar o arquivo CSV
+from src.documento_processor_xml import DocumentoProcessorXML # Backend de renderização direta no XML
+from src.processador_csv import CARREGADORES_CSV, ProcessadorCSV # Responsável por processar o arquivo CSV
+from src.processamento_paralelo import processar_lote_paralelo # Distribui lotes CSV entre processos
+from src.manifesto_campos import construir_manifesto # Campos necessários para o template
+from src.leitor_json import carregar_json_em_fluxo, iterar_registros_json # Leitura em fluxo de JSON, NDJSON e arrays JSON
+from src.entrada_padrao import abrir_entrada_padrao, detectar_formato_entrada, FORMATO_CSV # Registros pela entrada padrão
+from src.arquivo_saida import abrir_arquivo_saida, interpretar_compressao, reservar_saida_padrao # Documentos gravados em ZIP/TAR
 from src.logger import logger, configurar_logger # Módulo de logging customizado
 from src.exceptions import ( # Exceções customizadas para tratamento de erros específico
     ArquivoNaoEncontradoError,
@@ -65,16 +77,15 @@ def carregar_dados_csv(arquivo_csv: str) -> Dict[str, Any]:
         # Inicializa o processador CSV
         processador = ProcessadorCSV()
         
-        # Carrega o arquivo CSV
-        registros = processador.carregar_arquivo(arquivo_csv)
+        # Lê apenas até o primeiro registro do CSV
+        registros = processador.carregar_em_fluxo(arquivo_csv)
+        dados = next(registros, None)
+        registros.close()
         
         # Verifica se há pelo menos um registro
-        if not registros or len(registros) == 0:
+        if dados is None:
             raise DadosInvalidosError("Arquivo CSV não contém registros.")
         
-        # Usa o primeiro registro como dados para o documento
-        dados = registros[0]
-        
         logger.info(f"Dados carregados com sucesso do arquivo CSV: {arquivo_csv}")
         logger.debug(f"Total de campos carregados dos dados: {len(dados)}")
         return dados
@@ -116,6 +127,84 @@ def carregar_dados_json(arquivo_json: str) -> Dict[str, Any]:
         logger.error(f"Erro inesperado ao carregar dados do arquivo '{arquivo_json}': {str(e)}")
         raise FormatoArquivoInvalidoError(f"Erro ao carregar dados do arquivo '{arquivo_json}': {str(e)}")
 
+def interpretar_intervalo_registros(texto: str) -> Tuple[int, Optional[int]]:
+    """
+    Interpreta a opção --registros: um número ("48213"), uma faixa ("1000-1999")
+    ou uma faixa aberta ("1000-"), com registros numerados a partir de 1.
+    
+    Args:
+        texto: Valor informado na linha de comando.
+        
+    Returns:
+        Tupla (primeiro, último) com posições 0-based; último é None na faixa aberta.
+        
+    Raises:
+        argparse.ArgumentTypeError: Se o texto não for um número ou faixa válida.
+    """
+    inicio_texto, separador, fim_texto = texto.strip().partition('-')
+    try:
+        primeiro = int(inicio_texto)
+        ultimo = (int(fim_texto) if fim_texto.strip() else None) if separador else primeiro
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Intervalo de registros inválido: '{texto}' (use N, N-M ou N-)")
+    if primeiro < 1:
+        raise argparse.ArgumentTypeError(f"Intervalo de registros inválido: '{texto}' (registros numerados a partir de 1)")
+    if ultimo is not None and ultimo < primeiro:
+        raise argparse.ArgumentTypeError(f"Intervalo de registros inválido: '{texto}' (o último registro vem antes do primeiro)")
+    return primeiro - 1, (ultimo - 1 if ultimo is not None else None)
+
+def validar_compressao(texto: str) -> str:
+    """
+    Valida a opção --compressao (ex.: "deflate" ou "deflate:9").
+    
+    Raises:
+        argparse.ArgumentTypeError: Se o método ou o nível forem inválidos.
+    """
+    try:
+        interpretar_compressao(texto)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e))
+    return texto
+
+def selecionar_intervalo(registros: Iterator[Any], primeiro: int, ultimo: Optional[int]) -> Iterator[Any]:
+    """
+    Entrega apenas os registros primeiro..ultimo (0-based, inclusive) de uma leitura
+    sequencial, encerrando a leitura ao passar do último.
+    
+    Args:
+        registros: Gerador de registros (é fechado ao final).
+        primeiro: Posição do primeiro registro.
+        ultimo: Posição do último registro (None: até o fim).
+    """
+    try:
+        for posicao, registro in enumerate(registros):
+            if ultimo is not None and posicao > ultimo:
+                break
+            if posicao >= primeiro:
+                yield registro
+    finally:
+        registros.close()
+
+def montar_padrao_saida(output_path_base: str, multiplos_registros: bool) -> str:
+    """
+    Monta o padrão de caminho de saída usado por DocumentoProcessor.processar_lote.
+    
+    Args:
+        output_path_base: Caminho de saída informado (ou gerado) para o documento.
+        multiplos_registros: Se True, cada documento recebe o sufixo _<número do registro>.
+        
+    Returns:
+        Padrão de caminho com "{indice}" no lugar do número do registro.
+    """
+    # Chaves no próprio caminho não podem ser interpretadas pelo str.format
+    base = output_path_base.replace('{', '{{').replace('}', '}}')
+    if multiplos_registros:
+        nome_base, ext = os.path.splitext(base)
+        return f"{nome_base}_{{indice}}{ext}"
+    if not base.endswith('.docx'):
+        return f"{base}.docx"
+    return base
+
 def main() -> int:
     """
     Função principal do script.
@@ -128,14 +217,30 @@ def main() -> int:
     # Configura o parser de argumentos da linha de comando
     parser = argparse.ArgumentParser(description='Processa templates de documentos DOCX para peticionamento jurídico.')
     parser.add_argument('--template', required=False, help='Caminho para o arquivo de template DOCX. Usa o padrão de config.py se não fornecido.')
-    parser.add_argument('--csv', required=False, help='Caminho para o arquivo CSV com os dados da entrevista. Prioridade sobre JSON se ambos forem fornecidos.')
-    parser.add_argument('--dados', required=False, help='Caminho para o arquivo JSON com os dados da entrevista. Usado apenas se --csv não for fornecido.')
+    parser.add_argument('--csv', required=False, help='Caminho para o arquivo CSV (ou planilha .xlsx) com os dados da entrevista. Prioridade sobre JSON se ambos forem fornecidos.')
+    parser.add_argument('--planilha', required=False, help='Nome da planilha lida de um arquivo .xlsx (padrão: a primeira).')
+    parser.add_argument('--dados', required=False, help='Caminho para o arquivo JSON com os dados da entrevista (um objeto, JSON Lines ou array de objetos). Usado apenas se --csv não for fornecido.')
     parser.add_argument('--saida', required=False, help='Caminho para salvar o documento DOCX processado. Gera nome automático em config.OUTPUT_DIR se não fornecido.')
     parser.add_argument('--debug', action='store_true', help='Ativa modo de depuração com logs mais detalhados (nível DEBUG).')
     parser.add_argument('--usar-modelo-relacional', action='store_true', help='Força o uso do modelo relacional refatorado (atualmente, o padrão já tenta usá-lo).')
-    parser.add_argument('--primeiro-registro', action='store_true', help='Processa apenas o primeiro registro do CSV.')
+    parser.add_argument('--primeiro-registro', action='store_true', help='Processa apenas o primeiro registro do CSV ou JSON.')
+    parser.add_argument('--registros', type=interpretar_intervalo_registros, help='Processa apenas um registro ou faixa de registros (ex.: 48213 ou 1000-1999, a partir de 1). No CSV, as linhas são lidas diretamente pelo índice de linhas "<csv>.idx".')
+    parser.add_argument('--stdin', action='store_true', help='Lê os registros da entrada padrão (CSV ou JSON/NDJSON, detectado pelo conteúdo) em vez de --csv/--dados. Os documentos recebem sempre o número do registro no nome (exceto com --primeiro-registro).')
+    parser.add_argument('--stdout-zip', action='store_true', help='Grava os documentos em um ZIP na saída padrão, à medida que são gerados, sem arquivos em disco (mensagens vão para a saída de erros).')
+    parser.add_argument('--saida-arquivo', required=False, help='Grava todos os documentos em um único arquivo .zip, .tar, .tar.gz, .tar.bz2 ou .tar.xz (com o manifesto "manifesto.jsonl"), em vez de um arquivo DOCX por registro.')
+    parser.add_argument('--compressao', type=validar_compressao, default=config.COMPRESSAO_ARQUIVO_SAIDA, help='Compressão de --saida-arquivo e --stdout-zip: "nenhuma", "deflate", "bzip2" ou "lzma", opcionalmente com nível (ex.: deflate:6). Padrão: sem recompressão no ZIP; no TAR, a da extensão.')
+    parser.add_argument('--todas-colunas', action='store_true', help='Lê e converte todas as colunas do CSV, e não apenas os campos usados pelo template e pelas regras condicionais.')
+    parser.add_argument('--workers', type=int, default=config.WORKERS_PADRAO, help='Quantidade de processos para gerar os documentos de um CSV em paralelo (1 = processamento serial).')
+    parser.add_argument('--workers-leitura', type=int, default=1, help='Quantidade de processos para ler e converter o CSV em paralelo (indicado para arquivos de vários GB; 1 = leitura em fluxo).')
+    parser.add_argument('--carregador', choices=list(CARREGADORES_CSV), default=config.CARREGADOR_CSV, help='Leitura do CSV: "pandas", "csv" (módulo csv, sem importar pandas e numpy) ou "auto" (csv para arquivos pequenos, ver config.LIMITE_CARREGADOR_SIMPLES_CSV).')
+    parser.add_argument('--backend', choices=['docx', 'xml'], default=config.BACKEND_RENDERIZACAO, help='Backend de renderização: "docx" (python-docx) ou "xml" (substituição direta no XML, mais rápido para templates sem seções condicionais).')
     
     args = parser.parse_args()
+    if args.stdout_zip and args.saida_arquivo:
+        parser.error("--stdout-zip e --saida-arquivo não podem ser usados juntos")
+    
+    # A saída padrão é reservada ao ZIP antes de qualquer mensagem
+    saida_padrao = reservar_saida_padrao() if args.stdout_zip else None
     
     # Importa o novo configurador de logger
     try:
@@ -158,9 +263,17 @@ def main() -> int:
     fonte_dados_csv = args.csv or config.ENTREVISTAS_CSV
     fonte_dados_json = args.dados or config.DADOS_JSON
     
-    # Verifica se os arquivos existem e decide qual usar
-    usar_csv = os.path.exists(fonte_dados_csv)
-    usar_json = os.path.exists(fonte_dados_json)
+    entrada = None
+    if args.stdin:
+        # Entrada padrão: o formato (CSV ou JSON) é detectado pelo conteúdo
+        entrada = abrir_entrada_padrao()
+        usar_csv = detectar_formato_entrada(entrada) == FORMATO_CSV
+        usar_json = not usar_csv
+        fonte_dados_csv = fonte_dados_json = "<stdin>"
+    else:
+        # Verifica se os arquivos existem e decide qual usar
+        usar_csv = os.path.exists(fonte_dados_csv)
+        usar_json = os.path.exists(fonte_dados_json)
     
     if not usar_csv and not usar_json:
         logger.error("Nenhuma fonte de dados válida encontrada. Verifique os arquivos CSV e JSON.")
@@ -175,6 +288,17 @@ def main() -> int:
         nome_base_template = os.path.splitext(os.path.basename(template_path))[0]
         output_path_base = os.path.join(config.OUTPUT_DIR, f"{nome_base_template}_processado")
     
+    # Com --saida-arquivo ou --stdout-zip, os documentos vão para um único arquivo, gravado em segundo plano
+    arquivo_saida = None
+    if saida_padrao is not None or args.saida_arquivo:
+        try:
+            arquivo_saida = abrir_arquivo_saida(saida_padrao or args.saida_arquivo, args.compressao,
+                                                tamanho_fila=config.TAMANHO_FILA_GRAVACAO)
+        except (OSError, ValueError) as e:
+            logger.error(f"Não foi possível criar o arquivo de saída: {str(e)}")
+            print(f"\nERRO: {str(e)}")
+            return 1
+    
     # Bloco principal de execução com tratamento de exceções
     try:
         logger.info("Iniciando processamento do documento...")
@@ -186,114 +310,158 @@ def main() -> int:
         # Carrega as regras condicionais
         motor_regras.carregar_regras()
         
-        # MODIFICAÇÃO: Processamento para múltiplos registros
-        documentos_gerados = []
+        # Seleciona o backend de renderização
+        classe_processador = DocumentoProcessorXML if args.backend == 'xml' else DocumentoProcessor
+        logger.info(f"Backend de renderização: {args.backend}")
+        
+        # Totais do lote: cada documento é registrado no log ao ficar pronto, sem guardar os resultados
+        total_documentos = 0
+        total_por_status: Dict[str, int] = {}
+        total_com_obrigatorios_ausentes = 0
+        ultimo_caminho = None
+        
+        processador_documento = classe_processador(motor_regras=motor_regras)
+        indice_inicial = 1
         
         if usar_csv:
-            logger.info(f"Utilizando arquivo CSV: {os.path.abspath(fonte_dados_csv)}")
+            eh_xlsx = entrada is None and fonte_dados_csv.lower().endswith('.xlsx')
+            descricao_fonte = "XLSX" if eh_xlsx else "CSV"
+            if entrada is None:
+                logger.info(f"Utilizando arquivo {descricao_fonte}: {os.path.abspath(fonte_dados_csv)}")
             
-            # Carrega todos os registros do CSV
-            processador_csv = ProcessadorCSV()
-            registros = processador_csv.carregar_arquivo(fonte_dados_csv)
+            # Lê o CSV em fluxo: a renderização começa enquanto o arquivo ainda está sendo lido
+            processador_csv = ProcessadorCSV(carregador=args.carregador)
             
-            if not registros:
-                logger.error(f"Nenhum registro encontrado no arquivo CSV: {fonte_dados_csv}")
-                return 1
-            
-            logger.info(f"Carregados {len(registros)} registros do CSV")
-            
-            # Determina quantos registros processar
-            registros_a_processar = registros
-            if args.primeiro_registro:
-                registros_a_processar = [registros[0]]
-                logger.info("Processando apenas o primeiro registro do CSV conforme solicitado")
-            
-            # Processa cada registro
-            for i, dados_entrevista in enumerate(registros_a_processar):
-                # Gera nome do arquivo de saída único para este registro
-                if len(registros_a_processar) > 1:
-                    # Se temos múltiplos registros, adiciona índice ao nome do arquivo
-                    nome_base, ext = os.path.splitext(output_path_base)
-                    output_path = f"{nome_base}_{i+1}{ext}"
+            # Lê e converte apenas as colunas usadas pelo template e pelas regras
+            manifesto = None
+            if not args.todas_colunas:
+                manifesto = construir_manifesto(template_path, motor_regras, processador_documento)
+            if entrada is not None or eh_xlsx:
+                if entrada is not None:
+                    registros = processador_csv.carregar_de_fluxo(entrada, config.TAMANHO_BLOCO_CSV, manifesto=manifesto)
                 else:
-                    # Se é um único registro, usa o nome base diretamente
-                    if not output_path_base.endswith('.docx'):
-                        output_path = f"{output_path_base}.docx"
-                    else:
-                        output_path = output_path_base
-                
-                logger.info(f"Processando registro {i+1}/{len(registros_a_processar)}")
-                
-                # Avalia seções ativas para este registro
-                secoes_ativas = motor_regras.avaliar_secoes_ativas(dados_entrevista)
-                logger.info(f"Seções ativas determinadas: {secoes_ativas if secoes_ativas else 'Nenhuma'}")
-                
-                # Processa o documento para este registro
-                processador_documento = DocumentoProcessor(motor_regras=motor_regras)
-                caminho_documento_gerado = processador_documento.processar_documento(
-                    template_path=template_path,
-                    dados=dados_entrevista,
-                    secoes_ativas=secoes_ativas,
-                    output_path=output_path
-                )
-                
-                # Adiciona à lista de documentos gerados
-                documentos_gerados.append({
-                    'caminho': caminho_documento_gerado,
-                    'estatisticas': processador_documento.obter_estatisticas()
-                })
-                
-                logger.info(f"Documento para registro {i+1} salvo em: {os.path.abspath(caminho_documento_gerado)}")
+                    # Planilha lida em fluxo direto do XML, com a mesma conversão de tipos do CSV
+                    registros = processador_csv.carregar_xlsx(fonte_dados_csv, args.planilha,
+                                                              config.TAMANHO_BLOCO_CSV, manifesto=manifesto)
+                if args.registros is not None:
+                    primeiro, ultimo = args.registros
+                    indice_inicial = primeiro + 1
+                    registros = selecionar_intervalo(registros, primeiro, ultimo)
+            elif args.registros is not None:
+                primeiro, ultimo = args.registros
+                indice_inicial = primeiro + 1
+                if args.workers_leitura > 1:
+                    logger.info("Leitura de registros específicos: --workers-leitura é ignorado")
+                registros = processador_csv.carregar_intervalo(fonte_dados_csv, primeiro, ultimo,
+                                                               config.TAMANHO_BLOCO_CSV, manifesto=manifesto)
+            elif args.workers_leitura > 1:
+                registros = processador_csv.carregar_em_paralelo(fonte_dados_csv, workers=args.workers_leitura,
+                                                                 manifesto=manifesto, debug=args.debug)
+            else:
+                registros = processador_csv.carregar_em_fluxo(fonte_dados_csv, config.TAMANHO_BLOCO_CSV, manifesto=manifesto)
         else:
-            # Processamento para JSON (único registro)
-            logger.info(f"Utilizando arquivo JSON: {os.path.abspath(fonte_dados_json)}")
-            dados_entrevista = carregar_dados_json(fonte_dados_json)
-            
-            # Determina o nome do arquivo de saída
-            if not output_path_base.endswith('.docx'):
-                output_path = f"{output_path_base}.docx"
+            # JSON com um único registro, JSON Lines (NDJSON) ou array JSON, lido em fluxo
+            descricao_fonte = "JSON"
+            if entrada is not None:
+                registros = iterar_registros_json(entrada, descricao=fonte_dados_json)
             else:
-                output_path = output_path_base
-            
-            # Avalia seções ativas
-            secoes_ativas = motor_regras.avaliar_secoes_ativas(dados_entrevista)
-            logger.info(f"Seções ativas determinadas: {secoes_ativas if secoes_ativas else 'Nenhuma'}")
-            
-            # Processa o documento
-            processador_documento = DocumentoProcessor(motor_regras=motor_regras)
-            caminho_documento_gerado = processador_documento.processar_documento(
-                template_path=template_path,
-                dados=dados_entrevista,
-                secoes_ativas=secoes_ativas,
-                output_path=output_path
+                logger.info(f"Utilizando arquivo JSON: {os.path.abspath(fonte_dados_json)}")
+                registros = carregar_json_em_fluxo(fonte_dados_json)
+            if args.registros is not None:
+                # Sem índice de linhas: os registros anteriores são lidos e descartados
+                primeiro, ultimo = args.registros
+                indice_inicial = primeiro + 1
+                registros = selecionar_intervalo(registros, primeiro, ultimo)
+        
+        # Antecipa até dois registros para decidir a nomeação dos arquivos de saída.
+        # Na entrada padrão, o primeiro documento não aguarda o segundo registro: os nomes são sempre numerados
+        lote_da_entrada_padrao = entrada is not None and not args.primeiro_registro
+        antecipados = 1 if args.primeiro_registro or lote_da_entrada_padrao else 2
+        primeiros_registros = list(islice(registros, antecipados))
+        if not primeiros_registros:
+            logger.error(f"Nenhum registro encontrado no arquivo {descricao_fonte}: "
+                         f"{fonte_dados_csv if usar_csv else fonte_dados_json}")
+            return 1
+        
+        # Determina quantos registros processar
+        if args.primeiro_registro:
+            registros.close()
+            registros_a_processar = primeiros_registros
+            logger.info(f"Processando apenas o primeiro registro do {descricao_fonte} conforme solicitado")
+        else:
+            registros_a_processar = chain(primeiros_registros, registros)
+        # Registros específicos mantêm o número do registro no nome, como no processamento do arquivo inteiro
+        multiplos_registros = len(primeiros_registros) > 1 or args.registros is not None or lote_da_entrada_padrao
+        
+        # Processa os registros em lote: template, formatadores e regras são carregados uma única vez
+        # Com --saida-arquivo/--stdout-zip, os documentos são gerados em memória e o caminho é o nome no arquivo
+        em_memoria = arquivo_saida is not None
+        base_saida = output_path_base
+        if em_memoria:
+            base_saida = os.path.basename(output_path_base)
+            if not base_saida.endswith('.docx'):
+                base_saida = f"{base_saida}.docx"
+        padrao_saida = montar_padrao_saida(base_saida, multiplos_registros)
+        if args.workers > 1 and multiplos_registros:
+            resultados = processar_lote_paralelo(
+                template_path, registros_a_processar, padrao_saida,
+                workers=args.workers,
+                backend=args.backend,
+                tamanho_bloco=config.TAMANHO_BLOCO_WORKERS,
+                indice_inicial=indice_inicial,
+                em_memoria=em_memoria,
+                debug=args.debug
             )
+        else:
+            resultados = processador_documento.processar_lote(template_path, registros_a_processar, padrao_saida,
+                                                              indice_inicial=indice_inicial, em_memoria=em_memoria)
+        for resultado in resultados:
+            if em_memoria:
+                arquivo_saida.adicionar(resultado['caminho'], resultado['conteudo'],
+                                        indice=resultado['indice'], estatisticas=resultado['estatisticas'])
+                caminho_exibido = f"{resultado['caminho']} (em {args.saida_arquivo or 'ZIP na saída padrão'})"
+            else:
+                caminho_exibido = os.path.abspath(resultado['caminho'])
+            total_documentos += 1
+            ultimo_caminho = caminho_exibido
+            logger.info(f"Documento para registro {resultado['indice']} salvo em: {caminho_exibido}")
             
-            # Adiciona à lista de documentos gerados
-            documentos_gerados.append({
-                'caminho': caminho_documento_gerado,
-                'estatisticas': processador_documento.obter_estatisticas()
-            })
-            
-            logger.info(f"Documento salvo em: {os.path.abspath(caminho_documento_gerado)}")
-        
-        # Mostra um resumo dos documentos gerados
-        logger.info(f"Processamento concluído. {len(documentos_gerados)} documento(s) gerado(s).")
-        for i, doc in enumerate(documentos_gerados):
-            logger.info(f"Documento {i+1}: {os.path.abspath(doc['caminho'])}")
-            estatisticas = doc['estatisticas']
+            estatisticas = resultado['estatisticas']
             if estatisticas:
-                logger.info(f"  - Status: {estatisticas.get('status', 'N/A')}")
-                logger.info(f"  - Completude: {estatisticas.get('porcentagem_completude', 0):.2f}%")
-                logger.info(f"  - Campos substituídos: {estatisticas.get('total_campos_substituidos', 0)}/{estatisticas.get('total_campos_encontrados', 0)}")
+                status = estatisticas.get('status')
+                if status:
+                    total_por_status[status] = total_por_status.get(status, 0) + 1
+                logger.info(f"  - Status: {status or 'N/A'}; completude: {estatisticas.get('porcentagem_completude', 0):.2f}%; "
+                            f"campos substituídos: {estatisticas.get('total_campos_substituidos', 0)}/{estatisticas.get('total_campos_encontrados', 0)}")
                 
                 # Verifica se há campos obrigatórios ausentes
                 if estatisticas.get('total_campos_obrigatorios_ausentes', 0) > 0:
+                    total_com_obrigatorios_ausentes += 1
                     logger.warning(f"  - ATENÇÃO: {estatisticas.get('total_campos_obrigatorios_ausentes', 0)} campos obrigatórios ausentes!")
+        if arquivo_saida is not None:
+            arquivo_saida.fechar()
+            arquivo_saida = None
+        logger.info(f"Processados {total_documentos} registros do {descricao_fonte}")
+        
+        # Mostra um resumo dos documentos gerados (apenas totais, independente do tamanho do lote)
+        resumo_status = ", ".join(f"{status}: {quantidade}" for status, quantidade in sorted(total_por_status.items()))
+        logger.info(f"Processamento concluído. {total_documentos} documento(s) gerado(s)."
+                    + (f" Status: {resumo_status}." if resumo_status else ""))
+        if total_com_obrigatorios_ausentes:
+            logger.warning(f"ATENÇÃO: {total_com_obrigatorios_ausentes} documento(s) com campos obrigatórios ausentes")
         
         # Saída para o usuário no terminal
-        print(f"\nProcessamento concluído com sucesso! {len(documentos_gerados)} documento(s) gerado(s):")
-        for i, doc in enumerate(documentos_gerados):
-            print(f"  {i+1}. {os.path.abspath(doc['caminho'])}")
+        print(f"\nProcessamento concluído com sucesso! {total_documentos} documento(s) gerado(s).")
+        if total_documentos == 1:
+            print(f"  {ultimo_caminho}")
+        elif args.saida_arquivo or saida_padrao is not None:
+            print(f"  Arquivo: {args.saida_arquivo or 'ZIP na saída padrão'}")
+        elif ultimo_caminho is not None:
+            print(f"  Diretório: {os.path.dirname(ultimo_caminho)}")
+        if resumo_status:
+            print(f"  Status: {resumo_status}")
+        if total_com_obrigatorios_ausentes:
+            print(f"  ATENÇÃO: {total_com_obrigatorios_ausentes} documento(s) com campos obrigatórios ausentes")
         
         return 0  # Retorna sucesso
         
@@ -327,6 +495,11 @@ def main() -> int:
             traceback.print_exc()
             
         return 1
+    finally:
+        # Em caso de falha, o arquivo de saída é encerrado com os documentos já gerados (ou removido,
+        # se a própria gravação falhou), sem deixar um ZIP/TAR truncado
+        if arquivo_saida is not None:
+            arquivo_saida.interromper()
 
 if __name__ == "__main__":
     sys.exit(main())
\ No newline at end of file
@@ -6,15 +6,40 @@ do modelo relacional refatorado (campos_definicao, categorias_campos, etc.)
 de forma compatível com o código existente do sistema.
 """
 
+import csv
 import os
 import sys
-import pandas as pd
-from typing import Dict, List, Any, Optional, Union, Tuple, cast
+from typing import TYPE_CHECKING, Dict, List, Any, Optional, Union, Tuple, cast
 
 # Adiciona o diretório pai ao path para importar módulos
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 import config
+from src.definicao_campos import RegistroCampos, construir_registro_campos
+from src.formatadores_campos import TabelaFormatadores, construir_tabela_formatadores
 from src.logger import logger
+from src.snapshot_modelo import SnapshotModelo, assinar_tabelas
+from src.exceptions import FormatoArquivoInvalidoError
+from src.leitor_csv_simples import ler_tabela_csv
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+# Colunas e linhas de uma tabela (formato "split" do pandas, com valores nativos)
+LinhasTabela = Tuple[List[str], List[List[Any]]]
+
+
+def caminhos_tabelas_modelo() -> Dict[str, str]:
+    """
+    Caminhos dos CSVs das tabelas do modelo relacional, por nome da tabela.
+    """
+    return {
+        'campos': config.CAMPOS_CSV,
+        'categorias': config.CATEGORIAS_CAMPOS_CSV,
+        'regras': config.REGRAS_ATIVACAO_CSV,
+        'tipos': config.TIPOS_DADOS_CSV,
+        'opcoes': config.OPCOES_SELECAO_CSV
+    }
+
 
 class AdaptadorModeloRelacional:
     """
@@ -24,45 +49,140 @@ class AdaptadorModeloRelacional:
     fornece métodos para acessá-las de forma compatível com o código existente.
     """
     
-    def __init__(self):
+    def __init__(self, usar_snapshot: Optional[bool] = None, carregador: Optional[str] = None):
         """
         Inicializa o adaptador carregando as tabelas do modelo relacional.
+        
+        Args:
+            usar_snapshot: Lê (e grava) o snapshot compilado do modelo
+                           (src/snapshot_modelo.py). Se None, usa config.USAR_SNAPSHOT_MODELO.
+            carregador: Leitura dos CSVs: "csv" (biblioteca padrão, sem importar o pandas)
+                        ou "pandas". Se None, usa config.CARREGADOR_MODELO.
         """
-        # Inicializa com DataFrames vazios em vez de None
-        self.campos = pd.DataFrame()
-        self.categorias = pd.DataFrame()
-        self.regras = pd.DataFrame()
-        self.tipos = pd.DataFrame()
-        self.opcoes = pd.DataFrame()
+        self.usar_snapshot = config.USAR_SNAPSHOT_MODELO if usar_snapshot is None else usar_snapshot
+        self.carregador = carregador or config.CARREGADOR_MODELO
+        
+        # Linhas de cada tabela e DataFrames já montados (sob demanda, exceto no carregador pandas)
+        self._linhas_tabelas: Dict[str, LinhasTabela] = {}
+        self._tabelas: Dict[str, 'pd.DataFrame'] = {}
+        
+        # Formatadores de apresentação por nome de campo
+        self.formatadores = TabelaFormatadores()
+        
+        # Definições de campos, indexadas por nome e ID (construídas em _carregar_tabelas)
+        self.registro = RegistroCampos(())
+        
+        # Campos detalhados já montados por obter_campo_por_id
+        self._detalhes_por_id: Dict[int, Optional[Dict[str, Any]]] = {}
         
         # Carrega as tabelas do modelo relacional
         self._carregar_tabelas()
         
+    @property
+    def campos(self) -> 'pd.DataFrame':
+        return self._obter_tabela('campos')
+    
+    @property
+    def categorias(self) -> 'pd.DataFrame':
+        return self._obter_tabela('categorias')
+    
+    @property
+    def regras(self) -> 'pd.DataFrame':
+        return self._obter_tabela('regras')
+    
+    @property
+    def tipos(self) -> 'pd.DataFrame':
+        return self._obter_tabela('tipos')
+    
+    @property
+    def opcoes(self) -> 'pd.DataFrame':
+        return self._obter_tabela('opcoes')
+    
+    def _obter_tabela(self, nome: str) -> 'pd.DataFrame':
+        """
+        Retorna a tabela como DataFrame, montando-o a partir das linhas na primeira consulta.
+        """
+        if nome not in self._tabelas:
+            import pandas as pd
+
+            colunas, linhas = self._linhas_tabelas.get(nome, ([], []))
+            self._tabelas[nome] = pd.DataFrame(linhas, columns=colunas)
+        return self._tabelas[nome]
+    
+    def _registros_tabela(self, nome: str) -> List[Dict[str, Any]]:
+        """
+        Linhas da tabela como dicionários coluna -> valor.
+        """
+        colunas, linhas = self._linhas_tabelas.get(nome, ([], []))
+        return [dict(zip(colunas, linha)) for linha in linhas]
+    
+    def _total_linhas(self, nome: str) -> int:
+        return len(self._linhas_tabelas.get(nome, ([], []))[1])
+    
     def _carregar_tabelas(self) -> None:
         """
-        Carrega todas as tabelas do modelo relacional.
+        Carrega todas as tabelas do modelo relacional, do snapshot compilado
+        quando ele corresponde aos CSVs atuais.
         """
         try:
-            logger.info("Carregando tabelas do modelo relacional...")
+            caminhos = caminhos_tabelas_modelo()
+            snapshot = SnapshotModelo.abrir(config.SNAPSHOT_MODELO_CAMPOS, caminhos) if self.usar_snapshot else None
             
-            # Carrega as tabelas principais
-            self.campos = self._carregar_tabela(config.CAMPOS_CSV)
-            self.categorias = self._carregar_tabela(config.CATEGORIAS_CAMPOS_CSV)
-            self.regras = self._carregar_tabela(config.REGRAS_ATIVACAO_CSV)
-            self.tipos = self._carregar_tabela(config.TIPOS_DADOS_CSV)
-            self.opcoes = self._carregar_tabela(config.OPCOES_SELECAO_CSV)
+            if snapshot is not None:
+                logger.info(f"Carregando modelo relacional do snapshot {config.SNAPSHOT_MODELO_CAMPOS}...")
+                self._linhas_tabelas = snapshot.tabelas
+                self._tabelas = {}
+                self.registro = snapshot.registro
+            else:
+                logger.info("Carregando tabelas do modelo relacional...")
+                
+                # Assina os CSVs antes da leitura: uma alteração durante a carga invalida o snapshot
+                assinaturas = assinar_tabelas(caminhos) if self.usar_snapshot else None
+                
+                # Carrega as tabelas principais
+                if self.carregador == 'pandas':
+                    self._tabelas = {nome: self._carregar_tabela(caminho) for nome, caminho in caminhos.items()}
+                    self._linhas_tabelas = {}
+                    for nome, tabela in self._tabelas.items():
+                        dados = tabela.to_dict('split')
+                        self._linhas_tabelas[nome] = ([str(coluna) for coluna in dados['columns']], dados['data'])
+                else:
+                    self._tabelas = {}
+                    self._linhas_tabelas = {nome: self._carregar_tabela_simples(caminho)
+                                            for nome, caminho in caminhos.items()}
+                
+                # Verifica se as tabelas foram carregadas corretamente
+                self._validar_tabelas()
+                
+                # Associa as tabelas por campo, para as consultas por nome e ID
+                self.registro = construir_registro_campos(*(self._registros_tabela(nome) for nome in
+                                                            ('campos', 'tipos', 'regras', 'categorias', 'opcoes')))
+                
+                if assinaturas is not None:
+                    self._salvar_snapshot(assinaturas)
+            self._detalhes_por_id = {}
             
-            # Verifica se as tabelas foram carregadas corretamente
-            self._validar_tabelas()
+            # Decide a formatação de cada campo uma única vez
+            self.formatadores = self._construir_formatadores()
             
-            logger.info(f"Tabelas carregadas com sucesso: {len(self.campos)} campos, "
-                       f"{len(self.categorias)} categorias, {len(self.regras)} regras, "
-                       f"{len(self.tipos)} tipos, {len(self.opcoes)} opções")
+            logger.info(f"Tabelas carregadas com sucesso: {self._total_linhas('campos')} campos, "
+                       f"{self._total_linhas('categorias')} categorias, {self._total_linhas('regras')} regras, "
+                       f"{self._total_linhas('tipos')} tipos, {self._total_linhas('opcoes')} opções")
         except Exception as e:
             logger.error(f"Erro ao carregar tabelas do modelo relacional: {str(e)}")
             raise
     
-    def _carregar_tabela(self, caminho: str) -> pd.DataFrame:
+    def _salvar_snapshot(self, assinaturas: Dict[str, Any]) -> None:
+        """
+        Grava o snapshot do modelo carregado; uma falha na gravação não impede o uso do modelo.
+        """
+        try:
+            SnapshotModelo(assinaturas, self._linhas_tabelas, self.registro).salvar(config.SNAPSHOT_MODELO_CAMPOS)
+            logger.debug(f"Snapshot do modelo relacional gravado em {config.SNAPSHOT_MODELO_CAMPOS}")
+        except OSError as e:
+            logger.warning(f"Não foi possível gravar o snapshot do modelo relacional: {str(e)}")
+    
+    def _carregar_tabela(self, caminho: str) -> 'pd.DataFrame':
         """
         Carrega uma tabela do modelo relacional a partir de um arquivo CSV.
         
@@ -76,6 +196,8 @@ class AdaptadorModeloRelacional:
             FileNotFoundError: Se o arquivo não for encontrado.
             Exception: Para outros erros ao processar o CSV.
         """
+        import pandas as pd
+        
         try:
             if not os.path.exists(caminho):
                 raise FileNotFoundError(f"Arquivo não encontrado: {caminho}")
@@ -92,6 +214,37 @@ class AdaptadorModeloRelacional:
             logger.error(f"Erro ao carregar tabela {os.path.basename(caminho)}: {str(e)}")
             raise
     
+    def _carregar_tabela_simples(self, caminho: str) -> LinhasTabela:
+        """
+        Carrega uma tabela do modelo relacional com o módulo csv, com os mesmos
+        valores da leitura com o pandas (ver src/leitor_csv_simples.py).
+        
+        Args:
+            caminho: Caminho para o arquivo CSV.
+            
+        Returns:
+            Tupla (colunas, linhas) da tabela.
+            
+        Raises:
+            FileNotFoundError: Se o arquivo não for encontrado.
+            Exception: Para outros erros ao processar o CSV.
+        """
+        try:
+            if not os.path.exists(caminho):
+                raise FileNotFoundError(f"Arquivo não encontrado: {caminho}")
+            
+            # Tenta carregar o CSV com separador padrão
+            try:
+                return ler_tabela_csv(caminho, config.CSV_SEPARATOR)
+            except FormatoArquivoInvalidoError:
+                # Detecta o separador como fallback
+                with open(caminho, 'r', encoding='utf-8-sig', newline='') as arquivo:
+                    separador = csv.Sniffer().sniff(arquivo.read(4096), delimiters=',;\t|').delimiter
+                return ler_tabela_csv(caminho, separador)
+        except Exception as e:
+            logger.error(f"Erro ao carregar tabela {os.path.basename(caminho)}: {str(e)}")
+            raise
+    
     def _validar_tabelas(self) -> None:
         """
         Valida se as tabelas do modelo relacional foram carregadas corretamente.
@@ -100,44 +253,58 @@ class AdaptadorModeloRelacional:
             Exception: Se alguma tabela estiver vazia ou com formato inválido.
         """
         # Verifica se as tabelas estão vazias
-        if len(self.campos) == 0:
+        if self._total_linhas('campos') == 0:
             raise Exception("Tabela de campos vazia ou não carregada")
             
-        if len(self.categorias) == 0:
+        if self._total_linhas('categorias') == 0:
             raise Exception("Tabela de categorias vazia ou não carregada")
             
-        if len(self.regras) == 0:
+        if self._total_linhas('regras') == 0:
             raise Exception("Tabela de regras vazia ou não carregada")
             
-        if len(self.tipos) == 0:
+        if self._total_linhas('tipos') == 0:
             raise Exception("Tabela de tipos vazia ou não carregada")
         
         # Verifica se as colunas principais existem
-        colunas_campos = ['campo_id', 'nome_campo']
-        colunas_categorias = ['campo_id', 'categoria_1']
-        colunas_regras = ['regra_id', 'campo_id', 'campo_vinculo_id']
-        colunas_tipos = ['tipo_dado_id', 'nome_tipo']
+        colunas_obrigatorias = {
+            'campos': ('campos', ['campo_id', 'nome_campo']),
+            'categorias': ('categorias', ['campo_id', 'categoria_1']),
+            'regras': ('regras', ['regra_id', 'campo_id', 'campo_vinculo_id']),
+            'tipos': ('tipos', ['tipo_dado_id', 'nome_tipo'])
+        }
+        for nome, (descricao, colunas) in colunas_obrigatorias.items():
+            colunas_tabela = self._linhas_tabelas.get(nome, ([], []))[0]
+            for coluna in colunas:
+                if coluna not in colunas_tabela:
+                    raise Exception(f"Coluna '{coluna}' não encontrada na tabela de {descricao}")
+    
+    def _construir_formatadores(self) -> TabelaFormatadores:
+        """
+        Compila a tabela de formatadores a partir das definições de campos e
+        da obrigatoriedade da primeira regra de cada campo.
         
-        for coluna in colunas_campos:
-            if coluna not in self.campos.columns:
-                raise Exception(f"Coluna '{coluna}' não encontrada na tabela de campos")
-                
-        for coluna in colunas_categorias:
-            if coluna not in self.categorias.columns:
-                raise Exception(f"Coluna '{coluna}' não encontrada na tabela de categorias")
-                
-        for coluna in colunas_regras:
-            if coluna not in self.regras.columns:
-                raise Exception(f"Coluna '{coluna}' não encontrada na tabela de regras")
-                
-        for coluna in colunas_tipos:
-            if coluna not in self.tipos.columns:
-                raise Exception(f"Coluna '{coluna}' não encontrada na tabela de tipos")
+        Returns:
+            TabelaFormatadores indexada por nome_campo.
+        """
+        return construir_tabela_formatadores(
+            {
+                'campo_id': definicao.campo_id,
+                'nome_campo': definicao.nome_campo,
+                'tipo_dado_programacao': definicao.tipo_dado_programacao,
+                'tipo_formatacao': definicao.tipo_formatacao,
+                'mascara_formato': definicao.mascara_formato,
+                'obrigatorio_quando_ativo': definicao.obrigatorio_quando_ativo
+            }
+            for definicao in self.registro
+        )
     
     def obter_campo_por_id(self, campo_id: int) -> Optional[Dict[str, Any]]:
         """
         Obtém as informações de um campo pelo seu ID.
         
+        O dicionário é montado na primeira consulta a partir do registro de
+        definições e reaproveitado nas seguintes; não deve ser modificado.
+        
         Args:
             campo_id: ID do campo.
             
@@ -145,50 +312,11 @@ class AdaptadorModeloRelacional:
             Dicionário com as informações do campo, ou None se não encontrado.
         """
         try:
-            # Filtra o campo pelo ID
-            campo = self.campos[self.campos['campo_id'] == campo_id]
-            
-            if len(campo) == 0:
-                return None
-                
-            # Converte para dicionário
-            resultado = campo.iloc[0].to_dict()
-            
-            # Adiciona informações de tipo
-            if 'tipo_dado_id' in resultado and pd.notna(resultado['tipo_dado_id']):
-                tipo_id = int(resultado['tipo_dado_id'])
-                tipo = self.tipos[self.tipos['tipo_dado_id'] == tipo_id]
-                
-                if len(tipo) > 0:
-                    resultado['tipo_dado_programacao'] = tipo.iloc[0]['nome_tipo']
-                    resultado['mascara_formato'] = tipo.iloc[0]['mascara_formato'] if 'mascara_formato' in tipo.columns else ''
-            
-            # Adiciona regras de ativação
-            regras_campo = self.regras[self.regras['campo_id'] == campo_id]
-            if len(regras_campo) > 0:
-                # Pega a primeira regra para obrigatoriedade
-                resultado['obrigatorio_quando_ativo'] = regras_campo.iloc[0]['obrigatorio_quando_ativo'] == 'sim'
-                
-                # Adiciona informações de vinculação da primeira regra
-                if pd.notna(regras_campo.iloc[0]['campo_vinculo_id']):
-                    resultado['campo_vinculo_id'] = regras_campo.iloc[0]['campo_vinculo_id']
-                    resultado['condicao_vinculo_tipo'] = regras_campo.iloc[0]['condicao_vinculo_tipo']
-                    resultado['condicao_vinculo_valor'] = regras_campo.iloc[0]['condicao_vinculo_valor']
-            
-            # Adiciona categoria
-            categorias_campo = self.categorias[self.categorias['campo_id'] == campo_id]
-            if len(categorias_campo) > 0:
-                resultado['categoria'] = categorias_campo.iloc[0]['categoria_1']
-                resultado['subcategoria'] = categorias_campo.iloc[0]['subcategoria_1'] if 'subcategoria_1' in categorias_campo.columns else ''
-            
-            # Adiciona opções de seleção
-            if 'campo_id' in self.opcoes.columns:
-                opcoes_campo = self.opcoes[self.opcoes['campo_id'] == campo_id]
-                if len(opcoes_campo) > 0 and 'valor' in opcoes_campo.columns:
-                    opcoes_lista = opcoes_campo['valor'].tolist()
-                    resultado['opcoes_lista_selecao'] = ';'.join(opcoes_lista)
-            
-            return resultado
+            campo_id = int(campo_id)
+            if campo_id not in self._detalhes_por_id:
+                definicao = self.registro.por_id(campo_id)
+                self._detalhes_por_id[campo_id] = definicao.como_dict() if definicao is not None else None
+            return self._detalhes_por_id[campo_id]
         except Exception as e:
             logger.error(f"Erro ao obter campo por ID {campo_id}: {str(e)}")
             return None
@@ -203,21 +331,10 @@ class AdaptadorModeloRelacional:
         Returns:
             Dicionário com as informações do campo, ou None se não encontrado.
         """
-        try:
-            # Filtra o campo pelo nome
-            campo = self.campos[self.campos['nome_campo'] == nome_campo]
-            
-            if len(campo) == 0:
-                return None
-                
-            # Obtém o ID do campo
-            campo_id = int(campo.iloc[0]['campo_id'])
-            
-            # Usa o método de obtenção por ID
-            return self.obter_campo_por_id(campo_id)
-        except Exception as e:
-            logger.error(f"Erro ao obter campo por nome '{nome_campo}': {str(e)}")
+        definicao = self.registro.por_nome(nome_campo)
+        if definicao is None:
             return None
+        return self.obter_campo_por_id(definicao.campo_id)
     
     def listar_campos_por_categoria(self, categoria: str) -> List[Dict[str, Any]]:
         """
@@ -263,18 +380,8 @@ class AdaptadorModeloRelacional:
             Lista de dicionários com informações das regras.
         """
         try:
-            # Filtra as regras pelo ID do campo
-            regras_campo = self.regras[self.regras['campo_id'] == campo_id]
-            
-            if len(regras_campo) == 0:
-                return []
-                
-            # Converte para lista de dicionários
-            # Usamos cast para informar ao Pylance que o retorno é compatível
-            resultado = []
-            for _, row in regras_campo.iterrows():
-                resultado.append(row.to_dict())
-            return resultado
+            definicao = self.registro.por_id(int(campo_id))
+            return [dict(regra) for regra in definicao.regras] if definicao is not None else []
         except Exception as e:
             logger.error(f"Erro ao listar regras para campo ID {campo_id}: {str(e)}")
             return []
@@ -283,6 +390,9 @@ class AdaptadorModeloRelacional:
         """
         Converte os dados do modelo relacional para o formato legado usado pelo sistema.
         
+        As tabelas já estão associadas por campo no registro de definições, de
+        modo que a conversão é uma única passagem pelos campos, na ordem da tabela.
+        
         Returns:
             Dicionário no formato do arquivo mapping_campos_definicao.json.
         """
@@ -294,76 +404,24 @@ class AdaptadorModeloRelacional:
                 "campos_por_id": {},
                 "campos_por_categoria": {},
                 "metadata": {
-                    "total_campos": len(self.campos),
+                    "total_campos": self._total_linhas('campos'),
                     "versao_schema": "1.0"
                 }
             }
             
-            # Abordagem mais direta: convertemos o DataFrame inteiro para lista de dicionários
-            campos_lista = []
-            try:
-                # Obtemos os dicionários com a conversão manual
-                for _, row in self.campos.iterrows():
-                    campo_dict = {}
-                    for col_name in self.campos.columns:
-                        campo_dict[col_name] = row[col_name]
-                    campos_lista.append(campo_dict)
-            except Exception as e:
-                logger.error(f"Erro ao converter DataFrame para dicionários: {e}")
-                # Fallback: Tenta a conversão direta como último recurso
-                try:
-                    # Converte coluna por coluna
-                    campos_lista = []
-                    for idx in range(len(self.campos)):
-                        row = self.campos.iloc[idx]
-                        row_dict = {}
-                        for col in self.campos.columns:
-                            val = row[col]
-                            # Evitamos objetos numpy/pandas que possam causar problemas
-                            if pd.api.types.is_scalar(val):
-                                row_dict[col] = val if not pd.isna(val) else None
-                        campos_lista.append(row_dict)
-                except Exception as e2:
-                    logger.error(f"Erro também no fallback: {e2}")
-                    # Se tudo falhar, retorna um dicionário vazio
-                    return resultado
-            
-            # Processa cada registro da lista de dicionários
-            for campo_dict in campos_lista:
-                try:
-                    # Obtém o campo_id com tratamento para valores inválidos
-                    if 'campo_id' in campo_dict and campo_dict['campo_id'] is not None:
-                        # Evita problemas com tipos int64/numpy.int64
-                        campo_id_valor = campo_dict['campo_id']
-                        # Convertemos para um int Python padrão
-                        campo_id = int(campo_id_valor)
-                    else:
-                        logger.warning(f"Campo id não encontrado ou inválido")
-                        continue
-                    
-                    # Obtém os detalhes do campo
-                    campo_detalhado = self.obter_campo_por_id(campo_id)
-                    
-                    if campo_detalhado and 'nome_campo' in campo_detalhado:
-                        nome_campo = campo_detalhado['nome_campo']
-                        
-                        # Adiciona ao mapeamento por nome
-                        resultado["campos"][nome_campo] = campo_detalhado
-                        
-                        # Adiciona ao mapeamento por ID
-                        resultado["campos_por_id"][str(campo_id)] = campo_detalhado
-                        
-                        # Agrupa por categoria
-                        if 'categoria' in campo_detalhado and campo_detalhado['categoria']:
-                            categoria = campo_detalhado['categoria']
-                            
-                            if categoria not in resultado["campos_por_categoria"]:
-                                resultado["campos_por_categoria"][categoria] = []
-                                
-                            resultado["campos_por_categoria"][categoria].append(campo_detalhado)
-                except (ValueError, TypeError) as e:
-                    logger.error(f"Erro ao processar campo: {e}")
-                    continue
+            for definicao in self.registro:
+                # Em IDs repetidos, vale a primeira definição (como em obter_campo_por_id)
+                definicao_id = self.registro.por_id(definicao.campo_id)
+                campo_detalhado = definicao_id.como_dict()
+                nome_campo = definicao_id.nome_campo
+                
+                # Adiciona aos mapeamentos por nome e por ID
+                resultado["campos"][nome_campo] = campo_detalhado
+                resultado["campos_por_id"][str(definicao.campo_id)] = campo_detalhado
+                
+                # Agrupa por categoria
+                if definicao_id.categoria:
+                    resultado["campos_por_categoria"].setdefault(definicao_id.categoria, []).append(campo_detalhado)
             
             # Atualiza metadata
             resultado["metadata"]["total_campos_validos"] = len(resultado["campos"])
@@ -373,4 +431,21 @@ class AdaptadorModeloRelacional:
             return resultado
         except Exception as e:
             logger.error(f"Erro ao converter para formato legado: {str(e)}")
-            raise 
\ No newline at end of file
+            raise
+
+
+# Adaptador compartilhado pelo processo (obter_adaptador_modelo)
+_adaptador_compartilhado: Optional[AdaptadorModeloRelacional] = None
+
+def obter_adaptador_modelo() -> AdaptadorModeloRelacional:
+    """
+    Obtém o adaptador do modelo relacional compartilhado pelo processo,
+    carregando as tabelas na primeira chamada.
+    
+    Returns:
+        AdaptadorModeloRelacional compartilhado.
+    """
+    global _adaptador_compartilhado
+    if _adaptador_compartilhado is None:
+        _adaptador_compartilhado = AdaptadorModeloRelacional()
+    return _adaptador_compartilhado
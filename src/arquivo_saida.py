@@ -0,0 +1,379 @@
+"""
+Gravação dos documentos gerados em um único arquivo ZIP ou TAR.
+
+Usado por main.py --saida-arquivo e --stdout-zip: cada documento renderizado
+em memória é acrescentado ao arquivo assim que fica pronto, sem arquivos
+temporários nem um arquivo por registro no diretório de saída. A gravação
+(e a compressão) é feita por uma thread dedicada (GravadorEmSegundoPlano),
+alimentada por uma fila limitada, enquanto a renderização continua.
+
+Ao final, o arquivo recebe um manifesto (MANIFESTO_ARQUIVO, JSON Lines) com
+uma linha por documento: número do registro, nome no arquivo e estatísticas.
+As linhas do manifesto são acumuladas em um arquivo temporário (em memória
+apenas até _LIMITE_MANIFESTO_MEMORIA bytes), de modo que a memória não cresce
+com a quantidade de documentos.
+
+Se o processamento falhar no meio do lote, GravadorEmSegundoPlano.interromper
+encerra o arquivo com os documentos já gravados (e o manifesto deles); se a
+própria gravação falhou, o arquivo incompleto é removido.
+
+O destino ZIP pode ser um fluxo não posicionável (ex.: a saída padrão ligada
+a um pipe); nesse caso o zipfile grava os tamanhos de cada membro em
+descritores de dados após o conteúdo.
+"""
+
+import io
+import json
+import os
+import queue
+import shutil
+import sys
+import tarfile
+import tempfile
+import threading
+import time
+import zipfile
+from typing import IO, Any, BinaryIO, Dict, Optional, Tuple, Union
+
+from src.exceptions import ProcessamentoDocumentoError
+from src.logger import logger
+
+# Nome do manifesto gravado no final do arquivo
+MANIFESTO_ARQUIVO = "manifesto.jsonl"
+
+# Métodos de compressão aceitos em --compressao (nome -> método do ZIP, compressão do TAR)
+METODOS_COMPRESSAO: Dict[str, Tuple[int, str]] = {
+    'nenhuma': (zipfile.ZIP_STORED, ''),
+    'deflate': (zipfile.ZIP_DEFLATED, 'gz'),
+    'bzip2': (zipfile.ZIP_BZIP2, 'bz2'),
+    'lzma': (zipfile.ZIP_LZMA, 'xz'),
+}
+
+# Bytes do manifesto mantidos em memória antes de passar para um arquivo temporário em disco
+_LIMITE_MANIFESTO_MEMORIA = 1024 * 1024
+
+# Extensões de arquivo TAR e a compressão correspondente
+_EXTENSOES_TAR = (('.tar.gz', 'gz'), ('.tgz', 'gz'), ('.tar.bz2', 'bz2'), ('.tar.xz', 'xz'), ('.tar', ''))
+
+
+def reservar_saida_padrao() -> BinaryIO:
+    """
+    Reserva a saída padrão para dados binários.
+
+    O descritor original da saída padrão é duplicado e devolvido como arquivo
+    binário; em seguida, o descritor 1 passa a apontar para a saída de erros,
+    de modo que prints e logs (inclusive de processos filhos) não se misturam
+    aos dados.
+
+    Returns:
+        Arquivo binário ligado à saída padrão original.
+    """
+    sys.stdout.flush()
+    descritor = os.dup(sys.stdout.fileno())
+    os.dup2(sys.stderr.fileno(), sys.stdout.fileno())
+    return os.fdopen(descritor, 'wb')
+
+
+def interpretar_compressao(texto: Optional[str]) -> Tuple[Optional[str], Optional[int]]:
+    """
+    Interpreta a opção --compressao: "nenhuma", "deflate", "bzip2" ou "lzma",
+    opcionalmente com nível ("deflate:9").
+
+    Returns:
+        Tupla (método, nível); (None, None) se texto for vazio.
+
+    Raises:
+        ValueError: Se o método ou o nível forem inválidos.
+    """
+    if not texto:
+        return None, None
+    metodo, _, nivel = texto.strip().lower().partition(':')
+    if metodo not in METODOS_COMPRESSAO:
+        raise ValueError(f"Compressão inválida: '{texto}' (use {', '.join(METODOS_COMPRESSAO)}, opcionalmente com :nível)")
+    try:
+        return metodo, int(nivel) if nivel else None
+    except ValueError:
+        raise ValueError(f"Nível de compressão inválido: '{texto}'")
+
+
+class GravadorArquivo:
+    """
+    Base dos gravadores: acrescenta documentos um a um e registra o manifesto.
+    """
+
+    def __init__(self, descricao: str, caminho: Optional[str] = None):
+        """
+        Args:
+            descricao: Nome do arquivo, para as mensagens.
+            caminho: Caminho do arquivo em disco (None para fluxos), removido por descartar().
+        """
+        self.descricao = descricao
+        self.caminho = caminho
+        self.total_membros = 0
+        self.total_bytes = 0
+        self.encerrado = False
+        self._manifesto: IO[bytes] = tempfile.SpooledTemporaryFile(max_size=_LIMITE_MANIFESTO_MEMORIA)
+
+    def adicionar(self, nome: str, conteudo: bytes, indice: Optional[int] = None,
+                  estatisticas: Optional[Dict[str, Any]] = None) -> None:
+        """
+        Acrescenta um documento ao arquivo.
+
+        Args:
+            nome: Nome do membro no arquivo.
+            conteudo: Conteúdo do documento.
+            indice: Número do registro, para o manifesto.
+            estatisticas: Estatísticas do processamento, para o manifesto.
+        """
+        self._gravar_membro(nome, conteudo)
+        self.total_membros += 1
+        self.total_bytes += len(conteudo)
+        linha = json.dumps(
+            {'indice': indice, 'nome': nome, 'bytes': len(conteudo), 'estatisticas': estatisticas or {}},
+            ensure_ascii=False, default=str
+        )
+        self._manifesto.write(linha.encode('utf-8') + b"\n")
+
+    def fechar(self) -> None:
+        """
+        Grava o manifesto e encerra o arquivo.
+        """
+        self.encerrado = True
+        tamanho_manifesto = self._manifesto.tell()
+        if tamanho_manifesto:
+            self._manifesto.seek(0)
+            self._copiar_membro(MANIFESTO_ARQUIVO, self._manifesto, tamanho_manifesto)
+        self._manifesto.close()
+        self._encerrar()
+        logger.info(f"Arquivo {self.descricao} concluído: {self.total_membros} documento(s), {self.total_bytes} bytes")
+
+    def descartar(self) -> None:
+        """
+        Encerra o arquivo sem o manifesto, ignorando erros, e remove o arquivo em disco.
+        """
+        self.encerrado = True
+        self._manifesto.close()
+        try:
+            self._encerrar()
+        except Exception:
+            pass
+        if self.caminho is not None:
+            try:
+                os.remove(self.caminho)
+                logger.error(f"Arquivo incompleto removido: {self.caminho}")
+            except OSError as e:
+                logger.error(f"Não foi possível remover o arquivo incompleto {self.caminho}: {str(e)}")
+        else:
+            logger.error(f"Arquivo {self.descricao} incompleto: a gravação foi interrompida")
+
+    def _gravar_membro(self, nome: str, conteudo: bytes) -> None:
+        raise NotImplementedError
+
+    def _copiar_membro(self, nome: str, origem: IO[bytes], tamanho: int) -> None:
+        """
+        Grava um membro a partir de um arquivo aberto, sem carregá-lo em memória.
+        """
+        raise NotImplementedError
+
+    def _encerrar(self) -> None:
+        raise NotImplementedError
+
+    def __enter__(self) -> 'GravadorArquivo':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.fechar()
+
+
+class GravadorZip(GravadorArquivo):
+    """
+    Acrescenta documentos a um arquivo ZIP.
+    """
+
+    def __init__(self, destino: Union[str, BinaryIO], compressao: int = zipfile.ZIP_STORED,
+                 nivel_compressao: Optional[int] = None):
+        """
+        Args:
+            destino: Caminho do arquivo ZIP ou fluxo binário aberto (que não é fechado).
+            compressao: Método de compressão dos membros (zipfile.ZIP_STORED, ZIP_DEFLATED...).
+                        Documentos DOCX já são comprimidos, por isso o padrão é não recomprimir.
+            nivel_compressao: Nível de compressão (ZIP_DEFLATED e ZIP_BZIP2).
+        """
+        super().__init__(destino if isinstance(destino, str) else "<fluxo>",
+                         destino if isinstance(destino, str) else None)
+        self._compressao = compressao
+        self._nivel_compressao = nivel_compressao
+        self._zip = zipfile.ZipFile(destino, mode='w', compression=compressao, compresslevel=nivel_compressao)
+
+    def _info_membro(self, nome: str) -> zipfile.ZipInfo:
+        info = zipfile.ZipInfo(nome, date_time=time.localtime()[:6])
+        info.compress_type = self._compressao
+        info.external_attr = 0o644 << 16
+        return info
+
+    def _gravar_membro(self, nome: str, conteudo: bytes) -> None:
+        self._zip.writestr(self._info_membro(nome), conteudo, compress_type=self._compressao,
+                           compresslevel=self._nivel_compressao)
+
+    def _copiar_membro(self, nome: str, origem: IO[bytes], tamanho: int) -> None:
+        info = self._info_membro(nome)
+        info.file_size = tamanho
+        with self._zip.open(info, mode='w') as destino:
+            shutil.copyfileobj(origem, destino)
+
+    def _encerrar(self) -> None:
+        self._zip.close()
+
+
+class GravadorTar(GravadorArquivo):
+    """
+    Acrescenta documentos a um arquivo TAR (opcionalmente comprimido).
+    """
+
+    def __init__(self, destino: str, compressao: str = '', nivel_compressao: Optional[int] = None):
+        """
+        Args:
+            destino: Caminho do arquivo TAR.
+            compressao: '' (sem compressão), 'gz', 'bz2' ou 'xz'.
+            nivel_compressao: Nível de compressão (preset, no caso de 'xz').
+        """
+        super().__init__(destino, destino)
+        opcoes: Dict[str, Any] = {}
+        if nivel_compressao is not None and compressao:
+            opcoes['preset' if compressao == 'xz' else 'compresslevel'] = nivel_compressao
+        self._tar = tarfile.open(destino, mode=f"w:{compressao}", **opcoes)
+
+    def _gravar_membro(self, nome: str, conteudo: bytes) -> None:
+        self._copiar_membro(nome, io.BytesIO(conteudo), len(conteudo))
+
+    def _copiar_membro(self, nome: str, origem: IO[bytes], tamanho: int) -> None:
+        info = tarfile.TarInfo(nome)
+        info.size = tamanho
+        info.mtime = int(time.time())
+        info.mode = 0o644
+        self._tar.addfile(info, origem)
+
+    def _encerrar(self) -> None:
+        self._tar.close()
+
+
+class GravadorEmSegundoPlano:
+    """
+    Encaminha os documentos a um gravador executado em uma thread dedicada.
+
+    A fila é limitada: se a gravação ficar para trás, adicionar() aguarda, de
+    modo que a memória ocupada por documentos pendentes não cresce com o lote.
+    Um erro de gravação é relançado na próxima chamada de adicionar() ou fechar().
+    """
+
+    _FIM = object()
+
+    def __init__(self, gravador: GravadorArquivo, tamanho_fila: int = 64):
+        """
+        Args:
+            gravador: Gravador que recebe os documentos (usado apenas pela thread).
+            tamanho_fila: Quantidade máxima de documentos aguardando gravação.
+        """
+        self.gravador = gravador
+        self._fila: queue.Queue = queue.Queue(maxsize=max(1, tamanho_fila))
+        self._erro: Optional[BaseException] = None
+        self._thread = threading.Thread(target=self._executar, name="gravador-arquivo-saida", daemon=True)
+        self._thread.start()
+
+    def _executar(self) -> None:
+        while True:
+            item = self._fila.get()
+            if item is self._FIM:
+                break
+            if self._erro is not None:
+                # Após um erro, apenas esvazia a fila para não bloquear quem produz
+                continue
+            try:
+                self.gravador.adicionar(*item)
+            except BaseException as e:
+                logger.error(f"Erro ao gravar '{item[0]}' em {self.gravador.descricao}: {str(e)}")
+                self._erro = e
+
+    def _verificar_erro(self) -> None:
+        if self._erro is not None:
+            raise ProcessamentoDocumentoError(
+                f"Erro ao gravar o arquivo {self.gravador.descricao}: {str(self._erro)}") from self._erro
+
+    def adicionar(self, nome: str, conteudo: bytes, indice: Optional[int] = None,
+                  estatisticas: Optional[Dict[str, Any]] = None) -> None:
+        """
+        Enfileira um documento para gravação (ver GravadorArquivo.adicionar).
+        """
+        self._verificar_erro()
+        self._fila.put((nome, conteudo, indice, estatisticas))
+
+    def _encerrar_fila(self) -> None:
+        if self._thread.is_alive():
+            self._fila.put(self._FIM)
+            self._thread.join()
+
+    def fechar(self) -> None:
+        """
+        Aguarda a gravação dos documentos pendentes e encerra o arquivo (com o manifesto).
+        """
+        self._encerrar_fila()
+        self._verificar_erro()
+        self.gravador.fechar()
+
+    def interromper(self) -> None:
+        """
+        Encerra o arquivo após uma falha do processamento (ou de fechar()), sem relançar erros.
+
+        Os documentos já enfileirados são gravados e o arquivo é encerrado com o
+        manifesto deles, permanecendo válido; se a gravação falhou (ou o arquivo
+        já estava sendo encerrado), o arquivo incompleto é descartado.
+        """
+        self._encerrar_fila()
+        if self._erro is None and not self.gravador.encerrado:
+            try:
+                self.gravador.fechar()
+                logger.warning(f"Processamento interrompido: arquivo {self.gravador.descricao} encerrado com os "
+                               f"{self.gravador.total_membros} documento(s) gerados até a falha")
+                return
+            except Exception as e:
+                logger.error(f"Erro ao encerrar o arquivo {self.gravador.descricao}: {str(e)}")
+        self.gravador.descartar()
+
+
+def abrir_arquivo_saida(destino: Union[str, BinaryIO], compressao: Optional[str] = None,
+                        tamanho_fila: int = 64) -> GravadorEmSegundoPlano:
+    """
+    Abre o arquivo de saída do lote, com gravação em segundo plano.
+
+    O formato vem da extensão do destino: .zip, .tar, .tar.gz/.tgz, .tar.bz2 ou
+    .tar.xz; um fluxo aberto (ex.: a saída padrão) recebe um ZIP.
+
+    Args:
+        destino: Caminho do arquivo ou fluxo binário aberto.
+        compressao: Método e nível de compressão ("deflate:6"; ver interpretar_compressao).
+                    No ZIP, o padrão é não recomprimir os DOCX; no TAR, vale a
+                    compressão da extensão, se o método não for informado.
+        tamanho_fila: Quantidade máxima de documentos aguardando gravação.
+
+    Returns:
+        GravadorEmSegundoPlano pronto para receber os documentos.
+
+    Raises:
+        ValueError: Se a extensão ou a compressão forem inválidas.
+    """
+    metodo, nivel = interpretar_compressao(compressao)
+    nome = destino.lower() if isinstance(destino, str) else ".zip"
+    if isinstance(destino, str) and os.path.dirname(destino):
+        os.makedirs(os.path.dirname(destino), exist_ok=True)
+
+    if nome.endswith('.zip'):
+        gravador: GravadorArquivo = GravadorZip(destino, METODOS_COMPRESSAO[metodo or 'nenhuma'][0], nivel)
+    else:
+        compressao_extensao = next((tipo for extensao, tipo in _EXTENSOES_TAR if nome.endswith(extensao)), None)
+        if compressao_extensao is None:
+            raise ValueError(f"Extensão não suportada para o arquivo de saída: '{destino}' (use .zip, .tar, .tar.gz, .tar.bz2 ou .tar.xz)")
+        compressao_tar = METODOS_COMPRESSAO[metodo][1] if metodo else compressao_extensao
+        gravador = GravadorTar(destino, compressao_tar, nivel)
+
+    logger.info(f"Documentos serão gravados em {gravador.descricao} (compressão: {compressao or 'padrão'})")
+    return GravadorEmSegundoPlano(gravador, tamanho_fila)
@@ -0,0 +1,114 @@
+"""
+Cache em memória de templates DOCX para processamento em lote.
+
+O pacote DOCX é aberto e analisado uma única vez por template. Para cada
+registro, apenas as partes XML alteradas pela renderização (documento
+principal, cabeçalhos e rodapés) são restauradas a partir de uma cópia
+intocada da árvore lxml; as demais partes (estilos, numeração, mídia,
+fontes) são compartilhadas sem cópia, já que a renderização nunca as altera.
+"""
+
+import copy
+import docx
+from typing import Dict, List, Any, Optional
+from docx.document import Document  # Para tipagem
+from docx.opc.constants import RELATIONSHIP_TYPE as RT
+
+from src.plano_renderizacao import (
+    ChaveTemplate,
+    PlanoRenderizacao,
+    chave_template,
+    compilar_plano
+)
+from src.logger import logger
+
+
+class TemplateEmCache:
+    """
+    Template DOCX já analisado, capaz de fornecer uma cópia limpa por registro.
+
+    Não é thread-safe: o pacote é reutilizado entre registros, então cada
+    thread/processo deve manter seu próprio cache.
+    """
+
+    def __init__(self, template_path: str, chave: Optional[ChaveTemplate] = None):
+        """
+        Abre o template, guarda uma cópia intocada das partes renderizáveis
+        e compila o plano de renderização.
+
+        Args:
+            template_path: Caminho do template DOCX.
+            chave: Chave de cache do template (calculada se None).
+        """
+        self.template_path = template_path
+        self.chave = chave or chave_template(template_path)
+
+        documento = docx.Document(template_path)
+        self._parte_documento = documento.part
+
+        # Partes alteradas pela renderização: documento principal, cabeçalhos e rodapés
+        self._partes_renderizaveis: List[Any] = [documento.part]
+        for rel in documento.part.rels.values():
+            if not rel.is_external and rel.reltype in (RT.HEADER, RT.FOOTER):
+                self._partes_renderizaveis.append(rel.target_part)
+
+        # Árvores XML intocadas, copiadas para cada registro
+        self._elementos_originais: Dict[str, Any] = {
+            str(parte.partname): copy.deepcopy(parte.element)
+            for parte in self._partes_renderizaveis
+        }
+
+        self.plano: PlanoRenderizacao = compilar_plano(documento, self.chave)
+        self.total_documentos = 0
+
+    def novo_documento(self) -> Document:
+        """
+        Retorna um documento pronto para renderização, equivalente a abrir o
+        template do disco, sem descompactar nem reanalisar o pacote.
+
+        O documento devolvido anteriormente deixa de ser válido.
+
+        Returns:
+            Documento python-docx com as partes renderizáveis restauradas.
+        """
+        for parte in self._partes_renderizaveis:
+            parte._element = copy.deepcopy(self._elementos_originais[str(parte.partname)])
+        self.total_documentos += 1
+        return self._parte_documento.document
+
+
+# Cache de templates por chave (caminho, mtime, tamanho)
+_CACHE_TEMPLATES: Dict[ChaveTemplate, TemplateEmCache] = {}
+
+
+def obter_template(template_path: str) -> TemplateEmCache:
+    """
+    Obtém o template em cache, carregando-o apenas na primeira vez
+    (ou quando o arquivo for modificado).
+
+    Args:
+        template_path: Caminho do template DOCX.
+
+    Returns:
+        TemplateEmCache correspondente ao template.
+    """
+    chave = chave_template(template_path)
+    template = _CACHE_TEMPLATES.get(chave)
+    if template is not None:
+        return template
+
+    # Descarta versões anteriores do mesmo arquivo
+    for chave_antiga in [c for c in _CACHE_TEMPLATES if c[0] == chave[0]]:
+        del _CACHE_TEMPLATES[chave_antiga]
+
+    template = TemplateEmCache(template_path, chave)
+    _CACHE_TEMPLATES[chave] = template
+    logger.info(f"Template carregado em cache: {template_path} (plano: {template.plano.resumo()})")
+    return template
+
+
+def limpar_cache_templates() -> None:
+    """
+    Remove todos os templates em cache.
+    """
+    _CACHE_TEMPLATES.clear()
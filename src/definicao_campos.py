@@ -0,0 +1,296 @@
+"""
+Definições de campos do modelo relacional, materializadas uma única vez.
+
+Cada DefinicaoCampo reúne, para um campo, a linha de campos_definicao e o que
+as demais tabelas dizem sobre ele: o tipo (tipos_dados), as regras de
+ativação (regras_ativacao), a categoria (categorias_campos) e as opções de
+seleção (opcoes_selecao). Os valores são convertidos para tipos nativos do
+Python na construção (células vazias viram None, inteiros do numpy viram
+int), e os objetos são imutáveis, podendo ser compartilhados livremente.
+
+O RegistroCampos, construído pelo AdaptadorModeloRelacional, indexa as
+definições por nome e por ID. O registro do processo é obtido com
+obter_registro_campos() e compartilhado pelo adaptador, pelo MotorRegras,
+pelo ProcessadorCSV e pelo DocumentoProcessor.
+"""
+
+from types import MappingProxyType
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Tuple
+
+
+def valor_nativo(valor: Any) -> Any:
+    """
+    Converte um valor lido das tabelas para um tipo nativo do Python.
+
+    Escalares do numpy viram int/float/bool/str; NaN e pd.NA viram None.
+    """
+    if valor is None:
+        return None
+    if hasattr(valor, 'item') and not isinstance(valor, (str, bytes)):
+        valor = valor.item()
+    try:
+        if valor != valor:
+            return None
+    except TypeError:
+        # pd.NA não admite comparação booleana
+        return None
+    return valor
+
+
+def _inteiro(valor: Any) -> Optional[int]:
+    """
+    Converte um ID (possivelmente float, por causa de células vazias na coluna) para int.
+    """
+    valor = valor_nativo(valor)
+    if valor is None or valor == '':
+        return None
+    return int(valor)
+
+
+def _linha_nativa(linha: Mapping[str, Any]) -> Dict[str, Any]:
+    return {str(coluna): valor_nativo(valor) for coluna, valor in linha.items()}
+
+
+class DefinicaoCampo:
+    """
+    Definição imutável de um campo, com o tipo, as regras, a categoria e as opções já associados.
+
+    Atributos:
+        campo_id, nome_campo: Identificação do campo.
+        tipo_dado_id: Tipo em tipos_dados (None se não informado).
+        tipo_dado_programacao, mascara_formato: Do tipo em tipos_dados, se houver;
+            senão, da própria linha do campo.
+        tipo_formatacao: Da linha do campo.
+        obrigatorio_quando_ativo: Obrigatoriedade da primeira regra de ativação.
+        campo_vinculo_id, condicao_vinculo_tipo, condicao_vinculo_valor: Vinculação
+            da primeira regra (None se não houver).
+        categoria, subcategoria: Categoria principal (None se o campo não tem categoria).
+        opcoes: Valores das opções de seleção, na ordem da tabela.
+        regras: Todas as regras de ativação do campo.
+        colunas: Todas as colunas da linha do campo em campos_definicao.
+    """
+
+    __slots__ = (
+        'campo_id', 'nome_campo', 'tipo_dado_id', 'tipo_dado_programacao', 'tipo_formatacao',
+        'mascara_formato', 'obrigatorio_quando_ativo', 'campo_vinculo_id', 'condicao_vinculo_tipo',
+        'condicao_vinculo_valor', 'categoria', 'subcategoria', 'opcoes', 'regras', 'colunas',
+        '_tem_tipo', '_tem_categoria'
+    )
+
+    def __init__(self, linha: Mapping[str, Any], tipo: Optional[Mapping[str, Any]] = None,
+                 regras: Iterable[Mapping[str, Any]] = (), categoria: Optional[Mapping[str, Any]] = None,
+                 opcoes: Iterable[Any] = ()):
+        """
+        Args:
+            linha: Linha do campo em campos_definicao.
+            tipo: Linha de tipos_dados correspondente a tipo_dado_id (se houver).
+            regras: Linhas de regras_ativacao do campo, na ordem da tabela.
+            categoria: Primeira linha de categorias_campos do campo (se houver).
+            opcoes: Valores das opções de seleção do campo, na ordem da tabela.
+        """
+        colunas = _linha_nativa(linha)
+        tipo_nativo = _linha_nativa(tipo) if tipo is not None else None
+        regras_nativas = tuple(MappingProxyType(_linha_nativa(regra)) for regra in regras)
+        categoria_nativa = _linha_nativa(categoria) if categoria is not None else None
+        primeira_regra = regras_nativas[0] if regras_nativas else {}
+        vinculo = _inteiro(primeira_regra.get('campo_vinculo_id'))
+
+        atribuir = object.__setattr__
+        atribuir(self, 'campo_id', _inteiro(colunas.get('campo_id')))
+        atribuir(self, 'nome_campo', colunas.get('nome_campo'))
+        atribuir(self, 'tipo_dado_id', _inteiro(colunas.get('tipo_dado_id')))
+        if tipo_nativo is not None:
+            atribuir(self, 'tipo_dado_programacao', tipo_nativo.get('nome_tipo'))
+            atribuir(self, 'mascara_formato', tipo_nativo.get('mascara_formato', ''))
+        else:
+            atribuir(self, 'tipo_dado_programacao', colunas.get('tipo_dado_programacao'))
+            atribuir(self, 'mascara_formato', colunas.get('mascara_formato'))
+        atribuir(self, 'tipo_formatacao', colunas.get('tipo_formatacao'))
+        atribuir(self, 'obrigatorio_quando_ativo', primeira_regra.get('obrigatorio_quando_ativo') == 'sim')
+        atribuir(self, 'campo_vinculo_id', vinculo)
+        atribuir(self, 'condicao_vinculo_tipo', primeira_regra.get('condicao_vinculo_tipo') if vinculo is not None else None)
+        atribuir(self, 'condicao_vinculo_valor', primeira_regra.get('condicao_vinculo_valor') if vinculo is not None else None)
+        atribuir(self, 'categoria', categoria_nativa.get('categoria_1') if categoria_nativa else None)
+        atribuir(self, 'subcategoria', categoria_nativa.get('subcategoria_1', '') if categoria_nativa else None)
+        atribuir(self, 'opcoes', tuple(valor for valor in map(valor_nativo, opcoes) if valor is not None))
+        atribuir(self, 'regras', regras_nativas)
+        atribuir(self, 'colunas', MappingProxyType(colunas))
+        atribuir(self, '_tem_tipo', tipo_nativo is not None)
+        atribuir(self, '_tem_categoria', categoria_nativa is not None)
+
+    def __setattr__(self, nome: str, valor: Any) -> None:
+        raise AttributeError(f"DefinicaoCampo é imutável (atributo '{nome}')")
+
+    def __delattr__(self, nome: str) -> None:
+        raise AttributeError(f"DefinicaoCampo é imutável (atributo '{nome}')")
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # MappingProxyType não é serializável: guarda as cópias em dicionários
+        estado = {nome: getattr(self, nome) for nome in self.__slots__}
+        estado['colunas'] = dict(self.colunas)
+        estado['regras'] = tuple(dict(regra) for regra in self.regras)
+        return estado
+
+    def __setstate__(self, estado: Dict[str, Any]) -> None:
+        estado = dict(estado)
+        estado['colunas'] = MappingProxyType(estado['colunas'])
+        estado['regras'] = tuple(MappingProxyType(regra) for regra in estado['regras'])
+        for nome, valor in estado.items():
+            object.__setattr__(self, nome, valor)
+
+    def __repr__(self) -> str:
+        return f"DefinicaoCampo(campo_id={self.campo_id!r}, nome_campo={self.nome_campo!r}, tipo={self.tipo_dado_programacao!r})"
+
+    def obter(self, coluna: str, padrao: Any = None) -> Any:
+        """
+        Valor de uma coluna da linha do campo em campos_definicao (padrao se vazia ou ausente).
+        """
+        valor = self.colunas.get(coluna)
+        return padrao if valor is None else valor
+
+    def como_dict(self) -> Dict[str, Any]:
+        """
+        Informações do campo no formato de dicionário usado pelo restante do sistema
+        (AdaptadorModeloRelacional.obter_campo_por_id e o formato legado).
+
+        Returns:
+            Novo dicionário com as colunas do campo e as informações associadas.
+        """
+        resultado = dict(self.colunas)
+        if self._tem_tipo:
+            resultado['tipo_dado_programacao'] = self.tipo_dado_programacao
+            resultado['mascara_formato'] = self.mascara_formato
+        if self.regras:
+            resultado['obrigatorio_quando_ativo'] = self.obrigatorio_quando_ativo
+            if self.campo_vinculo_id is not None:
+                resultado['campo_vinculo_id'] = self.campo_vinculo_id
+                resultado['condicao_vinculo_tipo'] = self.condicao_vinculo_tipo
+                resultado['condicao_vinculo_valor'] = self.condicao_vinculo_valor
+        if self._tem_categoria:
+            resultado['categoria'] = self.categoria
+            resultado['subcategoria'] = self.subcategoria
+        if self.opcoes:
+            resultado['opcoes_lista_selecao'] = ';'.join(str(opcao) for opcao in self.opcoes)
+        return resultado
+
+
+class RegistroCampos:
+    """
+    Conjunto imutável das definições de campos, indexado por nome e por ID.
+
+    Iterar sobre o registro percorre as definições na ordem de campos_definicao.
+    """
+
+    __slots__ = ('_definicoes', '_por_nome', '_por_id')
+
+    def __init__(self, definicoes: Iterable[DefinicaoCampo]):
+        """
+        Args:
+            definicoes: Definições na ordem da tabela de campos. Em nomes ou IDs
+                        repetidos, vale a primeira definição.
+        """
+        self._definicoes: Tuple[DefinicaoCampo, ...] = tuple(definicoes)
+        por_nome: Dict[str, DefinicaoCampo] = {}
+        por_id: Dict[int, DefinicaoCampo] = {}
+        for definicao in self._definicoes:
+            por_id.setdefault(definicao.campo_id, definicao)
+            por_nome.setdefault(definicao.nome_campo, definicao)
+        self._por_nome = MappingProxyType(por_nome)
+        self._por_id = MappingProxyType(por_id)
+
+    def __getstate__(self) -> Tuple[DefinicaoCampo, ...]:
+        return self._definicoes
+
+    def __setstate__(self, definicoes: Tuple[DefinicaoCampo, ...]) -> None:
+        self.__init__(definicoes)
+
+    def __len__(self) -> int:
+        return len(self._definicoes)
+
+    def __iter__(self) -> Iterator[DefinicaoCampo]:
+        return iter(self._definicoes)
+
+    def __contains__(self, nome_campo: object) -> bool:
+        return nome_campo in self._por_nome
+
+    def por_nome(self, nome_campo: str) -> Optional[DefinicaoCampo]:
+        """
+        Definição do campo com o nome informado (None se não existir).
+        """
+        return self._por_nome.get(nome_campo)
+
+    def por_id(self, campo_id: int) -> Optional[DefinicaoCampo]:
+        """
+        Definição do campo com o ID informado (None se não existir).
+        """
+        return self._por_id.get(campo_id)
+
+
+def construir_registro_campos(campos: Iterable[Mapping[str, Any]], tipos: Iterable[Mapping[str, Any]],
+                              regras: Iterable[Mapping[str, Any]], categorias: Iterable[Mapping[str, Any]],
+                              opcoes: Iterable[Mapping[str, Any]]) -> RegistroCampos:
+    """
+    Associa as linhas das cinco tabelas do modelo relacional por campo_id
+    (e tipo_dado_id) e constrói o registro de definições.
+
+    Args:
+        campos, tipos, regras, categorias, opcoes: Linhas (dicionários) de
+            campos_definicao, tipos_dados, regras_ativacao, categorias_campos e
+            opcoes_selecao, na ordem das tabelas.
+
+    Returns:
+        RegistroCampos com uma definição por linha válida de campos_definicao.
+    """
+    tipo_por_id: Dict[int, Mapping[str, Any]] = {}
+    for linha in tipos:
+        tipo_id = _inteiro(linha.get('tipo_dado_id'))
+        if tipo_id is not None:
+            tipo_por_id.setdefault(tipo_id, linha)
+
+    regras_por_campo: Dict[int, List[Mapping[str, Any]]] = {}
+    for linha in regras:
+        campo_id = _inteiro(linha.get('campo_id'))
+        if campo_id is not None:
+            regras_por_campo.setdefault(campo_id, []).append(linha)
+
+    categoria_por_campo: Dict[int, Mapping[str, Any]] = {}
+    for linha in categorias:
+        campo_id = _inteiro(linha.get('campo_id'))
+        if campo_id is not None:
+            categoria_por_campo.setdefault(campo_id, linha)
+
+    opcoes_por_campo: Dict[int, List[Any]] = {}
+    for linha in opcoes:
+        campo_id = _inteiro(linha.get('campo_id'))
+        if campo_id is not None and 'valor' in linha:
+            opcoes_por_campo.setdefault(campo_id, []).append(linha['valor'])
+
+    definicoes = []
+    for linha in campos:
+        campo_id = _inteiro(linha.get('campo_id'))
+        if campo_id is None:
+            continue
+        tipo_id = _inteiro(linha.get('tipo_dado_id'))
+        definicoes.append(DefinicaoCampo(
+            linha,
+            tipo=tipo_por_id.get(tipo_id) if tipo_id is not None else None,
+            regras=regras_por_campo.get(campo_id, ()),
+            categoria=categoria_por_campo.get(campo_id),
+            opcoes=opcoes_por_campo.get(campo_id, ())
+        ))
+    return RegistroCampos(definicoes)
+
+
+def obter_registro_campos() -> RegistroCampos:
+    """
+    Obtém o registro de definições de campos compartilhado pelo processo,
+    carregando o modelo relacional na primeira chamada.
+
+    Returns:
+        RegistroCampos do adaptador compartilhado (obter_adaptador_modelo).
+
+    Raises:
+        Exception: Se as tabelas do modelo relacional não puderem ser carregadas.
+    """
+    from src.adaptador_modelo_relacional import obter_adaptador_modelo
+    return obter_adaptador_modelo().registro
@@ -5,21 +5,38 @@ Este módulo contém a classe DocumentoProcessor, responsável por processar
 documentos DOCX, substituindo campos e aplicando regras condicionais.
 """
 
+import io
 import os
 import re
 import json
 import docx
 import time
-from typing import Dict, List, Any, Optional, Tuple, Set
+from typing import Dict, List, Any, BinaryIO, Optional, Tuple, Set, Iterable, Iterator, Union
 from docx.document import Document  # Para tipagem
 from docx.oxml import CT_P, CT_Tbl
 from docx.table import Table
 from docx.text.paragraph import Paragraph
+from docx.oxml.ns import qn
 
-import locale
 from decimal import Decimal
 
 from src.motor_regras import MotorRegras
+from src.plano_renderizacao import (
+    TIPO_CAMPO,
+    IndiceSecoes,
+    ParagrafoPlano,
+    PlanoRenderizacao,
+    aplicar_edicoes,
+    compilar_plano,
+    gerar_edicoes,
+    iterar_historias,
+    listar_elementos_corpo,
+    listar_paragrafos,
+    listar_runs,
+    tokenizar_segmentos
+)
+from src.cache_templates import obter_template
+from src.formatacao import formatar_moeda, valor_por_extenso
 from src.exceptions import (
     ProcessamentoDocumentoError,
     TemplateNaoEncontradoError,
@@ -28,6 +45,14 @@ from src.exceptions import (
 )
 from src.logger import logger
 
+
+def _descrever_saida(output_path: Union[str, BinaryIO]) -> str:
+    """
+    Descrição do destino de um documento para as mensagens (caminho ou "memória").
+    """
+    return output_path if isinstance(output_path, str) else "memória"
+
+
 class DocumentoProcessor:
     """
     Processador de documentos DOCX.
@@ -44,6 +69,8 @@ class DocumentoProcessor:
         """
         self.motor_regras = motor_regras or MotorRegras(usar_modelo_relacional=True)
         self.modo_estrito = modo_estrito
+        # Formatador compilado de cada campo (monetário, extenso, data, máscara ou texto)
+        self.formatadores = self.motor_regras.obter_formatadores()
         self.campos_encontrados = set()
         self.campos_substituidos = set()
         self.campos_ausentes = set()
@@ -91,7 +118,7 @@ class DocumentoProcessor:
                           template_path: str, 
                           dados: Dict[str, Any], 
                           secoes_ativas: List[str], 
-                          output_path: str) -> str:
+                          output_path: Union[str, BinaryIO]) -> Union[str, BinaryIO]:
         """
         Processa um documento DOCX, substituindo campos e aplicando regras condicionais.
         
@@ -99,10 +126,11 @@ class DocumentoProcessor:
             template_path: Caminho para o arquivo de template DOCX.
             dados: Dicionário com os dados a serem inseridos no documento.
             secoes_ativas: Lista de IDs das seções que devem estar ativas.
-            output_path: Caminho para salvar o documento processado.
+            output_path: Caminho para salvar o documento processado, ou arquivo
+                         binário aberto (ex.: io.BytesIO) que recebe o DOCX.
             
         Returns:
-            Caminho do documento gerado.
+            Caminho do documento gerado (ou o próprio arquivo informado).
             
         Raises:
             TemplateError: Se o template não puder ser aberto ou processado.
@@ -129,8 +157,10 @@ class DocumentoProcessor:
                 logger.error(mensagem)
                 raise TemplateNaoEncontradoError(mensagem)
                 
-            # Corrigido: Usar docx.Document em vez de Document diretamente
-            doc = docx.Document(template_path)
+            # O pacote é aberto uma única vez; cada registro recebe uma cópia limpa das partes XML
+            template = obter_template(template_path)
+            doc = template.novo_documento()
+            plano = template.plano
             logger.info(f"Template carregado: {template_path}")
         except Exception as e:
             mensagem = f"Erro ao abrir o template: {str(e)}"
@@ -143,20 +173,21 @@ class DocumentoProcessor:
             logger.info(f"Seções ativas determinadas automaticamente: {self.secoes_ativas}")
         
         # 3. Substitui campos no documento
-        doc = self._substituir_todos_campos(doc, dados)
+        doc = self._substituir_todos_campos(doc, dados, plano)
             
         # 4. Processa seções condicionais
-        doc = self._processar_secoes_condicionais(doc, dados)
+        doc = self._processar_secoes_condicionais(doc, dados, plano)
             
         # 5. Realiza verificações finais e validações
         self._validar_documento(dados)
             
         # 6. Salva o documento processado
         try:
-            # Garante que o diretório existe
-            os.makedirs(os.path.dirname(output_path), exist_ok=True)
+            if isinstance(output_path, str):
+                # Garante que o diretório existe
+                os.makedirs(os.path.dirname(output_path), exist_ok=True)
             doc.save(output_path)
-            logger.info(f"Documento processado salvo em: {output_path}")
+            logger.info(f"Documento processado salvo em: {_descrever_saida(output_path)}")
         except Exception as e:
             mensagem = f"Erro ao salvar o documento processado: {str(e)}"
             logger.error(mensagem)
@@ -175,9 +206,95 @@ class DocumentoProcessor:
         }
         
         logger.info(f"Estatísticas do processamento: {self.estatisticas_processamento}")
-        
+
         return output_path
+
+    def campos_condicionais(self) -> Set[str]:
+        """
+        Campos de dados consultados pelo mapeamento de seções (ativação automática de seções).
+        
+        Returns:
+            Conjunto com os nomes dos campos condicionais.
+        """
+        return {mapeamento['campo_condicional'] for mapeamento in self.mapeamento_secoes.values()}
     
+    def campos_template(self, template_path: str) -> List[str]:
+        """
+        Campos referenciados por placeholders do template, segundo este backend de renderização.
+        
+        Args:
+            template_path: Caminho do template DOCX.
+            
+        Returns:
+            Lista com os nomes dos campos, na ordem do template.
+        """
+        return obter_template(template_path).plano.campos
+    
+    def processar_lote(self,
+                       template_path: str,
+                       registros_iteravel: Iterable[Dict[str, Any]],
+                       padrao_saida: str,
+                       indice_inicial: int = 1,
+                       em_memoria: bool = False) -> Iterator[Dict[str, Any]]:
+        """
+        Processa uma sequência de registros com o mesmo template, gerando um
+        documento por registro.
+
+        O template (e seu plano, com o índice de seções), a tabela de formatadores
+        e as regras do motor são carregados uma única vez; os registros são
+        consumidos um a um do iterável, sem manter os anteriores em memória.
+
+        Args:
+            template_path: Caminho para o arquivo de template DOCX.
+            registros_iteravel: Registros de dados (listas, geradores, leitores em fluxo).
+            padrao_saida: Caminho de saída de cada documento; "{indice}" é substituído
+                          pelo número do registro.
+            indice_inicial: Número do primeiro registro do iterável (blocos de um lote maior).
+            em_memoria: Se True, os documentos não são gravados em disco: 'caminho' é
+                        apenas o nome do documento e 'conteudo' traz os bytes do DOCX.
+
+        Yields:
+            Dicionário com 'indice', 'caminho', 'secoes_ativas' e 'estatisticas' de cada
+            registro (e 'conteudo', com em_memoria).
+
+        Raises:
+            TemplateError: Se o template não puder ser aberto ou processado.
+            DadosError: Se os dados de algum registro estiverem incompletos ou inválidos.
+        """
+        if not os.path.exists(template_path):
+            mensagem = f"Template não encontrado: {template_path}"
+            logger.error(mensagem)
+            raise TemplateNaoEncontradoError(mensagem)
+
+        # As regras são lidas uma vez por lote (caso o chamador ainda não as tenha carregado)
+        if not self.motor_regras.regras:
+            self.motor_regras.carregar_regras()
+
+        for indice, dados in enumerate(registros_iteravel, start=indice_inicial):
+            output_path = padrao_saida.format(indice=indice)
+            logger.info(f"Processando registro {indice}")
+
+            secoes_ativas = self.motor_regras.avaliar_secoes_ativas(dados)
+            logger.info(f"Seções ativas determinadas: {secoes_ativas if secoes_ativas else 'Nenhuma'}")
+
+            destino = io.BytesIO() if em_memoria else output_path
+            caminho = self.processar_documento(
+                template_path=template_path,
+                dados=dados,
+                secoes_ativas=secoes_ativas,
+                output_path=destino
+            )
+
+            resultado = {
+                'indice': indice,
+                'caminho': output_path if em_memoria else caminho,
+                'secoes_ativas': secoes_ativas,
+                'estatisticas': self.obter_estatisticas()
+            }
+            if em_memoria:
+                resultado['conteudo'] = destino.getvalue()
+            yield resultado
+
     def _processar_tabela(self, tabela: Table, dados: Dict[str, Any]) -> None:
         """
         Processa todos os parágrafos em uma tabela.
@@ -191,13 +308,15 @@ class DocumentoProcessor:
                 for paragrafo in celula.paragraphs:
                     self._processar_paragrafo(paragrafo, dados)
     
-    def _processar_secoes_condicionais(self, doc: Document, dados: Dict[str, Any]) -> Document:
+    def _processar_secoes_condicionais(self, doc: Document, dados: Dict[str, Any],
+                                       plano: Optional[PlanoRenderizacao] = None) -> Document:
         """
         Identifica e processa seções condicionais no documento.
         
         Args:
             doc: Documento a ser processado.
             dados: Dicionário com os dados para substituição.
+            plano: Plano de renderização do template (com o índice de seções).
             
         Returns:
             Documento com seções condicionais processadas.
@@ -213,8 +332,22 @@ class DocumentoProcessor:
             
         logger.info(f"Processando seções condicionais. Seções ativas: {self.secoes_ativas}")
         
-        # Mapeia as seções no documento (por marcadores ou títulos)
-        secoes_no_documento = self._mapear_secoes_no_documento(doc)
+        if plano is None:
+            plano = compilar_plano(doc)
+        
+        # Com marcadores explícitos, a ativação é uma consulta ao índice de seções do template
+        if plano.secoes.intervalos:
+            self.secoes_encontradas = plano.secoes.secoes
+            logger.info(f"Seções encontradas no documento: {sorted(self.secoes_encontradas)}")
+            for secao_id in sorted(self.secoes_encontradas):
+                logger.info(f"Seção '{secao_id}': {'ATIVA' if secao_id in self.secoes_ativas else 'INATIVA'}")
+            
+            removidos = self._podar_secoes_inativas(doc, plano.secoes)
+            logger.info(f"Removidos {removidos} elementos de seções inativas e parágrafos de marcadores")
+            return doc
+        
+        # Sem marcadores: mapeia as seções por títulos
+        secoes_no_documento = self._mapear_secoes_no_documento(doc, plano)
         
         # Se não encontrou seções, não há o que processar
         if not secoes_no_documento:
@@ -225,84 +358,52 @@ class DocumentoProcessor:
         logger.info(f"Seções encontradas no documento: {list(secoes_no_documento.keys())}")
         self.secoes_encontradas = set(secoes_no_documento.keys())
         
-        # Processa cada seção do documento
+        # Remove os elementos das seções inativas
         for secao_id, info in secoes_no_documento.items():
-            # Determina se a seção deve estar ativa
             ativa = secao_id in self.secoes_ativas
-            
             logger.info(f"Seção '{secao_id}': {'ATIVA' if ativa else 'INATIVA'}")
             
-            # Remove as seções inativas
             if not ativa:
-                # Opção 1: Remover todos os elementos da seção
-                if 'elementos' in info and info['elementos']:
-                    for elemento in info['elementos']:
-                        # Método seguro para "remover" elementos
-                        if isinstance(elemento, Paragraph):
-                            # Limpa o texto do parágrafo
-                            logger.debug(f"Limpando conteúdo do parágrafo: '{elemento.text}'")
-                            elemento.text = ""
-                            
-                            # Também limpa os runs
-                            for run in elemento.runs:
-                                run.text = ""
-                
+                for elemento in info.get('elementos', []):
+                    xml = elemento._element
+                    if xml.getparent() is not None:
+                        xml.getparent().remove(xml)
                 logger.info(f"Seção '{secao_id}' removida (inativa)")
         
-        # Realiza limpeza final do documento (remove parágrafos vazios)
-        doc = self._limpar_documento_apos_processamento(doc)
-        
         return doc
     
-    def _limpar_documento_apos_processamento(self, doc: Document) -> Document:
+    def _podar_secoes_inativas(self, doc: Document, indice_secoes: IndiceSecoes) -> int:
         """
-        Limpa o documento após processamento, removendo elementos vazios e trechos de marcação.
+        Remove do corpo, em uma única passada, as faixas de elementos das seções
+        inativas (com tabelas e seções aninhadas) e os parágrafos que contêm
+        apenas marcadores de seção.
         
         Args:
-            doc: Documento a ser limpo.
+            doc: Documento em renderização.
+            indice_secoes: Índice de seções do template.
             
         Returns:
-            Documento limpo.
+            Quantidade de elementos removidos.
         """
-        logger.info("Realizando limpeza final do documento")
-        
-        # Processa todos os parágrafos para remover marcadores e parágrafos vazios
-        paragrafos_para_remover = []
-        
-        for i, paragrafo in enumerate(doc.paragraphs):
-            texto = paragrafo.text.strip()
-            
-            # Verifica se contém apenas marcadores de seção
-            if re.match(r'^{{[\s]*[#/].*}}$', texto):
-                logger.debug(f"Marcador de seção encontrado para remoção: '{texto}'")
-                paragrafos_para_remover.append(paragrafo)
-                continue
-                
-            # Verifica se está vazio (após processamento de seção inativa)
-            if not texto and paragrafo.runs:
-                # Verifica se todos os runs estão vazios
-                todos_vazios = True
-                for run in paragrafo.runs:
-                    if run.text.strip():
-                        todos_vazios = False
-                        break
-                
-                if todos_vazios:
-                    logger.debug(f"Parágrafo vazio encontrado para remoção (índice {i})")
-                    paragrafos_para_remover.append(paragrafo)
-        
-        # Remove os parágrafos identificados
-        # Nota: não podemos remover diretamente durante a iteração
-        for paragrafo in paragrafos_para_remover:
-            try:
-                p = paragrafo._element
-                p.getparent().remove(p)
-            except Exception as e:
-                logger.error(f"Erro ao remover parágrafo: {str(e)}")
-        
-        logger.info(f"Removidos {len(paragrafos_para_remover)} parágrafos vazios ou marcadores")
-        
-        return doc
+        corpo = doc.element.body
+        elementos = listar_elementos_corpo(corpo)
+        if len(elementos) != indice_secoes.total_elementos:
+            logger.warning("O corpo do documento não corresponde ao índice de seções do template; seções não removidas")
+            return 0
+        
+        remover = [False] * len(elementos)
+        for inicio, fim in indice_secoes.faixas_inativas(self.secoes_ativas):
+            remover[inicio:fim + 1] = [True] * (fim - inicio + 1)
+        for posicao, apenas_marcadores in indice_secoes.elementos_marcadores.items():
+            if apenas_marcadores:
+                remover[posicao] = True
+        
+        removidos = 0
+        for elemento, remove in zip(elementos, remover):
+            if remove:
+                corpo.remove(elemento)
+                removidos += 1
+        return removidos
     
     def _tipo_elemento(self, elemento):
         """
@@ -324,128 +425,51 @@ class DocumentoProcessor:
         else:
             return f"Elemento tipo {type(elemento).__name__}"
     
-    def _mapear_secoes_no_documento(self, doc: Document) -> Dict[str, Dict[str, Any]]:
+    def _mapear_secoes_no_documento(self, doc: Document, plano: Optional[PlanoRenderizacao] = None) -> Dict[str, Dict[str, Any]]:
         """
         Mapeia seções condicionais no documento.
         
-        Procura por marcadores de seção no formato:
-        {{#SECAO_ID}} para início de seção e {{/SECAO_ID}} para fim de seção.
+        Usa o índice de seções do plano do template (marcadores {{#SECAO_ID}} e
+        {{/SECAO_ID}}, em ordem de elementos do corpo, incluindo tabelas e
+        seções aninhadas); nenhuma varredura de texto é feita por registro.
         
         Args:
             doc: Documento a ser analisado.
+            plano: Plano de renderização do template. Se None, é compilado a partir do documento.
             
         Returns:
             Dicionário com informações sobre cada seção encontrada.
         """
-        mapeamento = {}
-        secao_atual = None
-        elemento_inicio = None
-        elementos_secao_atual = []
-        
-        # Log detalhado para diagnóstico
-        logger.debug("Iniciando mapeamento de seções no documento")
-        
-        # Regex para detectar início e fim de seção
-        regex_inicio = r'{{[\s]*#([^{}]+?)[\s]*}}'
-        regex_fim = r'{{[\s]*/([^{}]+?)[\s]*}}'
+        if plano is None:
+            plano = compilar_plano(doc)
+        indice_secoes = plano.secoes
         
-        secoes_abertas = {}  # Rastreia seções atualmente abertas
-        
-        # Contadores para diagnóstico
-        total_paragrafos = len(doc.paragraphs)
-        paragrafos_com_marcadores = 0
-        marcadores_inicio_encontrados = 0
-        marcadores_fim_encontrados = 0
-        
-        # Verifica todos os parágrafos para marcadores
-        for i, paragrafo in enumerate(doc.paragraphs):
-            texto = paragrafo.text
-            
-            # Log para parágrafos longos (amostra)
-            if len(texto) > 100:
-                texto_log = texto[:50] + "..." + texto[-50:]
-            else:
-                texto_log = texto
-                
-            logger.debug(f"Analisando parágrafo {i+1}/{total_paragrafos}: '{texto_log}'")
-            
-            # Busca marcadores no texto do parágrafo
-            marcadores_inicio = re.finditer(regex_inicio, texto)
-            marcadores_fim = re.finditer(regex_fim, texto)
-            
-            # Processa marcadores de início
-            for match in marcadores_inicio:
-                secao_id = match.group(1).strip()
-                marcadores_inicio_encontrados += 1
-                paragrafos_com_marcadores += 1
-                
-                logger.info(f"Marcador de INÍCIO de seção encontrado: '{secao_id}' (parágrafo {i+1})")
-                
-                # Registra início da seção
-                secoes_abertas[secao_id] = {
-                    'paragrafo_inicio': i,
-                    'elemento_inicio': paragrafo,
-                    'elementos': []
-                }
-            
-            # Processa marcadores de fim
-            for match in marcadores_fim:
-                secao_id = match.group(1).strip()
-                marcadores_fim_encontrados += 1
-                
-                # Apenas incrementa paragrafos_com_marcadores se não contou antes
-                if not re.search(regex_inicio, texto):
-                    paragrafos_com_marcadores += 1
-                
-                logger.info(f"Marcador de FIM de seção encontrado: '{secao_id}' (parágrafo {i+1})")
-                
-                # Verifica se a seção foi aberta
-                if secao_id in secoes_abertas:
-                    info_secao = secoes_abertas[secao_id]
-                    
-                    # Coleta elementos entre início e fim
-                    elementos = []
-                    for j in range(info_secao['paragrafo_inicio'], i + 1):
-                        if j < len(doc.paragraphs):
-                            elementos.append(doc.paragraphs[j])
-                    
-                    # Adiciona ao mapeamento final
-                    mapeamento[secao_id] = {
-                        'inicio': info_secao['elemento_inicio'],
-                        'fim': paragrafo,
-                        'elementos': elementos
-                    }
-                    
-                    # Remove da lista de seções abertas
-                    del secoes_abertas[secao_id]
-                    
-                    logger.info(f"Seção '{secao_id}' mapeada completamente com {len(elementos)} elementos")
-                else:
-                    logger.warning(f"Marcador de FIM para seção não aberta: '{secao_id}'")
-        
-        # Verifica se ficaram seções abertas não fechadas
-        for secao_id, info in secoes_abertas.items():
-            logger.warning(f"ALERTA: Seção '{secao_id}' foi aberta mas não fechada (parágrafo {info['paragrafo_inicio']+1})")
-            
-            # Mantém no mapeamento com os elementos até o fim do documento
-            elementos = []
-            for j in range(info['paragrafo_inicio'], len(doc.paragraphs)):
-                elementos.append(doc.paragraphs[j])
-                
-            mapeamento[secao_id] = {
-                'inicio': info['elemento_inicio'],
-                'fim': doc.paragraphs[-1] if doc.paragraphs else None,
-                'elementos': elementos,
-                'incompleta': True  # Marca como incompleta para tratamento especial
-            }
-        
-        # Log de resumo do mapeamento
-        logger.info(f"Mapeamento de seções concluído:")
-        logger.info(f"  Total de parágrafos analisados: {total_paragrafos}")
-        logger.info(f"  Parágrafos com marcadores: {paragrafos_com_marcadores}")
-        logger.info(f"  Marcadores de início encontrados: {marcadores_inicio_encontrados}")
-        logger.info(f"  Marcadores de fim encontrados: {marcadores_fim_encontrados}")
-        logger.info(f"  Seções mapeadas: {len(mapeamento)}")
+        mapeamento = {}
+        elementos_corpo = listar_elementos_corpo(doc.element.body)
+        if len(elementos_corpo) != indice_secoes.total_elementos:
+            logger.warning("O corpo do documento não corresponde ao índice de seções do template; seções ignoradas")
+            return mapeamento
+        
+        for intervalo in indice_secoes.intervalos:
+            elementos = [self._envolver_elemento(doc, elementos_corpo[i])
+                         for i in range(intervalo.inicio, intervalo.fim + 1)]
+            info = mapeamento.setdefault(intervalo.secao_id, {
+                'inicio': elementos[0],
+                'fim': elementos[-1],
+                'elementos': [],
+                'intervalos': []
+            })
+            info['elementos'].extend(elementos)
+            info['intervalos'].append(intervalo)
+            if intervalo.incompleta:
+                info['incompleta'] = True
+            
+            logger.info(f"Seção '{intervalo.secao_id}' mapeada: elementos {intervalo.inicio + 1}-{intervalo.fim + 1} "
+                        f"(nível {intervalo.nivel}, {len(elementos)} elementos)")
+        
+        logger.info(f"Mapeamento de seções concluído: {len(mapeamento)} seções, "
+                    f"{len(indice_secoes.elementos_marcadores)} elementos com marcadores, "
+                    f"{indice_secoes.total_elementos} elementos no corpo")
         
         # Se não encontrou marcadores explícitos, tenta usar mapeamento por títulos
         if not mapeamento:
@@ -453,6 +477,16 @@ class DocumentoProcessor:
             mapeamento = self._mapear_secoes_por_titulos(doc, {})
             
         return mapeamento
+    
+    def _envolver_elemento(self, doc: Document, elemento: Any) -> Any:
+        """
+        Envolve um elemento de bloco do corpo no objeto python-docx correspondente.
+        """
+        if elemento.tag == qn('w:p'):
+            return Paragraph(elemento, doc._body)
+        if elemento.tag == qn('w:tbl'):
+            return Table(elemento, doc._body)
+        return elemento
         
     def _mapear_secoes_por_titulos(self, doc: Document, secoes_esperadas: Dict[str, str]) -> Dict[str, Dict[str, Any]]:
         """
@@ -524,377 +558,40 @@ class DocumentoProcessor:
             paragrafo: Parágrafo a ser processado.
             dados: Dicionário com os dados para substituição.
         """
-        # DIAGNÓSTICO: Log hexadecimal para detectar caracteres invisíveis
-        texto_hex = paragrafo.text.encode('utf-8').hex()
-        if paragrafo.text and len(paragrafo.text) < 100:  # Limita logs para textos menores
-            logger.debug(f"Texto HEX: {texto_hex}")
-        
-        # ESTRATÉGIA 1: Tentativa convencional pelo texto completo do parágrafo
-        texto_original = paragrafo.text
-        
-        # MELHORADO: Usar regex mais flexível para capturar placeholders com variações
-        # Permite espaços entre chaves e nome do campo
-        campos_no_paragrafo = re.findall(r'{{[\s]*([^{}]+?)[\s]*}}', texto_original)
-        
-        # Log de diagnóstico para verificar campos encontrados
-        if campos_no_paragrafo:
-            logger.debug(f"Campos encontrados no parágrafo: {campos_no_paragrafo}")
-        
-        # Registra campos encontrados que não são marcadores de seção
-        for campo in campos_no_paragrafo:
-            campo_limpo = campo.strip()
-            # Ignora marcadores de seção (que começam com # ou /)
-            if not campo_limpo.startswith('#') and not campo_limpo.startswith('/'):
-                self.campos_encontrados.add(campo_limpo)
-                logger.debug(f"Campo registrado: '{campo_limpo}'")
-        
-        # Se não há campos, tenta verificar runs fragmentados
-        if not campos_no_paragrafo and len(paragrafo.runs) > 1:
-            logger.debug(f"Parágrafo sem campos. Verificando runs fragmentados ({len(paragrafo.runs)} runs)")
-            self._processar_runs_fragmentados(paragrafo, dados)
-            return
-        
-        # Se não há campos, não precisa processar
-        if not campos_no_paragrafo:
-            return
-        
-        # Substitui os campos no texto completo
-        texto_substituido = self._substituir_campos(texto_original, dados)
-        
-        # Se o texto foi alterado, atualiza o parágrafo preservando formatação
-        if texto_substituido != texto_original:
-            logger.debug(f"Texto substituído: '{texto_substituido}'")
-            self._substituir_texto_preservando_formatacao(paragrafo, texto_original, texto_substituido)
+        textos = [run.text for run in listar_runs(paragrafo._p)]
+        ocorrencias = tokenizar_segmentos(textos)
+        if ocorrencias:
+            self._substituir_campos_paragrafo(paragrafo._p, ParagrafoPlano(-1, ocorrencias, gerar_edicoes(ocorrencias, textos)), dados)
     
-    def _substituir_texto_preservando_formatacao(self, paragrafo, texto_original: str, texto_substituido: str) -> None:
+    def _resolver_valor_campo(self, nome_campo: str, dados: Dict[str, Any]) -> str:
         """
-        Substitui o texto de um parágrafo preservando a formatação.
+        Obtém o texto que substitui um placeholder, aplicando o formatador do campo
+        e registrando o campo como substituído ou ausente.
         
         Args:
-            paragrafo: Parágrafo a ser modificado.
-            texto_original: Texto original do parágrafo.
-            texto_substituido: Texto com campos substituídos.
-        """
-        # O problema está aqui: estamos removendo todo o texto original
-        # e substituindo apenas pelos valores, perdendo o texto entre placeholders
-        
-        # Se o parágrafo tem apenas uma run, é mais simples
-        if len(paragrafo.runs) == 1:
-            paragrafo.runs[0].text = texto_substituido
-            return
-        
-        # CORREÇÃO: Em vez de limpar todas as runs, vamos apenas atualizar a primeira
-        # com o texto completo substituído e depois limpar as demais
-        if len(paragrafo.runs) > 0:
-            # Atualiza a primeira run com o texto completo substituído
-            paragrafo.runs[0].text = texto_substituido
-            
-            # Limpa todas as outras runs para evitar duplicação de texto
-            for i in range(1, len(paragrafo.runs)):
-                paragrafo.runs[i].text = ""
-    
-    def _processar_runs_fragmentados(self, paragrafo, dados: Dict[str, Any]) -> bool:
-        """
-        Processa placeholders que podem estar fragmentados entre diferentes runs.
-        
-        Args:
-            paragrafo: Parágrafo a ser processado.
+            nome_campo: Nome do campo referenciado pelo placeholder.
             dados: Dicionário com os dados para substituição.
             
         Returns:
-            True se algum placeholder foi processado, False caso contrário.
+            Texto formatado do valor, marcação de campo obrigatório ausente ou string vazia.
         """
-        # Log detalhado das runs para diagnóstico
-        logger.debug(f"Verificando fragmentação em parágrafo com {len(paragrafo.runs)} runs")
-        for i, run in enumerate(paragrafo.runs):
-            texto_run_hex = run.text.encode('utf-8').hex()
-            logger.debug(f"Run {i}: '{run.text}' (Hex: {texto_run_hex})")
-        
-        # 1. Reconstruir o texto concatenado das runs
-        runs_texto = [run.text for run in paragrafo.runs]
-        texto_completo = "".join(runs_texto)
-        
-        # Log do texto completo para diagnóstico
-        texto_completo_hex = texto_completo.encode('utf-8').hex()
-        logger.debug(f"Texto completo concatenado: '{texto_completo}' (Hex: {texto_completo_hex})")
-        
-        # 2. Buscar placeholders no texto completo com regex mais flexível
-        # ALTERADO: Permite espaços entre chaves e nome do campo
-        placeholders = re.finditer(r'{{[\s]*([^{}]+?)[\s]*}}', texto_completo)
-        
-        # Flag para indicar se algum placeholder foi encontrado e processado
-        processou_algum = False
-        
-        # 3. Para cada placeholder, determinar quais runs são afetadas
-        for match in placeholders:
-            inicio = match.start()  # Início do placeholder (posição do primeiro '{')
-            fim = match.end()       # Fim do placeholder (posição após o último '}')
-            nome_campo = match.group(1).strip()
-            placeholder_completo = match.group(0)
-            
-            logger.debug(f"Placeholder fragmentado encontrado: '{placeholder_completo}' (campo: '{nome_campo}')")
-            logger.debug(f"Posição: {inicio}-{fim} (comprimento texto: {len(texto_completo)})")
-            
-            # Ignorar marcadores de seção
-            if nome_campo.startswith('#') or nome_campo.startswith('/'):
-                logger.debug(f"Ignorando marcador de seção: '{nome_campo}'")
-                continue
-            
-            # Registra campo encontrado
-            self.campos_encontrados.add(nome_campo)
-            processou_algum = True
-            
-            # Determinar em quais runs o placeholder está
-            runs_afetadas = []
-            indices_em_runs = []
-            posicao_atual = 0
-            
-            # Log para diagnóstico antes de processar runs
-            logger.debug(f"Analisando distribuição do placeholder entre runs:")
-            
-            for i_run, texto_run in enumerate(runs_texto):
-                nova_posicao = posicao_atual + len(texto_run)
-                logger.debug(f"  Run {i_run}: posição {posicao_atual}-{nova_posicao}")
-                
-                # Run contém início do placeholder
-                if posicao_atual <= inicio < nova_posicao:
-                    runs_afetadas.append(i_run)
-                    indices_em_runs.append((inicio - posicao_atual, min(len(texto_run), fim - posicao_atual)))
-                    logger.debug(f"    Contém INÍCIO do placeholder em {inicio - posicao_atual}")
-                
-                # Run contém parte intermediária do placeholder
-                elif posicao_atual > inicio and nova_posicao < fim:
-                    runs_afetadas.append(i_run)
-                    indices_em_runs.append((0, len(texto_run)))
-                    logger.debug(f"    Contém PARTE INTERMEDIÁRIA do placeholder")
-                
-                # Run contém final do placeholder
-                elif posicao_atual < fim <= nova_posicao and posicao_atual > inicio:
-                    runs_afetadas.append(i_run)
-                    indices_em_runs.append((0, fim - posicao_atual))
-                    logger.debug(f"    Contém FIM do placeholder em {fim - posicao_atual}")
-                
-                posicao_atual = nova_posicao
-            
-            logger.debug(f"Runs afetadas: {runs_afetadas}")
-            logger.debug(f"Índices em runs: {indices_em_runs}")
-            
-            # 4. Substituir o placeholder nas runs afetadas
-            if nome_campo in dados:
-                # Marcar como substituído
-                self.campos_substituidos.add(nome_campo)
-                
-                # Obter valor para substituição
-                valor = dados[nome_campo]
-                
-                # MELHORIA: Detecção aprimorada de campos monetários
-                # Busca informações do campo para aplicar formatação
-                campo_info = self.motor_regras.obter_campo_por_nome(nome_campo)
-                
-                # Tenta usar tipo de dado do modelo relacional
-                tipo_monetario = False
-                tipo_formatacao = None
-                
-                if campo_info:
-                    # Verificar tipo_formatacao explícito
-                    if 'tipo_formatacao' in campo_info:
-                        tipo_formatacao = campo_info['tipo_formatacao']
-                        # Se tem formato monetário (#.##0,00)
-                        if tipo_formatacao and ('#.##0,00' in tipo_formatacao or 'dinheiro' in tipo_formatacao.lower() or 'monetário' in tipo_formatacao.lower()):
-                            tipo_monetario = True
-                    
-                    # Verificar tipo_dado_programacao
-                    if 'tipo_dado_programacao' in campo_info:
-                        tipo = campo_info['tipo_dado_programacao'].lower()
-                        tipo_monetario = tipo_monetario or 'dinheiro' in tipo or 'moeda' in tipo or 'valor' in tipo or 'salario' in tipo
-                
-                # Se não identificou pelo tipo, tenta identificar pelo nome do campo
-                if not tipo_monetario:
-                    nomes_monetarios = ['valor', 'salario', 'remuneracao', 'vencimento', 'subsidio', 'proventos']
-                    tipo_monetario = any(termo in nome_campo.lower() for termo in nomes_monetarios)
-                
-                # Formatação para valores monetários
-                valor_formatado = str(valor) if valor is not None else ""
-                
-                if tipo_monetario and isinstance(valor, (int, float)):
-                    valor_formatado = self._formatar_valor_monetario(valor, tipo_formatacao)
-                    logger.debug(f"Valor monetário formatado: '{valor}' -> '{valor_formatado}'")
-                elif campo_info and 'tipo_dado_programacao' in campo_info:
-                    tipo = campo_info['tipo_dado_programacao'].lower()
-                    # Formatação para valores por extenso
-                    if 'extenso' in tipo and isinstance(valor, (int, float)):
-                        valor_formatado = self._valor_por_extenso(valor)
-                
-                # Aplicar substituição nas runs
-                if runs_afetadas:
-                    # Primeira run com parte do placeholder
-                    primeira_run = paragrafo.runs[runs_afetadas[0]]
-                    primeiro_inicio, primeiro_fim = indices_em_runs[0]
-                    
-                    logger.debug(f"Substituindo em {len(runs_afetadas)} runs por '{valor_formatado}'")
-                    
-                    # A primeira run mantém o texto antes do placeholder e recebe o valor
-                    novo_texto_primeira_run = primeira_run.text[:primeiro_inicio] + valor_formatado
-                    logger.debug(f"Primeira run original: '{primeira_run.text}'")
-                    logger.debug(f"Primeira run nova: '{novo_texto_primeira_run}'")
-                    primeira_run.text = novo_texto_primeira_run
-                    
-                    # As runs intermediárias são limpas
-                    for i in range(1, len(runs_afetadas)):
-                        run_idx = runs_afetadas[i]
-                        logger.debug(f"Limpando run {run_idx}: '{paragrafo.runs[run_idx].text}'")
-                        paragrafo.runs[run_idx].text = ""
-                        
-                    # A última run mantém o texto após o placeholder
-                    if len(runs_afetadas) > 1:
-                        ultima_run = paragrafo.runs[runs_afetadas[-1]]
-                        _, ultimo_fim = indices_em_runs[-1]
-                        
-                        if ultimo_fim < len(ultima_run.text):
-                            novo_texto_ultima_run = ultima_run.text[ultimo_fim:]
-                            logger.debug(f"Última run original: '{ultima_run.text}'")
-                            logger.debug(f"Última run nova: '{novo_texto_ultima_run}'")
-                            ultima_run.text = novo_texto_ultima_run
-                        else:
-                            logger.debug(f"Última run limpada completamente: '{ultima_run.text}'")
-                            ultima_run.text = ""
-                    
-                    logger.info(f"Substituído placeholder fragmentado '{nome_campo}' por '{valor_formatado}'")
-            else:
-                # Campo ausente
-                self.campos_ausentes.add(nome_campo)
-                
-                # Verifica se é obrigatório
-                campo_info = self.motor_regras.obter_campo_por_nome(nome_campo)
-                obrigatorio = False
-                if campo_info and 'obrigatorio_quando_ativo' in campo_info:
-                    obrigatorio = campo_info['obrigatorio_quando_ativo']
-                
-                # Substitui por texto indicando campo obrigatório ausente ou vazio
-                texto_substituicao = f"**[CAMPO OBRIGATÓRIO: {nome_campo}]**" if obrigatorio else ""
-                
-                if obrigatorio:
-                    self.campos_obrigatorios_ausentes.add(nome_campo)
-                    logger.warning(f"Campo obrigatório ausente: '{nome_campo}'")
-                else:
-                    logger.debug(f"Campo ausente (não obrigatório): '{nome_campo}'")
-                
-                # Similar à substituição normal, mas com texto diferente
-                if runs_afetadas:
-                    primeira_run = paragrafo.runs[runs_afetadas[0]]
-                    primeiro_inicio, primeiro_fim = indices_em_runs[0]
-                    
-                    logger.debug(f"Substituindo campo ausente em {len(runs_afetadas)} runs")
-                    primeira_run.text = primeira_run.text[:primeiro_inicio] + texto_substituicao
-                    
-                    for i in range(1, len(runs_afetadas)):
-                        paragrafo.runs[runs_afetadas[i]].text = ""
-                        
-                    if len(runs_afetadas) > 1:
-                        ultima_run = paragrafo.runs[runs_afetadas[-1]]
-                        _, ultimo_fim = indices_em_runs[-1]
-                        if ultimo_fim < len(ultima_run.text):
-                            ultima_run.text = ultima_run.text[ultimo_fim:]
-                        else:
-                            ultima_run.text = ""
-        
-        return processou_algum
-    
-    def _substituir_campos(self, texto: str, dados: Dict[str, Any]) -> str:
-        """
-        Substitui os marcadores de campo no texto pelos valores correspondentes.
+        formatador = self.formatadores[nome_campo]
         
-        Args:
-            texto: Texto com marcadores.
-            dados: Dicionário com os dados para substituição.
-            
-        Returns:
-            Texto com os marcadores substituídos.
-        """
-        def substituir(match):
-            # Captura o placeholder completo e o nome do campo
-            placeholder_completo = match.group(0)
-            nome_campo = match.group(1).strip()  # Remove espaços extras
-            
-            logger.debug(f"Substituindo placeholder: '{placeholder_completo}', campo: '{nome_campo}'")
-            
-            # Ignora marcadores de seção
-            if nome_campo.startswith('#') or nome_campo.startswith('/'):
-                logger.debug(f"Ignorando marcador de seção: '{nome_campo}'")
-                return match.group(0)
-            
-            # Busca informações do campo no modelo relacional    
-            campo_info = self.motor_regras.obter_campo_por_nome(nome_campo)
-            
-            if nome_campo in dados:
-                valor = dados[nome_campo]
-                self.campos_substituidos.add(nome_campo)
-                
-                logger.debug(f"Valor encontrado para '{nome_campo}': '{valor}'")
-                
-                # DETECÇÃO DE CAMPO MONETÁRIO (APRIMORADA)
-                tipo_monetario = False
-                tipo_formatacao = None
-                
-                # 1. Verificar por tipo_formatacao explícito no campo_info
-                if campo_info and 'tipo_formatacao' in campo_info:
-                    tipo_formatacao = campo_info['tipo_formatacao']
-                    if tipo_formatacao:
-                        indicadores_moeda = ['#.##0,00', 'dinheiro', 'monetário', 'moeda', 'r$']
-                        tipo_monetario = any(ind in tipo_formatacao.lower() for ind in indicadores_moeda)
-                    
-                # 2. Verificar por tipo_dado_programacao no campo_info
-                if campo_info and 'tipo_dado_programacao' in campo_info and not tipo_monetario:
-                    tipo = campo_info['tipo_dado_programacao'].lower()
-                    indicadores_moeda = ['dinheiro', 'moeda', 'valor', 'salario', 'monetário']
-                    tipo_monetario = any(ind in tipo for ind in indicadores_moeda)
-                
-                # 3. Identificação pelo nome do campo
-                if not tipo_monetario:
-                    nome_lower = nome_campo.lower()
-                    nomes_monetarios = ['valor', 'salario', 'remuneracao', 'vencimento', 'subsidio', 'proventos', 
-                                        'montante', 'importancia', 'quantia', 'bruto', 'liquido', 'total']
-                    tipo_monetario = any(termo in nome_lower for termo in nomes_monetarios)
-                
-                # APLICAÇÃO DE FORMATAÇÃO MONETÁRIA
-                if tipo_monetario and isinstance(valor, (int, float)):
-                    texto_formatado = self._formatar_valor_monetario(valor, tipo_formatacao)
-                    logger.debug(f"Formatado como moeda: '{valor}' → '{texto_formatado}'")
-                    return texto_formatado
-                
-                # VALOR POR EXTENSO
-                if campo_info and 'tipo_dado_programacao' in campo_info:
-                    tipo = campo_info['tipo_dado_programacao'].lower()
-                    if 'extenso' in tipo and isinstance(valor, (int, float)):
-                        texto_formatado = self._valor_por_extenso(valor)
-                        logger.debug(f"Formatado por extenso: '{valor}' → '{texto_formatado}'")
-                        return texto_formatado
-                
-                # Retorna o valor como string
-                return str(valor) if valor is not None else ""
-            else:
-                self.campos_ausentes.add(nome_campo)
-                logger.debug(f"Campo ausente: '{nome_campo}'")
-                
-                # Verifica se o campo é obrigatório usando o modelo relacional
-                obrigatorio = False
-                if campo_info and 'obrigatorio_quando_ativo' in campo_info:
-                    obrigatorio = campo_info['obrigatorio_quando_ativo']
-                
-                if obrigatorio:
-                    self.campos_obrigatorios_ausentes.add(nome_campo)
-                    # Marca visivelmente os campos obrigatórios ausentes
-                    texto_marcacao = f"**[CAMPO OBRIGATÓRIO: {nome_campo}]**"
-                    logger.warning(f"Campo obrigatório ausente: '{nome_campo}'")
-                    return texto_marcacao
-                else:
-                    # Campos não obrigatórios ficam em branco
-                    return ""
+        if nome_campo in dados:
+            self.campos_substituidos.add(nome_campo)
+            return formatador(dados[nome_campo])
+        
+        # Campo ausente
+        self.campos_ausentes.add(nome_campo)
+        
+        if formatador.obrigatorio:
+            self.campos_obrigatorios_ausentes.add(nome_campo)
+            logger.warning(f"Campo obrigatório ausente: '{nome_campo}'")
+            # Substitui por texto indicando campo obrigatório ausente
+            return f"**[CAMPO OBRIGATÓRIO: {nome_campo}]**"
         
-        # MELHORADO: Regex mais flexível que permite espaços entre chaves e o nome do campo
-        regex_substituicao = r'{{[\s]*([^{}]+?)[\s]*}}'
-        resultado = re.sub(regex_substituicao, substituir, texto)
-        return resultado
+        logger.debug(f"Campo ausente (não obrigatório): '{nome_campo}'")
+        return ""
     
     def _exibir_campos_ausentes(self) -> None:
         """
@@ -961,12 +658,12 @@ class DocumentoProcessor:
         }
         
         for campo in campos:
-            # Tenta obter informações do campo usando o motor de regras
-            campo_info = self.motor_regras.obter_campo_por_nome(campo)
+            # Tenta obter a definição do campo usando o motor de regras
+            definicao = self.motor_regras.obter_definicao_campo(campo)
             
-            # Se encontrou informações e tem categoria
-            if campo_info and 'categoria' in campo_info and campo_info['categoria']:
-                categoria = campo_info['categoria']
+            # Se encontrou a definição e ela tem categoria
+            if definicao is not None and definicao.categoria:
+                categoria = definicao.categoria
                 # Verifica se a categoria já existe no resultado, senão cria
                 if categoria not in resultado:
                     resultado[categoria] = []
@@ -1072,7 +769,6 @@ class DocumentoProcessor:
     def _valor_por_extenso(self, valor: float) -> str:
         """
         Converte um valor numérico para sua representação por extenso.
-        Implementação mais completa.
         
         Args:
             valor: Valor numérico.
@@ -1080,65 +776,7 @@ class DocumentoProcessor:
         Returns:
             String com o valor por extenso.
         """
-        unidades = ["", "um", "dois", "três", "quatro", "cinco", "seis", "sete", "oito", "nove"]
-        dezenas = ["", "dez", "vinte", "trinta", "quarenta", "cinquenta", "sessenta", "setenta", "oitenta", "noventa"]
-        centenas = ["", "cem", "duzentos", "trezentos", "quatrocentos", "quinhentos", "seiscentos", "setecentos", "oitocentos", "novecentos"]
-        especiais = {
-            11: "onze", 12: "doze", 13: "treze", 14: "quatorze", 15: "quinze",
-            16: "dezesseis", 17: "dezessete", 18: "dezoito", 19: "dezenove"
-        }
-        
-        # Separa parte inteira e decimal
-        parte_inteira = int(valor)
-        parte_decimal = int(round((valor - parte_inteira) * 100))
-        
-        # Função para processar um número até 999
-        def processar_grupo(num):
-            if num == 0:
-                return ""
-            if num <= 9:
-                return unidades[num]
-            if num in especiais:
-                return especiais[num]
-            if num < 100:
-                dezena = dezenas[num // 10]
-                unidade = unidades[num % 10]
-                if unidade:
-                    return f"{dezena} e {unidade}"
-                return dezena
-            # Números de 100 a 999
-            if num == 100:
-                return "cem"
-            centena = centenas[num // 100]
-            resto = num % 100
-            if resto == 0:
-                return centena
-            return f"{centena} e {processar_grupo(resto)}"
-        
-        # Processa parte inteira
-        if parte_inteira == 0:
-            texto_reais = "zero"
-        else:
-            texto_reais = processar_grupo(parte_inteira)
-        
-        # Processa parte decimal
-        if parte_decimal == 0:
-            texto_centavos = "zero"
-        else:
-            texto_centavos = processar_grupo(parte_decimal)
-        
-        # Monta texto final
-        if parte_inteira == 1:
-            texto_reais += " real"
-        else:
-            texto_reais += " reais"
-            
-        if parte_decimal == 1:
-            texto_centavos += " centavo"
-        else:
-            texto_centavos += " centavos"
-            
-        return f"{texto_reais} e {texto_centavos}"
+        return valor_por_extenso(valor)
 
     def _injetar_marcadores_secao(self, doc: Document) -> Document:
         """
@@ -1299,36 +937,7 @@ class DocumentoProcessor:
         Returns:
             String formatada do valor monetário
         """
-        if not isinstance(valor, (int, float)):
-            return str(valor)
-            
-        # Import locale para formatação conforme configuração regional
-        import locale
-        try:
-            # Tenta configurar o locale para pt_BR (português do Brasil)
-            locale.setlocale(locale.LC_ALL, 'pt_BR.UTF-8')
-        except locale.Error:
-            try:
-                # Fallback para Portuguese/Brazil
-                locale.setlocale(locale.LC_ALL, 'Portuguese_Brazil.1252')
-            except locale.Error:
-                # Se não conseguir, mantém o locale atual
-                pass
-                
-        # Estratégias de formatação em ordem de preferência
-        try:
-            # Tentativa 1: Usar formato brasileiro com separador de milhar via locale
-            texto_formatado = f"R$ {locale.currency(valor, grouping=True, symbol=False)}"
-        except:
-            try:
-                # Tentativa 2: Formato manual com separador de milhar
-                texto_formatado = f"R$ {valor:,.2f}".replace(",", "X").replace(".", ",").replace("X", ".")
-            except:
-                # Tentativa 3: Formato simples
-                texto_formatado = f"R$ {valor:.2f}".replace('.', ',')
-            
-        logger.debug(f"Valor monetário formatado: {valor} → {texto_formatado} (formato: {tipo_formatacao})")
-        return texto_formatado
+        return formatar_moeda(valor)
 
     def _determinar_secoes_ativas(self, dados: Dict[str, Any]) -> List[str]:
         """
@@ -1415,9 +1024,10 @@ class DocumentoProcessor:
             # Verifica se os campos ausentes têm valores padrão no modelo relacional
             campos_com_padrao = []
             for campo in campos_ausentes_lista:
-                info = self.motor_regras.obter_campo_por_nome(campo)
-                if info and 'valor_padrao' in info and info['valor_padrao'] is not None:
-                    campos_com_padrao.append(f"{campo} (padrão: {info['valor_padrao']})")
+                definicao = self.motor_regras.obter_definicao_campo(campo)
+                valor_padrao = definicao.obter('valor_padrao') if definicao is not None else None
+                if valor_padrao is not None:
+                    campos_com_padrao.append(f"{campo} (padrão: {valor_padrao})")
             
             if campos_com_padrao:
                 logger.info(f"Os seguintes campos ausentes têm valores padrão: {', '.join(campos_com_padrao)}")
@@ -1448,106 +1058,69 @@ class DocumentoProcessor:
                 logger.error(f"ATENÇÃO: As seguintes seções deveriam estar ativas, mas não foram encontradas no documento: {sorted(list(secoes_ausentes_ativas))}")
                 
         # Verificação adicional para valores monetários
-        campos_monetarios = []
-        for campo in self.campos_substituidos:
-            info = self.motor_regras.obter_campo_por_nome(campo)
-            if info:
-                # Verifica se é um campo monetário
-                tipo_monetario = False
-                if 'tipo_formatacao' in info:
-                    tipo_formatacao = info['tipo_formatacao']
-                    if tipo_formatacao and ('#.##0,00' in tipo_formatacao or 'dinheiro' in tipo_formatacao.lower() or 'monetário' in tipo_formatacao.lower()):
-                        tipo_monetario = True
-                
-                if 'tipo_dado_programacao' in info:
-                    tipo = info['tipo_dado_programacao'].lower()
-                    if 'dinheiro' in tipo or 'moeda' in tipo or 'valor' in tipo or 'salario' in tipo:
-                        tipo_monetario = True
-                        
-                if tipo_monetario:
-                    campos_monetarios.append(campo)
+        campos_monetarios = self.formatadores.campos_monetarios(self.campos_substituidos)
                     
         if campos_monetarios:
             logger.info(f"Os seguintes campos monetários foram processados: {', '.join(campos_monetarios)}")
         
         return None 
 
-    def _substituir_todos_campos(self, doc: Document, dados: Dict[str, Any]) -> Document:
+    def _substituir_todos_campos(self, doc: Document, dados: Dict[str, Any],
+                                 plano: Optional[PlanoRenderizacao] = None) -> Document:
         """
         Substitui todos os campos no documento pelos valores correspondentes.
         
+        Apenas os parágrafos dinâmicos registrados no plano de renderização são
+        visitados (corpo, tabelas, cabeçalhos e rodapés); os estáticos são ignorados.
+        
         Args:
             doc: Documento a ser processado.
             dados: Dicionário com os dados para substituição.
+            plano: Plano de renderização do template. Se None, é compilado a partir do documento.
             
         Returns:
             Documento com campos substituídos.
         """
         logger.info("Iniciando substituição de campos no documento")
         
-        # Processa todos os parágrafos
-        for i, paragrafo in enumerate(doc.paragraphs):
-            # Primeiro verifica se há placeholders fragmentados
-            processou_fragmentados = self._processar_runs_fragmentados(paragrafo, dados)
-            
-            # Se não processou fragmentados, processa o parágrafo inteiro
-            if not processou_fragmentados:
-                texto_original = paragrafo.text
-                if '{{' in texto_original and '}}' in texto_original:
-                    texto_substituido = self._substituir_campos(texto_original, dados)
-                    
-                    # Só aplica a substituição se houve mudança
-                    if texto_substituido != texto_original:
-                        paragrafo.text = texto_substituido
-                        logger.debug(f"Parágrafo {i+1} substituído: '{texto_original[:50]}...' → '{texto_substituido[:50]}...'")
-        
-        # Processa tabelas
-        for i, tabela in enumerate(doc.tables):
-            logger.debug(f"Processando tabela {i+1} com {len(tabela.rows)} linhas")
-            
-            for row_idx, row in enumerate(tabela.rows):
-                for cell_idx, cell in enumerate(row.cells):
-                    # Processa cada parágrafo na célula
-                    for p_idx, paragraph in enumerate(cell.paragraphs):
-                        # Primeiro verifica se há placeholders fragmentados
-                        processou_fragmentados = self._processar_runs_fragmentados(paragraph, dados)
-                        
-                        # Se não processou fragmentados, processa o parágrafo inteiro
-                        if not processou_fragmentados:
-                            texto_original = paragraph.text
-                            if '{{' in texto_original and '}}' in texto_original:
-                                texto_substituido = self._substituir_campos(texto_original, dados)
-                                
-                                # Só aplica a substituição se houve mudança
-                                if texto_substituido != texto_original:
-                                    paragraph.text = texto_substituido
-                                    logger.debug(f"Tabela {i+1}, linha {row_idx+1}, coluna {cell_idx+1}, parágrafo {p_idx+1} substituído")
-        
-        # Processa cabeçalhos
-        for section in doc.sections:
-            # Cabeçalho primeiro
-            if section.header:
-                for paragraph in section.header.paragraphs:
-                    processou_fragmentados = self._processar_runs_fragmentados(paragraph, dados)
-                    if not processou_fragmentados:
-                        texto_original = paragraph.text
-                        if '{{' in texto_original and '}}' in texto_original:
-                            texto_substituido = self._substituir_campos(texto_original, dados)
-                            if texto_substituido != texto_original:
-                                paragraph.text = texto_substituido
-                                logger.debug(f"Cabeçalho substituído: '{texto_original[:50]}...' → '{texto_substituido[:50]}...'")
+        if plano is None:
+            plano = compilar_plano(doc)
+        
+        for historia, raiz in iterar_historias(doc):
+            paragrafos_plano = plano.historias.get(historia)
+            if not paragrafos_plano:
+                continue
             
-            # Rodapé depois
-            if section.footer:
-                for paragraph in section.footer.paragraphs:
-                    processou_fragmentados = self._processar_runs_fragmentados(paragraph, dados)
-                    if not processou_fragmentados:
-                        texto_original = paragraph.text
-                        if '{{' in texto_original and '}}' in texto_original:
-                            texto_substituido = self._substituir_campos(texto_original, dados)
-                            if texto_substituido != texto_original:
-                                paragraph.text = texto_substituido
-                                logger.debug(f"Rodapé substituído: '{texto_original[:50]}...' → '{texto_substituido[:50]}...'")
+            # Os índices do plano seguem a ordem de documento dos parágrafos da história
+            paragrafos = listar_paragrafos(raiz)
+            for paragrafo_plano in paragrafos_plano:
+                if paragrafo_plano.indice >= len(paragrafos):
+                    logger.warning(f"Parágrafo {paragrafo_plano.indice} do plano não existe em '{historia}'")
+                    continue
+                self._substituir_campos_paragrafo(paragrafos[paragrafo_plano.indice], paragrafo_plano, dados)
         
         logger.info(f"Substituição de campos concluída. Encontrados {len(self.campos_encontrados)} campos, substituídos {len(self.campos_substituidos)}")
-        return doc 
\ No newline at end of file
+        return doc 
+    
+    def _substituir_campos_paragrafo(self, paragrafo: Any, paragrafo_plano: ParagrafoPlano, dados: Dict[str, Any]) -> None:
+        """
+        Aplica as edições do plano às runs de um parágrafo (placeholders inteiros
+        ou fragmentados), sem reanalisar o texto.
+        
+        Args:
+            paragrafo: Elemento <w:p> do documento em renderização.
+            paragrafo_plano: Parágrafo do plano, com as ocorrências e edições por run.
+            dados: Dicionário com os dados para substituição.
+        """
+        for ocorrencia in paragrafo_plano.ocorrencias:
+            if ocorrencia.tipo == TIPO_CAMPO:
+                self.campos_encontrados.add(ocorrencia.nome)
+        
+        if not paragrafo_plano.edicoes:
+            return
+        
+        runs = listar_runs(paragrafo)
+        resolver = lambda nome_campo: self._resolver_valor_campo(nome_campo, dados)
+        for indice_run, edicoes in paragrafo_plano.edicoes.items():
+            run = runs[indice_run]
+            run.text = aplicar_edicoes(run.text, edicoes, resolver)
@@ -0,0 +1,443 @@
+"""
+Backend de renderização DOCX em nível de string para o sistema de peticionamento.
+
+Este módulo contém a classe DocumentoProcessorXML, alternativa ao
+DocumentoProcessor que não usa o modelo de objetos do python-docx. O XML bruto
+de word/document.xml, cabeçalhos e rodapés é tokenizado uma única vez em
+trechos literais e slots de placeholders; cada registro é renderizado juntando
+strings. No arquivo de saída, os membros não renderizados (mídia, estilos,
+fontes) são copiados em bytes, sem descompactar nem recomprimir.
+
+Indicado para templates sem lógica condicional de layout: templates com
+marcadores de seção ({{#SECAO}} / {{/SECAO}}) são delegados ao DocumentoProcessor.
+"""
+
+import os
+import re
+import time
+import zlib
+import struct
+import zipfile
+import posixpath
+import xml.etree.ElementTree as ET
+from contextlib import nullcontext
+from xml.sax.saxutils import escape, unescape
+from typing import Dict, List, Any, BinaryIO, Optional, Tuple, Union
+
+from src.documento_processor import DocumentoProcessor, _descrever_saida
+from src.plano_renderizacao import (
+    ChaveTemplate,
+    TIPO_CAMPO,
+    chave_template,
+    gerar_edicoes,
+    tokenizar_segmentos
+)
+from src.exceptions import (
+    TemplateError,
+    TemplateNaoEncontradoError
+)
+from src.logger import logger
+
+# Tokens do XML relevantes para a tokenização: início/fim de parágrafo e nós de texto
+_REGEX_XML = re.compile(r'<w:p(?:\s[^>]*)?/?>|</w:p>|<w:t(\s[^>]*)?>([^<]*)</w:t>')
+
+# Relações do pacote OPC usadas para localizar as partes renderizáveis
+_REL_DOCUMENTO = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument'
+_REL_CABECALHO = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships/header'
+_REL_RODAPE = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships/footer'
+_NS_RELS = '{http://schemas.openxmlformats.org/package/2006/relationships}'
+
+# Nó <w:t> que preserva espaços no início/fim do valor substituído
+_TAG_TEXTO_PRESERVA = '<w:t xml:space="preserve">'
+
+
+class ParteXML:
+    """
+    Parte XML do pacote compilada em trechos literais e slots de placeholders.
+
+    O XML renderizado é literais[0] + valor(slots[0]) + literais[1] + ... + literais[-1].
+    """
+
+    def __init__(self, nome: str, literais: List[str], slots: List[str]):
+        self.nome = nome
+        self.literais = literais
+        self.slots = slots
+
+    def renderizar(self, valores: List[str]) -> str:
+        """
+        Junta os trechos literais com os valores (já escapados) de cada slot.
+        """
+        pedacos = [self.literais[0]]
+        for valor, literal in zip(valores, self.literais[1:]):
+            pedacos.append(valor)
+            pedacos.append(literal)
+        return "".join(pedacos)
+
+
+def _compilar_parte(nome: str, xml: str) -> Tuple[ParteXML, int]:
+    """
+    Tokeniza o XML de uma parte em trechos literais e slots.
+
+    Os nós <w:t> são agrupados pelo parágrafo mais interno que os contém (os
+    de parágrafos aninhados, como caixas de texto, formam um grupo à parte), o
+    mesmo conjunto de runs de listar_runs no DocumentoProcessor; placeholders
+    fragmentados entre runs têm o valor inserido no primeiro nó e o restante do
+    placeholder removido dos nós seguintes.
+
+    Args:
+        nome: Nome do membro no pacote (ex.: word/document.xml).
+        xml: Conteúdo XML da parte.
+
+    Returns:
+        Tupla (parte compilada, quantidade de marcadores de seção encontrados).
+    """
+    # Edições em posições do XML: (início, fim, slot ou None, texto literal)
+    edicoes: List[Tuple[int, int, Optional[str], str]] = []
+    tags_preservar = set()
+    marcadores = 0
+
+    # Parágrafos abertos (do mais externo ao mais interno), cada um com seus nós de
+    # texto: (início do texto, fim do texto, início da tag, fim da tag) e textos
+    abertos: List[Tuple[List[Tuple[int, int, int, int]], List[str]]] = []
+
+    def fechar_paragrafo(nos: List[Tuple[int, int, int, int]], textos: List[str]) -> None:
+        nonlocal marcadores
+        if not nos:
+            return
+        ocorrencias = tokenizar_segmentos(textos)
+        marcadores += sum(1 for ocorrencia in ocorrencias if ocorrencia.tipo != TIPO_CAMPO)
+        for indice, edicoes_no in gerar_edicoes(ocorrencias, textos).items():
+            inicio_texto, _, inicio_tag, fim_tag = nos[indice]
+            for inicio, fim, campo in edicoes_no:
+                if campo is not None:
+                    edicoes.append((inicio_texto + inicio, inicio_texto + fim, unescape(campo), ""))
+                    tags_preservar.add((inicio_tag, fim_tag))
+                else:
+                    edicoes.append((inicio_texto + inicio, inicio_texto + fim, None, ""))
+
+    for match in _REGEX_XML.finditer(xml):
+        if match.group(2) is None:
+            token = match.group(0)
+            if token == '</w:p>':
+                if abertos:
+                    fechar_paragrafo(*abertos.pop())
+            elif not token.endswith('/>'):
+                abertos.append(([], []))
+            continue
+        if not abertos:
+            abertos.append(([], []))
+        nos, textos = abertos[-1]
+        nos.append((match.start(2), match.end(2), match.start(), match.start(2)))
+        textos.append(match.group(2))
+    while abertos:
+        fechar_paragrafo(*abertos.pop())
+
+    for inicio_tag, fim_tag in tags_preservar:
+        edicoes.append((inicio_tag, fim_tag, None, _TAG_TEXTO_PRESERVA))
+    edicoes.sort(key=lambda e: e[0])
+
+    literais: List[str] = []
+    slots: List[str] = []
+    atual: List[str] = []
+    posicao = 0
+    for inicio, fim, slot, literal in edicoes:
+        atual.append(xml[posicao:inicio])
+        if slot is None:
+            atual.append(literal)
+        else:
+            literais.append("".join(atual))
+            slots.append(slot)
+            atual = []
+        posicao = fim
+    atual.append(xml[posicao:])
+    literais.append("".join(atual))
+
+    return ParteXML(nome, literais, slots), marcadores
+
+
+def _escapar_valor(valor: str) -> str:
+    """
+    Escapa um valor para inserção dentro de <w:t>, convertendo tabulações e
+    quebras de linha nos elementos equivalentes (como o python-docx faz).
+    """
+    texto = escape(valor)
+    if '\t' in texto or '\n' in texto or '\r' in texto:
+        texto = texto.replace('\r\n', '\n').replace('\r', '\n')
+        texto = texto.replace('\t', '</w:t><w:tab/>' + _TAG_TEXTO_PRESERVA)
+        texto = texto.replace('\n', '</w:t><w:br/>' + _TAG_TEXTO_PRESERVA)
+    return texto
+
+
+def _data_hora_dos(data_hora: Tuple[int, int, int, int, int, int]) -> Tuple[int, int]:
+    """
+    Converte (ano, mês, dia, hora, minuto, segundo) para hora e data no formato DOS.
+    """
+    ano, mes, dia, hora, minuto, segundo = data_hora
+    data_dos = ((max(ano, 1980) - 1980) << 9) | (mes << 5) | dia
+    hora_dos = (hora << 11) | (minuto << 5) | (segundo // 2)
+    return hora_dos, data_dos
+
+
+class TemplateXML:
+    """
+    Template DOCX compilado para renderização em nível de string.
+    """
+
+    def __init__(self, template_path: str, chave: Optional[ChaveTemplate] = None):
+        """
+        Lê o pacote, guarda os membros brutos (já comprimidos) e compila as partes
+        renderizáveis (documento principal, cabeçalhos e rodapés).
+
+        Args:
+            template_path: Caminho do template DOCX.
+            chave: Chave de cache do template (calculada se None).
+        """
+        self.template_path = template_path
+        self.chave = chave or chave_template(template_path)
+        self.membros: List[zipfile.ZipInfo] = []
+        self.dados_brutos: Dict[str, bytes] = {}
+        self.partes: Dict[str, ParteXML] = {}
+        self.total_marcadores_secao = 0
+
+        with zipfile.ZipFile(template_path) as pacote:
+            self.membros = pacote.infolist()
+            nomes_renderizaveis = self._localizar_partes(pacote)
+
+            for nome in nomes_renderizaveis:
+                parte, marcadores = _compilar_parte(nome, pacote.read(nome).decode('utf-8'))
+                self.partes[nome] = parte
+                self.total_marcadores_secao += marcadores
+
+        with open(template_path, 'rb') as f:
+            for info in self.membros:
+                if info.filename not in self.partes:
+                    self.dados_brutos[info.filename] = self._ler_bruto(f, info)
+
+        self.campos = sorted({slot for parte in self.partes.values() for slot in parte.slots})
+
+    @staticmethod
+    def _localizar_partes(pacote: zipfile.ZipFile) -> List[str]:
+        """
+        Localiza, pelas relações do pacote, o documento principal e seus cabeçalhos e rodapés.
+        """
+        rels_pacote = ET.fromstring(pacote.read('_rels/.rels'))
+        documento = next(
+            (rel.get('Target', '').lstrip('/') for rel in rels_pacote.iter(f'{_NS_RELS}Relationship')
+             if rel.get('Type') == _REL_DOCUMENTO),
+            'word/document.xml'
+        )
+        nomes = [documento]
+
+        pasta, arquivo = posixpath.split(documento)
+        caminho_rels = posixpath.join(pasta, '_rels', arquivo + '.rels')
+        if caminho_rels in pacote.namelist():
+            rels_documento = ET.fromstring(pacote.read(caminho_rels))
+            for rel in rels_documento.iter(f'{_NS_RELS}Relationship'):
+                if rel.get('Type') in (_REL_CABECALHO, _REL_RODAPE) and rel.get('TargetMode') != 'External':
+                    nomes.append(posixpath.normpath(posixpath.join(pasta, rel.get('Target', ''))))
+        return nomes
+
+    @staticmethod
+    def _ler_bruto(arquivo, info: zipfile.ZipInfo) -> bytes:
+        """
+        Lê os bytes comprimidos de um membro diretamente do arquivo ZIP.
+        """
+        arquivo.seek(info.header_offset)
+        cabecalho = arquivo.read(30)
+        if cabecalho[:4] != b'PK\x03\x04':
+            raise TemplateError(f"Cabeçalho local inválido para '{info.filename}' no template")
+        tamanho_nome, tamanho_extra = struct.unpack('<HH', cabecalho[26:30])
+        arquivo.seek(info.header_offset + 30 + tamanho_nome + tamanho_extra)
+        return arquivo.read(info.compress_size)
+
+    def salvar(self, output_path: Union[str, BinaryIO], partes_renderizadas: Dict[str, bytes]) -> None:
+        """
+        Grava o pacote de saída: partes renderizadas comprimidas com deflate e
+        demais membros copiados sem recompressão, na ordem original.
+
+        Args:
+            output_path: Caminho do arquivo DOCX de saída, ou arquivo binário aberto
+                         (ex.: io.BytesIO), que não é fechado.
+            partes_renderizadas: Conteúdo renderizado de cada parte (nome -> bytes).
+        """
+        diretorio_central = []
+        destino = open(output_path, 'wb') if isinstance(output_path, str) else nullcontext(output_path)
+        with destino as saida:
+            for info in self.membros:
+                if info.filename in partes_renderizadas:
+                    conteudo = partes_renderizadas[info.filename]
+                    compressor = zlib.compressobj(6, zlib.DEFLATED, -15)
+                    dados = compressor.compress(conteudo) + compressor.flush()
+                    metodo = zipfile.ZIP_DEFLATED
+                    crc = zlib.crc32(conteudo) & 0xFFFFFFFF
+                    tamanho = len(conteudo)
+                else:
+                    dados = self.dados_brutos[info.filename]
+                    metodo = info.compress_type
+                    crc = info.CRC
+                    tamanho = info.file_size
+
+                if len(dados) >= 0xFFFFFFFF or tamanho >= 0xFFFFFFFF:
+                    raise TemplateError(f"Membro '{info.filename}' excede o limite de tamanho do ZIP")
+
+                nome = info.filename.encode('utf-8')
+                # Bit 3 (data descriptor) é removido: os tamanhos vão no cabeçalho local
+                flags = (info.flag_bits & ~0x08) | 0x800
+                hora_dos, data_dos = _data_hora_dos(info.date_time)
+                deslocamento = saida.tell()
+
+                saida.write(struct.pack('<4s5H3L2H', b'PK\x03\x04', 20, flags, metodo,
+                                        hora_dos, data_dos, crc, len(dados), tamanho, len(nome), 0))
+                saida.write(nome)
+                saida.write(dados)
+
+                diretorio_central.append(struct.pack('<4s6H3L5H2L', b'PK\x01\x02', 20, 20, flags, metodo,
+                                                     hora_dos, data_dos, crc, len(dados), tamanho,
+                                                     len(nome), 0, 0, 0, info.internal_attr,
+                                                     info.external_attr, deslocamento) + nome)
+
+            inicio_diretorio = saida.tell()
+            for entrada in diretorio_central:
+                saida.write(entrada)
+            tamanho_diretorio = saida.tell() - inicio_diretorio
+            saida.write(struct.pack('<4s4H2LH', b'PK\x05\x06', 0, 0, len(diretorio_central),
+                                    len(diretorio_central), tamanho_diretorio, inicio_diretorio, 0))
+
+
+# Cache de templates compilados por chave (caminho, mtime, tamanho)
+_CACHE_TEMPLATES_XML: Dict[ChaveTemplate, TemplateXML] = {}
+
+
+def obter_template_xml(template_path: str) -> TemplateXML:
+    """
+    Obtém o template compilado em cache, compilando-o apenas na primeira vez
+    (ou quando o arquivo for modificado).
+
+    Args:
+        template_path: Caminho do template DOCX.
+
+    Returns:
+        TemplateXML correspondente ao template.
+    """
+    chave = chave_template(template_path)
+    template = _CACHE_TEMPLATES_XML.get(chave)
+    if template is not None:
+        return template
+
+    # Descarta versões anteriores do mesmo arquivo
+    for chave_antiga in [c for c in _CACHE_TEMPLATES_XML if c[0] == chave[0]]:
+        del _CACHE_TEMPLATES_XML[chave_antiga]
+
+    template = TemplateXML(template_path, chave)
+    _CACHE_TEMPLATES_XML[chave] = template
+    logger.info(f"Template compilado para renderização XML: {template_path} "
+                f"({len(template.partes)} partes, {len(template.campos)} campos, "
+                f"{template.total_marcadores_secao} marcadores de seção)")
+    return template
+
+
+class DocumentoProcessorXML(DocumentoProcessor):
+    """
+    Processador de documentos DOCX que renderiza diretamente o XML do pacote.
+    """
+
+    def campos_template(self, template_path: str) -> List[str]:
+        """
+        Campos preenchidos pelo backend XML (nós <w:t> das partes compiladas),
+        mais os do plano do DocumentoProcessor, usado nos templates com seções.
+        """
+        campos = super().campos_template(template_path)
+        vistos = set(campos)
+        return campos + [campo for campo in obter_template_xml(template_path).campos if campo not in vistos]
+
+    def processar_documento(self,
+                          template_path: str,
+                          dados: Dict[str, Any],
+                          secoes_ativas: List[str],
+                          output_path: Union[str, BinaryIO]) -> Union[str, BinaryIO]:
+        """
+        Processa um documento DOCX substituindo os campos diretamente no XML.
+
+        Templates com marcadores de seção são processados pelo DocumentoProcessor.
+
+        Args:
+            template_path: Caminho para o arquivo de template DOCX.
+            dados: Dicionário com os dados a serem inseridos no documento.
+            secoes_ativas: Lista de IDs das seções que devem estar ativas.
+            output_path: Caminho para salvar o documento processado, ou arquivo
+                         binário aberto (ex.: io.BytesIO) que recebe o DOCX.
+
+        Returns:
+            Caminho do documento gerado (ou o próprio arquivo informado).
+
+        Raises:
+            TemplateError: Se o template não puder ser aberto ou processado.
+            DadosError: Se os dados estiverem incompletos ou inválidos.
+        """
+        try:
+            if not os.path.exists(template_path):
+                mensagem = f"Template não encontrado: {template_path}"
+                logger.error(mensagem)
+                raise TemplateNaoEncontradoError(mensagem)
+            template = obter_template_xml(template_path)
+        except Exception as e:
+            mensagem = f"Erro ao abrir o template: {str(e)}"
+            logger.error(mensagem)
+            raise TemplateError(mensagem) from e
+
+        if template.total_marcadores_secao:
+            logger.info("Template com marcadores de seção: usando o DocumentoProcessor (python-docx)")
+            return super().processar_documento(template_path, dados, secoes_ativas, output_path)
+
+        # Reinicia contadores e estatísticas para este processamento
+        self.campos_encontrados = set()
+        self.campos_substituidos = set()
+        self.campos_ausentes = set()
+        self.campos_obrigatorios_ausentes = set()
+        self.estatisticas_processamento = {}
+        self.secoes_encontradas = set()
+        self.secoes_ativas = secoes_ativas
+
+        tempo_inicio = time.time()
+
+        if not self.secoes_ativas:
+            self.secoes_ativas = self._determinar_secoes_ativas(dados)
+            logger.info(f"Seções ativas determinadas automaticamente: {self.secoes_ativas}")
+
+        # Substitui os campos, parte por parte
+        partes_renderizadas: Dict[str, bytes] = {}
+        for nome, parte in template.partes.items():
+            valores = []
+            for nome_campo in parte.slots:
+                self.campos_encontrados.add(nome_campo)
+                valores.append(_escapar_valor(self._resolver_valor_campo(nome_campo, dados)))
+            partes_renderizadas[nome] = parte.renderizar(valores).encode('utf-8')
+
+        self._validar_documento(dados)
+
+        try:
+            if isinstance(output_path, str):
+                diretorio = os.path.dirname(output_path)
+                if diretorio:
+                    os.makedirs(diretorio, exist_ok=True)
+            template.salvar(output_path, partes_renderizadas)
+            logger.info(f"Documento processado salvo em: {_descrever_saida(output_path)}")
+        except Exception as e:
+            mensagem = f"Erro ao salvar o documento processado: {str(e)}"
+            logger.error(mensagem)
+            raise TemplateError(mensagem) from e
+
+        tempo_total = time.time() - tempo_inicio
+        self.estatisticas_processamento = {
+            'campos_encontrados': len(self.campos_encontrados),
+            'campos_substituidos': len(self.campos_substituidos),
+            'campos_ausentes': len(self.campos_ausentes),
+            'campos_obrigatorios_ausentes': len(self.campos_obrigatorios_ausentes),
+            'secoes_encontradas': len(self.secoes_encontradas),
+            'secoes_ativas': len(self.secoes_ativas),
+            'tempo_processamento': f"{tempo_total:.3f} segundos"
+        }
+
+        logger.info(f"Estatísticas do processamento: {self.estatisticas_processamento}")
+
+        return output_path
@@ -0,0 +1,87 @@
+"""
+Leitura de registros da entrada padrão (main.py --stdin).
+
+A entrada pode ser CSV ou JSON (JSON Lines / NDJSON, array JSON ou um
+objeto); o formato é detectado pelo início do conteúdo. Como a entrada
+padrão não pode ser reposicionada, o início é lido antecipadamente e
+devolvido à frente do restante por um leitor bufferizado, que também
+oferece peek às leituras seguintes (detecção do separador do CSV e do
+formato JSON).
+
+A leitura antecipada usa apenas o que já está disponível (read1), até o
+primeiro caractere significativo: um produtor lento (ex.: um registro NDJSON
+a cada poucos segundos) não atrasa a detecção nem o primeiro documento.
+"""
+
+import io
+import sys
+from typing import BinaryIO, Optional
+
+from src.logger import logger
+
+# Formatos de entrada reconhecidos por detectar_formato_entrada
+FORMATO_CSV = "csv"
+FORMATO_JSON = "json"
+
+# Bytes lidos antecipadamente (no máximo) para a detecção de formato
+_TAMANHO_AMOSTRA = 64 * 1024
+
+# BOM UTF-8, ignorado na detecção de formato
+_BOM = b'\xef\xbb\xbf'
+
+
+class _LeitorComAmostra(io.RawIOBase):
+    """
+    Fluxo bruto que entrega primeiro a amostra já lida e depois o restante do arquivo de origem.
+    """
+
+    def __init__(self, amostra: bytes, origem: BinaryIO):
+        self._amostra = memoryview(amostra)
+        self._origem = origem
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, destino) -> int:
+        if self._amostra:
+            quantidade = min(len(destino), len(self._amostra))
+            destino[:quantidade] = self._amostra[:quantidade]
+            self._amostra = self._amostra[quantidade:]
+            return quantidade
+        dados = self._origem.read1(len(destino)) if hasattr(self._origem, 'read1') else self._origem.read(len(destino))
+        destino[:len(dados)] = dados
+        return len(dados)
+
+
+def abrir_entrada_padrao(origem: Optional[BinaryIO] = None) -> io.BufferedReader:
+    """
+    Prepara a entrada padrão (ou outro fluxo binário) para a leitura de registros.
+
+    Args:
+        origem: Fluxo binário de origem. Se None, usa sys.stdin.buffer.
+
+    Returns:
+        Leitor bufferizado cujo peek() alcança o início do conteúdo já disponível (até 64 KB).
+    """
+    origem = origem if origem is not None else sys.stdin.buffer
+    ler = origem.read1 if hasattr(origem, 'read1') else origem.read
+    amostra = b""
+    while len(amostra) < _TAMANHO_AMOSTRA and not amostra.lstrip(_BOM).strip():
+        dados = ler(_TAMANHO_AMOSTRA - len(amostra))
+        if not dados:
+            break
+        amostra += dados
+    return io.BufferedReader(_LeitorComAmostra(amostra, origem), buffer_size=max(len(amostra), io.DEFAULT_BUFFER_SIZE))
+
+
+def detectar_formato_entrada(arquivo: io.BufferedReader) -> str:
+    """
+    Detecta se o conteúdo é JSON (começa com "{" ou "[") ou CSV, sem consumi-lo.
+
+    Returns:
+        FORMATO_JSON ou FORMATO_CSV.
+    """
+    inicio = arquivo.peek(_TAMANHO_AMOSTRA).lstrip(_BOM).lstrip()
+    formato = FORMATO_JSON if inicio[:1] in (b'{', b'[') else FORMATO_CSV
+    logger.info(f"Formato detectado na entrada padrão: {formato.upper()}")
+    return formato
@@ -0,0 +1,198 @@
+"""
+Formatação de números e valores monetários no padrão brasileiro.
+
+As funções deste módulo não dependem do locale do processo (nunca chamam
+locale.setlocale) e não guardam estado mutável, de modo que podem ser usadas
+por várias threads ou processos ao mesmo tempo.
+
+- formatar_numero / formatar_moeda: máscara #.##0,00 (com ou sem "R$ "); o
+  separador de milhar sai direto da especificação de formato ("_") e é
+  trocado por ".", sem passar pelo módulo locale.
+- formatar_moedas: a mesma formatação para lotes de valores.
+- valor_por_extenso: valor em reais por extenso, até a casa dos bilhões
+  (e além, com trilhões), usando uma tabela pré-calculada de 0 a 999.
+"""
+
+from decimal import Decimal, ROUND_HALF_UP
+from typing import Any, Iterable, List, Tuple
+
+# Troca os separadores do formato americano (1,234.56) pelos brasileiros (1.234,56);
+# usada para Decimal, que não aceita "_" como separador de milhar
+_TABELA_SEPARADORES = str.maketrans({',': '.', '.': ','})
+
+PREFIXO_MOEDA = "R$ "
+
+_UNIDADES = ("", "um", "dois", "três", "quatro", "cinco", "seis", "sete", "oito", "nove",
+             "dez", "onze", "doze", "treze", "quatorze", "quinze",
+             "dezesseis", "dezessete", "dezoito", "dezenove")
+_DEZENAS = ("", "", "vinte", "trinta", "quarenta", "cinquenta", "sessenta", "setenta", "oitenta", "noventa")
+_CENTENAS = ("", "cento", "duzentos", "trezentos", "quatrocentos", "quinhentos",
+             "seiscentos", "setecentos", "oitocentos", "novecentos")
+
+# Escalas dos grupos de milhar: (singular, plural); o índice é a posição do grupo
+_ESCALAS = (
+    ("", ""),
+    ("mil", "mil"),
+    ("milhão", "milhões"),
+    ("bilhão", "bilhões"),
+    ("trilhão", "trilhões"),
+)
+
+_CENTAVO = Decimal("0.01")
+
+
+def _grupo_por_extenso(numero: int) -> str:
+    """
+    Escreve por extenso um número de 0 a 999 (0 resulta em string vazia).
+    """
+    if numero == 100:
+        return "cem"
+    centena, resto = divmod(numero, 100)
+    partes = []
+    if centena:
+        partes.append(_CENTENAS[centena])
+    if resto:
+        if resto < 20:
+            partes.append(_UNIDADES[resto])
+        else:
+            dezena, unidade = divmod(resto, 10)
+            partes.append(_DEZENAS[dezena] + (f" e {_UNIDADES[unidade]}" if unidade else ""))
+    return " e ".join(partes)
+
+
+# Tabela memoizada dos grupos de 0 a 999
+_GRUPOS: Tuple[str, ...] = tuple(_grupo_por_extenso(n) for n in range(1000))
+
+
+def formatar_numero(valor: Any, casas: int = 2) -> str:
+    """
+    Formata um número com separador de milhar "." e decimal "," (#.##0,00).
+
+    Args:
+        valor: Número (int, float ou Decimal).
+        casas: Quantidade de casas decimais.
+
+    Returns:
+        Número formatado, ex.: 1234.5 -> "1.234,50".
+    """
+    if isinstance(valor, Decimal):
+        return f"{valor:,.{casas}f}".translate(_TABELA_SEPARADORES)
+    return f"{valor:_.{casas}f}".replace('.', ',').replace('_', '.')
+
+
+def formatar_moeda(valor: Any) -> str:
+    """
+    Formata um valor monetário em reais (R$ #.##0,00).
+
+    Valores não numéricos são convertidos para texto sem alteração.
+
+    Args:
+        valor: Valor a ser formatado.
+
+    Returns:
+        Valor formatado, ex.: 1234.5 -> "R$ 1.234,50".
+    """
+    if isinstance(valor, (int, float)):
+        return f"R$ {valor:_.2f}".replace('.', ',').replace('_', '.')
+    if isinstance(valor, Decimal):
+        return PREFIXO_MOEDA + formatar_numero(valor)
+    return str(valor)
+
+
+def formatar_moedas(valores: Iterable[Any]) -> List[str]:
+    """
+    Formata uma sequência de valores monetários (mesmo resultado de formatar_moeda
+    para cada valor), evitando o custo de uma chamada de função por valor.
+
+    Args:
+        valores: Valores a serem formatados.
+
+    Returns:
+        Lista com os valores formatados, na mesma ordem.
+    """
+    return [
+        f"R$ {valor:_.2f}".replace('.', ',').replace('_', '.')
+        if type(valor) is float or type(valor) is int else formatar_moeda(valor)
+        for valor in valores
+    ]
+
+
+def inteiro_por_extenso(numero: int) -> str:
+    """
+    Escreve por extenso um número inteiro não negativo.
+
+    Args:
+        numero: Inteiro (até a casa dos trilhões).
+
+    Returns:
+        Número por extenso, ex.: 1234 -> "mil duzentos e trinta e quatro".
+
+    Raises:
+        ValueError: Se o número for negativo ou maior que a maior escala suportada.
+    """
+    if numero < 0:
+        raise ValueError(f"Número negativo: {numero}")
+    if numero == 0:
+        return "zero"
+
+    # Grupos de três dígitos, do menos para o mais significativo
+    grupos: List[int] = []
+    while numero:
+        numero, grupo = divmod(numero, 1000)
+        grupos.append(grupo)
+    if len(grupos) > len(_ESCALAS):
+        raise ValueError("Número grande demais para ser escrito por extenso")
+
+    partes: List[str] = []
+    ultimo_grupo = next(i for i, grupo in enumerate(grupos) if grupo)
+    for posicao in range(len(grupos) - 1, -1, -1):
+        grupo = grupos[posicao]
+        if not grupo:
+            continue
+        singular, plural = _ESCALAS[posicao]
+        if posicao == 1 and grupo == 1:
+            texto = "mil"
+        elif posicao == 0:
+            texto = _GRUPOS[grupo]
+        else:
+            texto = f"{_GRUPOS[grupo]} {singular if grupo == 1 else plural}"
+
+        if partes:
+            # "e" antes do último grupo quando ele é menor que 100 ou centena redonda
+            conector = " e " if posicao == ultimo_grupo and (grupo < 100 or grupo % 100 == 0) else " "
+            partes.append(conector)
+        partes.append(texto)
+    return "".join(partes)
+
+
+def valor_por_extenso(valor: Any) -> str:
+    """
+    Escreve por extenso um valor em reais, com centavos.
+
+    Args:
+        valor: Valor numérico (int, float ou Decimal).
+
+    Returns:
+        Valor por extenso, ex.: 1234.56 -> "mil duzentos e trinta e quatro reais
+        e cinquenta e seis centavos".
+    """
+    quantia = Decimal(str(valor)).quantize(_CENTAVO, rounding=ROUND_HALF_UP)
+    negativo = quantia < 0
+    reais, centavos = divmod(int(abs(quantia) * 100), 100)
+
+    partes = []
+    if reais or not centavos:
+        texto_reais = inteiro_por_extenso(reais)
+        if reais == 1:
+            texto_reais += " real"
+        elif reais >= 1000000 and reais % 1000000 == 0:
+            # "um milhão de reais", "dois bilhões de reais"
+            texto_reais += " de reais"
+        else:
+            texto_reais += " reais"
+        partes.append(texto_reais)
+    if centavos:
+        partes.append(f"{_GRUPOS[centavos]} {'centavo' if centavos == 1 else 'centavos'}")
+
+    texto = " e ".join(partes)
+    return f"menos {texto}" if negativo else texto
@@ -0,0 +1,278 @@
+"""
+Tabela de formatadores pré-compilados por campo.
+
+A forma de apresentar cada campo no documento (valor monetário, por extenso,
+data, máscara ou texto simples) é decidida uma única vez, quando as definições
+de campos são carregadas, a partir de tipo_dado_programacao, tipo_formatacao,
+mascara_formato e do nome do campo. A renderização apenas consulta o
+formatador do campo em um dicionário.
+"""
+
+import math
+import re
+from datetime import date, datetime
+from typing import Dict, List, Any, Optional, Callable, Iterable
+
+from src.formatacao import formatar_moeda, formatar_numero, valor_por_extenso
+
+# Tipos de formatação
+FORMATO_MONETARIO = 'monetario'
+FORMATO_EXTENSO = 'extenso'
+FORMATO_DATA = 'data'
+FORMATO_MASCARA = 'mascara'
+FORMATO_TEXTO = 'texto'
+
+# Termos no nome do campo que indicam valor monetário (campos sem definição de tipo)
+NOMES_MONETARIOS = ['valor', 'salario', 'remuneracao', 'vencimento', 'subsidio', 'proventos']
+
+# Indicadores de moeda em tipo_formatacao / mascara_formato e em tipo_dado_programacao
+_INDICADORES_FORMATACAO_MOEDA = ['#.##0,00', 'dinheiro', 'monetário', 'brl']
+_INDICADORES_TIPO_MOEDA = ['dinheiro', 'moeda', 'valor', 'salario']
+
+# Máscaras de data aceitas em mascara_formato
+_MASCARAS_DATA = {'dd/mm/yyyy', 'dd/mm/aaaa'}
+
+# Máscara de dígitos: 'x' representa um dígito, demais caracteres são literais (ex.: xxx.xxx.xxx-xx)
+_REGEX_MASCARA_DIGITOS = re.compile(r"^[x().\-/ ]*x[x().\-/ ]*$")
+
+# Máscara numérica com unidade (ex.: xx 'meses', x,xx 'horas')
+_REGEX_MASCARA_UNIDADE = re.compile(r"^x+(?:,(x+))?\s*'([^']*)'$")
+
+# Data ISO (AAAA-MM-DD), com ou sem horário
+_REGEX_DATA_ISO = re.compile(r'^(\d{4})-(\d{2})-(\d{2})(?:[T ].*)?$')
+
+
+def _texto_definicao(valor: Any) -> str:
+    """
+    Normaliza um atributo da definição do campo (None/NaN viram string vazia).
+    """
+    if valor is None or valor != valor:
+        return ""
+    return str(valor).strip()
+
+
+def _numero_finito(valor: Any) -> bool:
+    """
+    True para int e float finitos: bool, NaN e infinito (aceitos por json.loads) e inteiros
+    fora do intervalo do float são apresentados como texto.
+    """
+    if isinstance(valor, bool) or not isinstance(valor, (int, float)):
+        return False
+    try:
+        return math.isfinite(valor)
+    except OverflowError:
+        return False
+
+
+def formatar_data(valor: Any) -> str:
+    """
+    Formata datas como dd/mm/aaaa. Textos que não estão em formato ISO são mantidos.
+    """
+    if isinstance(valor, (datetime, date)):
+        return valor.strftime('%d/%m/%Y')
+    texto = str(valor)
+    match = _REGEX_DATA_ISO.match(texto)
+    if match:
+        ano, mes, dia = match.groups()
+        return f"{dia}/{mes}/{ano}"
+    return texto
+
+
+def _para_numero(valor: Any) -> Optional[float]:
+    """
+    Converte números e textos numéricos (com vírgula decimal) para float.
+    """
+    if isinstance(valor, bool):
+        return None
+    if isinstance(valor, (int, float)):
+        return valor
+    texto = str(valor).strip()
+    if not texto:
+        return None
+    try:
+        if ',' in texto:
+            texto = texto.replace('.', '').replace(',', '.')
+        return float(texto)
+    except ValueError:
+        return None
+
+
+def compilar_mascara(mascara: str) -> Optional[Callable[[Any], str]]:
+    """
+    Compila uma máscara de mascara_formato em uma função de formatação.
+
+    São suportadas máscaras de dígitos (ex.: xxx.xxx.xxx-xx, (xx) xxxxx-xxxx)
+    e números com unidade (ex.: xx 'meses', x,xx 'horas').
+
+    Args:
+        mascara: Máscara definida para o campo.
+
+    Returns:
+        Função que formata o valor, ou None se a máscara não for suportada.
+    """
+    match_unidade = _REGEX_MASCARA_UNIDADE.match(mascara)
+    if match_unidade:
+        casas = len(match_unidade.group(1) or "")
+        unidade = match_unidade.group(2)
+
+        def formatar_unidade(valor: Any) -> str:
+            numero = _para_numero(valor)
+            if numero is None:
+                return str(valor)
+            return f"{formatar_numero(numero, casas)} {unidade}"
+
+        return formatar_unidade
+
+    if _REGEX_MASCARA_DIGITOS.match(mascara):
+        total_digitos = mascara.count('x')
+
+        def formatar_digitos(valor: Any) -> str:
+            # NaN e infinito (aceitos por json.loads) ficam como texto
+            if _numero_finito(valor):
+                texto = str(int(valor))
+            else:
+                texto = str(valor)
+            digitos = re.sub(r'\D', '', texto)
+            if len(digitos) != total_digitos:
+                return texto
+            resultado = []
+            posicao = 0
+            for caractere in mascara:
+                if caractere == 'x':
+                    resultado.append(digitos[posicao])
+                    posicao += 1
+                else:
+                    resultado.append(caractere)
+            return "".join(resultado)
+
+        return formatar_digitos
+
+    return None
+
+
+class FormatadorCampo:
+    """
+    Formatador compilado de um campo: converte o valor dos dados no texto do documento.
+    """
+
+    def __init__(self, nome_campo: str, tipo: str = FORMATO_TEXTO, obrigatorio: bool = False,
+                 tipo_formatacao: Optional[str] = None, funcao_mascara: Optional[Callable[[Any], str]] = None):
+        """
+        Args:
+            nome_campo: Nome do campo.
+            tipo: Um dos FORMATO_* deste módulo.
+            obrigatorio: Se o campo é obrigatório quando ativo.
+            tipo_formatacao: tipo_formatacao da definição do campo.
+            funcao_mascara: Função compilada da máscara (para FORMATO_MASCARA).
+        """
+        self.nome_campo = nome_campo
+        self.tipo = tipo
+        self.obrigatorio = obrigatorio
+        self.tipo_formatacao = tipo_formatacao
+        self.funcao_mascara = funcao_mascara
+
+    @property
+    def monetario(self) -> bool:
+        """True se o campo é formatado como valor monetário."""
+        return self.tipo == FORMATO_MONETARIO
+
+    def __call__(self, valor: Any) -> str:
+        """
+        Formata o valor do campo. Valores que não se aplicam ao tipo (ex.: texto,
+        booleano, NaN ou infinito em campo monetário) são apresentados como texto.
+        """
+        if valor is None:
+            return ""
+        if self.tipo == FORMATO_MONETARIO:
+            if _numero_finito(valor):
+                return formatar_moeda(valor)
+        elif self.tipo == FORMATO_EXTENSO:
+            if _numero_finito(valor):
+                try:
+                    return valor_por_extenso(valor)
+                except (ValueError, ArithmeticError):
+                    # Acima da maior escala por extenso (trilhões): o valor fica como texto
+                    pass
+        elif self.tipo == FORMATO_DATA:
+            return formatar_data(valor)
+        elif self.tipo == FORMATO_MASCARA:
+            return self.funcao_mascara(valor)
+        return str(valor)
+
+    def __repr__(self) -> str:
+        return f"FormatadorCampo({self.nome_campo}: {self.tipo})"
+
+
+def compilar_formatador(nome_campo: str, definicao: Optional[Dict[str, Any]] = None) -> FormatadorCampo:
+    """
+    Decide a formatação de um campo a partir da sua definição.
+
+    Args:
+        nome_campo: Nome do campo.
+        definicao: Definição do campo (tipo_dado_programacao, tipo_formatacao,
+                   mascara_formato, obrigatorio_quando_ativo), ou None se o campo
+                   não está no modelo.
+
+    Returns:
+        FormatadorCampo do campo.
+    """
+    definicao = definicao or {}
+    tipo_dado = _texto_definicao(definicao.get('tipo_dado_programacao')).lower()
+    tipo_formatacao = _texto_definicao(definicao.get('tipo_formatacao'))
+    mascara = _texto_definicao(definicao.get('mascara_formato'))
+    obrigatorio = bool(definicao.get('obrigatorio_quando_ativo', False))
+
+    formatacao = f"{tipo_formatacao} {mascara}".lower()
+    monetario = (any(indicador in formatacao for indicador in _INDICADORES_FORMATACAO_MOEDA)
+                 or any(indicador in tipo_dado for indicador in _INDICADORES_TIPO_MOEDA)
+                 or any(termo in nome_campo.lower() for termo in NOMES_MONETARIOS))
+
+    if monetario:
+        return FormatadorCampo(nome_campo, FORMATO_MONETARIO, obrigatorio, tipo_formatacao or None)
+    if 'extenso' in tipo_dado:
+        return FormatadorCampo(nome_campo, FORMATO_EXTENSO, obrigatorio)
+    if tipo_dado in ('date', 'data') or mascara.lower() in _MASCARAS_DATA:
+        return FormatadorCampo(nome_campo, FORMATO_DATA, obrigatorio)
+    if mascara:
+        funcao_mascara = compilar_mascara(mascara)
+        if funcao_mascara is not None:
+            return FormatadorCampo(nome_campo, FORMATO_MASCARA, obrigatorio, funcao_mascara=funcao_mascara)
+    return FormatadorCampo(nome_campo, FORMATO_TEXTO, obrigatorio)
+
+
+class TabelaFormatadores(dict):
+    """
+    Dicionário nome_campo -> FormatadorCampo.
+
+    Campos fora do modelo (ex.: placeholders só existentes no template) recebem
+    o formatador padrão na primeira consulta, decidido pelo nome do campo.
+    """
+
+    def __missing__(self, nome_campo: str) -> FormatadorCampo:
+        formatador = compilar_formatador(nome_campo)
+        self[nome_campo] = formatador
+        return formatador
+
+    def campos_monetarios(self, campos: Iterable[str]) -> List[str]:
+        """
+        Filtra os campos formatados como valor monetário.
+        """
+        return [campo for campo in campos if self[campo].monetario]
+
+
+def construir_tabela_formatadores(definicoes: Iterable[Dict[str, Any]]) -> TabelaFormatadores:
+    """
+    Compila os formatadores de todos os campos definidos.
+
+    Args:
+        definicoes: Definições de campos (cada uma com 'nome_campo' e os atributos de formatação).
+
+    Returns:
+        TabelaFormatadores com um formatador por campo.
+    """
+    tabela = TabelaFormatadores()
+    for definicao in definicoes:
+        nome_campo = _texto_definicao(definicao.get('nome_campo'))
+        if nome_campo:
+            tabela[nome_campo] = compilar_formatador(nome_campo, definicao)
+    return tabela
@@ -20,6 +20,7 @@ from src.exceptions import (
     TemplateError,
     SubstituicaoError
 )
+from src.formatacao import formatar_numero
 from src.logger import logger
 from src.template_metadata import TemplateMetadata
 from src.template_repository import TemplateRepository, FileSystemTemplateRepository
@@ -327,15 +328,15 @@ class GeradorDocumento:
             if re.match(r'^[0-9]+,[0-9]+$', valor):
                 try:
                     valor_numerico = float(valor.replace(',', '.'))
-                    return f"{valor_numerico:.2f}".replace('.', ',')
+                    return formatar_numero(valor_numerico)
                 except:
                     pass
         
         # Formata números de forma padronizada
         if isinstance(valor, (int, float)):
-            # Formata como decimal com 2 casas se for float
+            # Formata como decimal com 2 casas (#.##0,00) se for float
             if isinstance(valor, float):
-                return f"{valor:.2f}".replace('.', ',')
+                return formatar_numero(valor)
             return str(valor)
         
         # Para outros tipos, converte para string
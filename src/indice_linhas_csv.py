@@ -0,0 +1,223 @@
+"""
+Índice de posições (bytes) das linhas de dados de um CSV.
+
+Permite reprocessar um registro ou uma faixa de registros (main.py --registros)
+lendo apenas as linhas correspondentes, sem percorrer o arquivo inteiro. O
+índice é construído uma única vez e gravado ao lado do CSV (arquivo
+"<csv>.idx"); nas leituras seguintes ele é reaproveitado enquanto o tamanho
+e a data de modificação do CSV forem os mesmos da construção.
+
+Os limites das linhas respeitam campos entre aspas com quebra de linha (com as
+regras de aspas do pandas, ver src/limites_csv.py), e as linhas em branco são
+ignoradas como na leitura do pandas, de modo que o registro N do índice é o
+mesmo registro N de ProcessadorCSV.carregar_em_fluxo.
+"""
+
+import os
+import struct
+from array import array
+from typing import Optional, Tuple
+
+from src.limites_csv import LimitesCSV
+from src.logger import logger
+
+# Extensão do arquivo de índice gravado ao lado do CSV
+EXTENSAO_INDICE = ".idx"
+
+# Identificação e versão do formato do arquivo de índice
+_ASSINATURA = b"PETIDX02"
+
+# Cabeçalho: tamanho do CSV, mtime (ns), separador, fim da linha de cabeçalho, quantidade de registros
+_FORMATO_CABECALHO = struct.Struct("<qqqqq")
+
+# Bytes lidos por vez na construção do índice
+_TAMANHO_LEITURA = 8 * 1024 * 1024
+
+
+class IndiceLinhasCSV:
+    """
+    Posições de início de cada registro (linha de dados) de um CSV.
+    """
+
+    __slots__ = ('caminho_arquivo', 'tamanho_arquivo', 'mtime_ns', 'separador', 'fim_cabecalho', 'inicios')
+
+    def __init__(self, caminho_arquivo: str, tamanho_arquivo: int, mtime_ns: int, separador: str,
+                 fim_cabecalho: int, inicios: array):
+        """
+        Args:
+            caminho_arquivo: Caminho do CSV indexado.
+            tamanho_arquivo: Tamanho do CSV (bytes) na construção do índice.
+            mtime_ns: Data de modificação do CSV (ns) na construção do índice.
+            separador: Separador de colunas usado na construção do índice.
+            fim_cabecalho: Posição do fim da linha de cabeçalho.
+            inicios: Posição de início de cada registro, seguida da posição
+                     de fim do último (array 'q' com total_registros + 1 itens).
+        """
+        self.caminho_arquivo = caminho_arquivo
+        self.tamanho_arquivo = tamanho_arquivo
+        self.mtime_ns = mtime_ns
+        self.separador = separador
+        self.fim_cabecalho = fim_cabecalho
+        self.inicios = inicios
+
+    @property
+    def total_registros(self) -> int:
+        return len(self.inicios) - 1
+
+    def __len__(self) -> int:
+        return self.total_registros
+
+    def valido_para(self, caminho_arquivo: str) -> bool:
+        """
+        Indica se o índice corresponde ao CSV no estado atual (mesmo tamanho e data de modificação).
+        """
+        try:
+            estado = os.stat(caminho_arquivo)
+        except OSError:
+            return False
+        return estado.st_size == self.tamanho_arquivo and estado.st_mtime_ns == self.mtime_ns
+
+    def faixa_bytes(self, primeiro: int, ultimo: int) -> Tuple[int, int]:
+        """
+        Posições (início, fim) em bytes dos registros primeiro..ultimo (0-based, inclusive).
+        """
+        if not 0 <= primeiro <= ultimo < self.total_registros:
+            raise IndexError(f"Registros {primeiro + 1}-{ultimo + 1} fora do arquivo ({self.total_registros} registros)")
+        return self.inicios[primeiro], self.inicios[ultimo + 1]
+
+    def ler_cabecalho(self) -> bytes:
+        """
+        Bytes da linha de cabeçalho do CSV (inclusive o BOM, se houver).
+        """
+        with open(self.caminho_arquivo, 'rb') as arquivo:
+            return arquivo.read(self.fim_cabecalho)
+
+    def salvar(self, caminho_indice: str) -> None:
+        """
+        Grava o índice em arquivo (escrita em arquivo temporário e troca atômica).
+        """
+        temporario = f"{caminho_indice}.{os.getpid()}.tmp"
+        with open(temporario, 'wb') as arquivo:
+            arquivo.write(_ASSINATURA)
+            arquivo.write(_FORMATO_CABECALHO.pack(self.tamanho_arquivo, self.mtime_ns, ord(self.separador),
+                                                  self.fim_cabecalho, self.total_registros))
+            self.inicios.tofile(arquivo)
+        os.replace(temporario, caminho_indice)
+
+    @classmethod
+    def abrir(cls, caminho_indice: str, caminho_arquivo: str, separador: str) -> Optional['IndiceLinhasCSV']:
+        """
+        Lê um índice gravado; retorna None se o arquivo não existir, estiver
+        corrompido, não corresponder mais ao CSV ou tiver outro separador.
+        """
+        try:
+            with open(caminho_indice, 'rb') as arquivo:
+                if arquivo.read(len(_ASSINATURA)) != _ASSINATURA:
+                    return None
+                tamanho, mtime_ns, codigo_separador, fim_cabecalho, total = _FORMATO_CABECALHO.unpack(
+                    arquivo.read(_FORMATO_CABECALHO.size))
+                inicios = array('q')
+                inicios.fromfile(arquivo, total + 1)
+        except (OSError, EOFError, struct.error):
+            return None
+
+        if codigo_separador != ord(separador):
+            return None
+        indice = cls(caminho_arquivo, tamanho, mtime_ns, separador, fim_cabecalho, inicios)
+        return indice if indice.valido_para(caminho_arquivo) else None
+
+    def __repr__(self) -> str:
+        return f"IndiceLinhasCSV({self.caminho_arquivo!r}, {self.total_registros} registros)"
+
+
+def construir_indice(caminho_arquivo: str, separador: str = ';') -> IndiceLinhasCSV:
+    """
+    Percorre o CSV e registra a posição de início de cada linha de dados.
+
+    Um fim de linha só encerra a linha se estiver fora de campo entre aspas
+    (src/limites_csv.py). Linhas vazias não contam como registro.
+
+    Args:
+        caminho_arquivo: Caminho do CSV.
+        separador: Separador de colunas (define o início dos campos, onde as aspas abrem um campo).
+
+    Returns:
+        IndiceLinhasCSV do arquivo.
+    """
+    estado = os.stat(caminho_arquivo)
+    # Fins (exclusivos) das linhas encerradas fora de aspas, em ordem
+    fins = array('q')
+
+    with open(caminho_arquivo, 'rb') as arquivo:
+        limites = LimitesCSV(separador)
+        inicio_bloco = 0
+        while True:
+            bloco = arquivo.read(_TAMANHO_LEITURA)
+            if not bloco:
+                break
+            fins_linha, _ = limites.analisar(bloco)
+            fins.extend((fins_linha + (inicio_bloco + 1)).tolist())
+            inicio_bloco += len(bloco)
+
+        if not fins or fins[-1] < estado.st_size:
+            # Última linha sem fim de linha
+            fins.append(estado.st_size)
+
+        # Linhas vazias ("\n" ou "\r\n") não são registros, como em pandas.read_csv
+        fim_cabecalho = fins[0]
+        inicios = array('q')
+        inicio_linha = fim_cabecalho
+        for fim_linha in fins[1:]:
+            if fim_linha - inicio_linha > 2 or not _linha_vazia(arquivo, inicio_linha, fim_linha):
+                inicios.append(inicio_linha)
+            inicio_linha = fim_linha
+        # Fim do último registro: o fim do arquivo (linhas vazias no intervalo são ignoradas na leitura)
+        inicios.append(estado.st_size)
+
+    indice = IndiceLinhasCSV(caminho_arquivo, estado.st_size, estado.st_mtime_ns, separador, fim_cabecalho, inicios)
+    logger.info(f"Índice de linhas construído para {caminho_arquivo}: {indice.total_registros} registros")
+    return indice
+
+
+def _linha_vazia(arquivo, inicio: int, fim: int) -> bool:
+    """
+    Indica se a linha curta entre inicio e fim contém apenas o fim de linha.
+    """
+    arquivo.seek(inicio)
+    return arquivo.read(fim - inicio).strip(b"\r\n") == b""
+
+
+def caminho_indice(caminho_arquivo: str) -> str:
+    """
+    Caminho do arquivo de índice de um CSV.
+    """
+    return caminho_arquivo + EXTENSAO_INDICE
+
+
+def obter_indice(caminho_arquivo: str, separador: str = ';', persistir: bool = True) -> IndiceLinhasCSV:
+    """
+    Retorna o índice de linhas do CSV, reaproveitando o arquivo de índice se
+    ainda for válido; caso contrário, constrói o índice e (se persistir) o grava.
+
+    Args:
+        caminho_arquivo: Caminho do CSV.
+        separador: Separador de colunas.
+        persistir: Se True, grava o índice construído em "<csv>.idx".
+
+    Returns:
+        IndiceLinhasCSV do arquivo.
+    """
+    caminho = caminho_indice(caminho_arquivo)
+    indice = IndiceLinhasCSV.abrir(caminho, caminho_arquivo, separador)
+    if indice is not None:
+        logger.info(f"Índice de linhas reaproveitado: {caminho} ({indice.total_registros} registros)")
+        return indice
+
+    indice = construir_indice(caminho_arquivo, separador)
+    if persistir:
+        try:
+            indice.salvar(caminho)
+            logger.info(f"Índice de linhas gravado em {caminho}")
+        except OSError as e:
+            logger.warning(f"Não foi possível gravar o índice de linhas em {caminho}: {str(e)}")
+    return indice
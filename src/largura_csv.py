@@ -0,0 +1,151 @@
+"""
+Verificação da quantidade de campos de cada linha de um CSV.
+
+Com usecols (leitura apenas das colunas do manifesto de campos), o pandas
+descarta os campos excedentes de uma linha sem erro, enquanto a leitura de
+todas as colunas rejeita a linha ("Expected N fields in line X, saw M"): um
+separador a mais deslocaria os valores para as colunas erradas em silêncio.
+O VerificadorLarguraCSV confere os bytes lidos pelo pandas, bloco a bloco,
+contra a largura do cabeçalho, de modo que a leitura com projeção rejeita as
+mesmas linhas que a leitura completa.
+
+A contagem é vetorizada (numpy): os separadores e fins de linha fora de
+campos entre aspas vêm de src/limites_csv.py, com as mesmas regras de aspas
+do pandas (aspas só abrem um campo no início do campo).
+"""
+
+import csv
+import io
+from typing import BinaryIO, Optional
+
+import numpy as np
+
+from src.exceptions import FormatoArquivoInvalidoError
+from src.limites_csv import LimitesCSV
+
+
+def largura_cabecalho(cabecalho: bytes, separador: str) -> int:
+    """
+    Quantidade de campos da linha de cabeçalho (bytes, com ou sem BOM).
+    """
+    texto = cabecalho.decode('utf-8-sig', errors='replace')
+    return len(next(csv.reader(io.StringIO(texto), delimiter=separador), []))
+
+
+class VerificadorLarguraCSV:
+    """
+    Confere, bloco a bloco, que nenhuma linha tem mais campos que o cabeçalho.
+    """
+
+    def __init__(self, separador: str, descricao: str, largura: Optional[int] = None,
+                 linha_inicial: Optional[int] = 1, posicao_inicial: int = 0):
+        """
+        Args:
+            separador: Separador de colunas (um caractere).
+            descricao: Nome da fonte, para as mensagens.
+            largura: Quantidade de campos do cabeçalho. Se None, é obtida da
+                     primeira linha preenchida dos bytes verificados.
+            linha_inicial: Número, no arquivo, da primeira linha verificada; None
+                           se desconhecido (as mensagens indicam a posição em bytes).
+            posicao_inicial: Posição, no arquivo, do primeiro byte verificado.
+        """
+        self.separador = separador
+        self.descricao = descricao
+        self.largura = largura
+        self._limites = LimitesCSV(separador, inicio_arquivo=False)
+        self._linha = linha_inicial
+        self._posicao = posicao_inicial
+        self._inicio_linha = posicao_inicial
+        self._separadores_pendentes = 0
+        self._cabecalho = b""
+
+    def verificar(self, bloco: bytes) -> None:
+        """
+        Confere o próximo bloco de bytes da fonte.
+
+        Raises:
+            FormatoArquivoInvalidoError: Se alguma linha tiver mais campos que o cabeçalho.
+        """
+        if self.largura is None:
+            bloco = self._ler_cabecalho(bloco)
+        if not bloco:
+            return
+
+        fins, separadores = self._limites.analisar(bloco)
+
+        # Separadores por linha do bloco (a última é a linha ainda incompleta)
+        contagens = np.bincount(np.searchsorted(fins, separadores), minlength=len(fins) + 1)
+        contagens[0] += self._separadores_pendentes
+        excedentes = np.flatnonzero(contagens >= self.largura)
+        if len(excedentes):
+            indice = int(excedentes[0])
+            inicio = self._inicio_linha if indice == 0 else self._posicao + int(fins[indice - 1]) + 1
+            if self._linha is not None:
+                local = f"na linha {self._linha + indice}"
+            else:
+                local = f"na linha iniciada no byte {inicio}"
+            raise FormatoArquivoInvalidoError(
+                f"Erro ao ler CSV '{self.descricao}': esperados {self.largura} campos {local}, "
+                f"encontrados {int(contagens[indice]) + 1}")
+
+        self._separadores_pendentes = int(contagens[-1])
+        if len(fins):
+            self._inicio_linha = self._posicao + int(fins[-1]) + 1
+            if self._linha is not None:
+                self._linha += len(fins)
+        self._posicao += len(bloco)
+
+    def _ler_cabecalho(self, bloco: bytes) -> bytes:
+        """
+        Acumula os bytes até a primeira linha preenchida (o cabeçalho), define a
+        largura e devolve o restante do bloco.
+        """
+        self._cabecalho += bloco
+        while self.largura is None:
+            fim = self._cabecalho.find(b'\n')
+            if fim < 0:
+                return b""
+            linha, self._cabecalho = self._cabecalho[:fim + 1], self._cabecalho[fim + 1:]
+            self._posicao += len(linha)
+            self._inicio_linha = self._posicao
+            if self._linha is not None:
+                self._linha += 1
+            if linha.decode('utf-8-sig', errors='replace').strip():
+                self.largura = largura_cabecalho(linha, self.separador)
+        restante, self._cabecalho = self._cabecalho, b""
+        return restante
+
+
+class FluxoLarguraVerificada(io.RawIOBase):
+    """
+    Fluxo binário que repassa os bytes da fonte conferindo a largura das linhas
+    (entregue ao pandas.read_csv no lugar da fonte).
+    """
+
+    def __init__(self, fonte: BinaryIO, verificador: VerificadorLarguraCSV, fechar_fonte: bool = False):
+        """
+        Args:
+            fonte: Fluxo binário de origem.
+            verificador: Verificador aplicado aos bytes lidos.
+            fechar_fonte: Fecha a fonte junto com o fluxo (arquivos abertos apenas para a leitura).
+        """
+        super().__init__()
+        self._fonte = fonte
+        self._verificador = verificador
+        self._fechar_fonte = fechar_fonte
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        # read1 entrega o que já está disponível (ex.: pipe), sem aguardar o buffer inteiro
+        dados = self._fonte.read1(len(buffer)) if hasattr(self._fonte, 'read1') else self._fonte.read(len(buffer))
+        self._verificador.verificar(dados)
+        tamanho = len(dados)
+        buffer[:tamanho] = dados
+        return tamanho
+
+    def close(self) -> None:
+        if not self.closed and self._fechar_fonte:
+            self._fonte.close()
+        super().close()
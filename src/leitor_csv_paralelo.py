@@ -0,0 +1,208 @@
+"""
+Leitura paralela de arquivos CSV grandes.
+
+O arquivo é dividido em faixas de bytes que terminam em fim de linha fora de
+aspas (campos com quebra de linha entre aspas não são cortados, ver
+src/limites_csv.py). Cada faixa é
+lida pelo pandas e convertida por um processo de um ProcessPoolExecutor, com
+a mesma tipagem de campos_definicao do ProcessadorCSV; o processo principal
+recebe os blocos na ordem do arquivo e aplica a conversão individual das
+células pendentes, de modo que registros, mensagens e numeração são os
+mesmos da leitura em fluxo (ProcessadorCSV.carregar_em_fluxo).
+"""
+
+import io
+import os
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Any, Deque, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.largura_csv import VerificadorLarguraCSV, largura_cabecalho
+from src.limites_csv import LimitesCSV
+from src.logger import logger, configurar_logger
+
+# Bytes lidos por vez na divisão do arquivo em faixas
+_TAMANHO_LEITURA = 8 * 1024 * 1024
+
+# Faixas em trânsito por processo (uma em execução e outra na fila)
+_FAIXAS_POR_WORKER = 2
+
+# Estado de cada processo worker, preenchido pelo inicializador
+_processador_worker: Optional[Any] = None
+_cabecalho_worker: bytes = b""
+_separador_worker: str = ";"
+_manifesto_worker: Optional[Any] = None
+
+
+def dividir_em_faixas(caminho_arquivo: str, tamanho_faixa: int,
+                      separador: str = ';') -> Tuple[bytes, List[Tuple[int, int]]]:
+    """
+    Divide o CSV em faixas de aproximadamente tamanho_faixa bytes.
+
+    Cada corte é feito no primeiro fim de linha após o tamanho alvo que esteja
+    fora de um campo entre aspas (src/limites_csv.py, mesmas regras de aspas
+    do pandas), sem interpretar o CSV.
+
+    Args:
+        caminho_arquivo: Caminho do CSV.
+        tamanho_faixa: Tamanho alvo de cada faixa, em bytes.
+        separador: Separador de colunas (define o início dos campos, onde as aspas abrem um campo).
+
+    Returns:
+        Tupla (bytes da linha de cabeçalho, lista de faixas (início, fim) das linhas de dados).
+    """
+    tamanho_arquivo = os.path.getsize(caminho_arquivo)
+    faixas: List[Tuple[int, int]] = []
+    fim_cabecalho: Optional[int] = None
+    inicio_faixa = 0
+    proximo_corte = 0
+
+    with open(caminho_arquivo, 'rb') as arquivo:
+        limites = LimitesCSV(separador)
+        inicio_bloco = 0
+        while True:
+            bloco = arquivo.read(_TAMANHO_LEITURA)
+            if not bloco:
+                break
+
+            # Posições logo após cada fim de linha fora de aspas (cortes possíveis)
+            fins_linha, _ = limites.analisar(bloco)
+            cortes = fins_linha + (inicio_bloco + 1)
+            indice = int(np.searchsorted(cortes, proximo_corte, side='right'))
+            while indice < len(cortes):
+                corte = int(cortes[indice])
+                if fim_cabecalho is None:
+                    fim_cabecalho = corte
+                else:
+                    faixas.append((inicio_faixa, corte))
+                inicio_faixa = corte
+                proximo_corte = corte + tamanho_faixa
+                indice = int(np.searchsorted(cortes, proximo_corte, side='right'))
+
+            inicio_bloco += len(bloco)
+
+        if fim_cabecalho is None:
+            # Arquivo só com o cabeçalho (sem fim de linha)
+            fim_cabecalho = tamanho_arquivo
+            inicio_faixa = tamanho_arquivo
+        arquivo.seek(0)
+        cabecalho = arquivo.read(fim_cabecalho)
+
+    if inicio_faixa < tamanho_arquivo:
+        faixas.append((inicio_faixa, tamanho_arquivo))
+    return cabecalho, faixas
+
+
+def ler_faixa(caminho_arquivo: str, inicio: int, fim: int, cabecalho: bytes, separador: str,
+              manifesto: Optional[Any] = None) -> pd.DataFrame:
+    """
+    Lê uma faixa de linhas do CSV como DataFrame de texto, com o cabeçalho do arquivo.
+
+    Args:
+        caminho_arquivo: Caminho do CSV.
+        inicio: Posição (bytes) do início da faixa.
+        fim: Posição (bytes) do fim da faixa.
+        cabecalho: Bytes da linha de cabeçalho (inclusive o BOM, se houver).
+        separador: Separador de colunas.
+        manifesto: ManifestoCampos para limitar as colunas lidas (opcional).
+
+    Returns:
+        DataFrame com todas as colunas como texto, como em carregar_em_fluxo.
+    """
+    with open(caminho_arquivo, 'rb') as arquivo:
+        arquivo.seek(inicio)
+        conteudo = arquivo.read(fim - inicio)
+    if manifesto is not None:
+        # Com usecols o pandas descarta campos excedentes sem erro (ver src/largura_csv.py)
+        VerificadorLarguraCSV(separador, caminho_arquivo, largura_cabecalho(cabecalho, separador),
+                              linha_inicial=None, posicao_inicial=inicio).verificar(conteudo)
+    return pd.read_csv(io.BytesIO(cabecalho + conteudo), sep=separador, encoding='utf-8-sig', dtype=str,
+                       keep_default_na=False, na_filter=False,
+                       usecols=manifesto.filtro_colunas() if manifesto is not None else None)
+
+
+def _inicializar_worker(cabecalho: bytes, separador: str,
+                        campos_definicao: Dict[str, Dict[str, Any]], modo_estrito: bool,
+                        manifesto: Optional[Any], debug: bool) -> None:
+    """
+    Inicializador de cada processo: cria o ProcessadorCSV com a tipagem de campos já carregada.
+    """
+    global _processador_worker, _cabecalho_worker, _separador_worker, _manifesto_worker
+
+    configurar_logger(debug)
+
+    from src.processador_csv import ProcessadorCSV
+
+    _processador_worker = ProcessadorCSV(modo_estrito=modo_estrito, campos_definicao=campos_definicao)
+    _cabecalho_worker = cabecalho
+    _separador_worker = separador
+    _manifesto_worker = manifesto
+
+
+def _converter_faixa(caminho_arquivo: str, inicio: int, fim: int):
+    """
+    Lê e converte (etapa vetorizada) uma faixa do CSV no processo worker.
+
+    Returns:
+        Tupla (RegistroLote, células pendentes para a conversão individual).
+    """
+    df = ler_faixa(caminho_arquivo, inicio, fim, _cabecalho_worker, _separador_worker, _manifesto_worker)
+    return _processador_worker._converter_colunas(df)
+
+
+def ler_csv_em_paralelo(processador, caminho_arquivo: str, separador: str, workers: int,
+                        tamanho_faixa: int, manifesto: Optional[Any] = None,
+                        debug: bool = False) -> Iterator[Any]:
+    """
+    Lê e converte o CSV em vários processos, entregando os registros na ordem do arquivo.
+
+    Args:
+        processador: ProcessadorCSV do processo principal (tipagem dos campos, modo
+                     estrito e conversão individual das células pendentes).
+        caminho_arquivo: Caminho do CSV.
+        separador: Separador de colunas.
+        workers: Quantidade de processos.
+        tamanho_faixa: Tamanho alvo de cada faixa, em bytes.
+        manifesto: ManifestoCampos para limitar as colunas lidas (opcional).
+        debug: Ativa logs de depuração nos processos.
+
+    Yields:
+        Registros convertidos (visões RegistroLinha), na ordem do arquivo.
+    """
+    cabecalho, faixas = dividir_em_faixas(caminho_arquivo, tamanho_faixa, separador)
+    logger.info(f"Leitura paralela de {caminho_arquivo}: {len(faixas)} faixa(s), {workers} processo(s)")
+    if not faixas:
+        return
+
+    limite_em_transito = max(1, workers) * _FAIXAS_POR_WORKER
+    em_transito: Deque[Future] = deque()
+    total_registros = 0
+
+    def entregar(futuro: Future) -> Iterator[Any]:
+        nonlocal total_registros
+        registros, pendentes = futuro.result()
+        processador._aplicar_conversao_individual(registros, pendentes, total_registros)
+        total_registros += len(registros)
+        yield from registros
+
+    with ProcessPoolExecutor(max_workers=workers,
+                             initializer=_inicializar_worker,
+                             initargs=(cabecalho, separador, processador.campos_definicao,
+                                       processador.modo_estrito, manifesto, debug)) as executor:
+        try:
+            for inicio, fim in faixas:
+                em_transito.append(executor.submit(_converter_faixa, caminho_arquivo, inicio, fim))
+                if len(em_transito) >= limite_em_transito:
+                    yield from entregar(em_transito.popleft())
+
+            while em_transito:
+                yield from entregar(em_transito.popleft())
+        finally:
+            # Em caso de erro (ou gerador abandonado), descarta as faixas ainda não iniciadas
+            for futuro in em_transito:
+                futuro.cancel()
+
+    logger.info(f"Leitura paralela do CSV concluída: {total_registros} registros")
@@ -0,0 +1,187 @@
+"""
+Leitura de CSV apenas com o módulo csv da biblioteca padrão.
+
+Alternativa leve ao pandas.read_csv para os casos em que importar o pandas
+(e o numpy) custa mais que a leitura em si: as tabelas pequenas do modelo
+relacional e CSVs de entrevistas pequenos. As leituras reproduzem o que o
+sistema obtém do pandas:
+
+- ler_tabela_csv: tabela com inferência de tipos por coluna, como
+  pd.read_csv sem dtype (int, float, bool ou texto; células vazias e os
+  nulos textuais padrão do pandas viram NaN);
+- iterar_blocos_csv: blocos de linhas com todas as células como texto, como
+  pd.read_csv(dtype=str, keep_default_na=False, na_filter=False, chunksize=...).
+
+Nos dois casos, linhas vazias (ou só com espaços) são ignoradas, nomes de coluna vazios
+viram "Unnamed: N", nomes repetidos recebem sufixo (".1", ".2"...) e linhas
+com mais campos que o cabeçalho são erro de formato.
+"""
+
+import csv
+import math
+import re
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, TextIO, Tuple
+
+from src.exceptions import FormatoArquivoInvalidoError
+
+# Textos tratados como nulo pelo pandas.read_csv (na_values padrão)
+VALORES_NA_PADRAO = frozenset([
+    '', '#N/A', '#N/A N/A', '#NA', '-1.#IND', '-1.#QNAN', '-NaN', '-nan', '1.#IND', '1.#QNAN',
+    '<NA>', 'N/A', 'NA', 'NULL', 'NaN', 'None', 'n/a', 'nan', 'null'
+])
+
+# Números reconhecidos pelo pandas.read_csv: algarismos com espaços ASCII em volta e
+# infinito sem espaços, em qualquer caixa (int() e float() do Python aceitam também "_")
+_REGEX_INTEIRO = re.compile(r"\s*[+-]?\d+\s*", re.ASCII)
+_REGEX_DECIMAL = re.compile(r"\s*[+-]?(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?\s*|[+-]?(?:inf|infinity)",
+                            re.ASCII | re.IGNORECASE)
+
+# Textos reconhecidos como booleanos pelo pandas.read_csv
+_VALORES_BOOLEANOS = {'True': True, 'TRUE': True, 'true': True, 'False': False, 'FALSE': False, 'false': False}
+
+
+def nomes_colunas(cabecalho: Iterable[str]) -> List[str]:
+    """
+    Nomes das colunas como o pandas os atribui: vazios viram "Unnamed: N" e
+    repetidos recebem o sufixo ".1", ".2"... (sem repetir um nome já presente
+    no cabeçalho; as colunas sem nome recebem o sufixo depois das nomeadas).
+    """
+    nomes = list(cabecalho)
+    sem_nome = [posicao for posicao, nome in enumerate(nomes) if not nome]
+    for posicao in sem_nome:
+        nomes[posicao] = f"Unnamed: {posicao}"
+    sem_nome_conjunto = set(sem_nome)
+    ordem = [posicao for posicao in range(len(nomes)) if posicao not in sem_nome_conjunto] + sem_nome
+
+    contagens: Dict[str, int] = {}
+    for posicao in ordem:
+        nome = candidato = nomes[posicao]
+        repeticao = contagens.get(nome, 0)
+        while repeticao > 0:
+            contagens[nome] = repeticao + 1
+            candidato = f"{nome}.{repeticao}"
+            repeticao = repeticao + 1 if candidato in nomes else contagens.get(candidato, 0)
+        nomes[posicao] = candidato
+        contagens[candidato] = repeticao + 1
+    return nomes
+
+
+def _linhas_csv(arquivo: TextIO, separador: str, descricao: str) -> Iterator[Tuple[int, List[str]]]:
+    """
+    Linhas do arquivo (cabeçalho incluído), com o número da linha no arquivo,
+    sem as linhas vazias ou só com espaços e tabulações (fora de aspas), que o
+    pandas também ignora.
+    """
+    ultima_linha = ''
+
+    def linhas_texto() -> Iterator[str]:
+        nonlocal ultima_linha
+        for ultima_linha in arquivo:
+            yield ultima_linha
+
+    leitor = csv.reader(linhas_texto(), delimiter=separador)
+    try:
+        for linha in leitor:
+            if not linha or (len(linha) == 1 and not linha[0].strip(' \t') and '"' not in ultima_linha):
+                continue
+            yield leitor.line_num, linha
+    except csv.Error as e:
+        raise FormatoArquivoInvalidoError(f"Erro ao ler CSV '{descricao}': {str(e)}")
+
+
+def _ajustar_largura(linha: List[Any], largura: int, preenchimento: Any, numero: int, descricao: str) -> List[Any]:
+    if len(linha) > largura:
+        raise FormatoArquivoInvalidoError(
+            f"Erro ao ler CSV '{descricao}': esperados {largura} campos na linha {numero}, encontrados {len(linha)}")
+    if len(linha) < largura:
+        linha.extend([preenchimento] * (largura - len(linha)))
+    return linha
+
+
+def _inferir_coluna(valores: List[str]) -> List[Any]:
+    """
+    Converte os valores de uma coluna como a inferência de tipos do pandas.read_csv.
+    """
+    nulos = [valor in VALORES_NA_PADRAO for valor in valores]
+    preenchidos = [valor for valor, nulo in zip(valores, nulos) if not nulo]
+    if not preenchidos:
+        return [math.nan] * len(valores)
+
+    if all(_REGEX_INTEIRO.fullmatch(valor) for valor in preenchidos):
+        if not any(nulos):
+            return [int(valor) for valor in valores]
+        return [math.nan if nulo else float(int(valor)) for valor, nulo in zip(valores, nulos)]
+
+    if all(_REGEX_DECIMAL.fullmatch(valor) for valor in preenchidos):
+        return [math.nan if nulo else float(valor) for valor, nulo in zip(valores, nulos)]
+
+    if all(valor in _VALORES_BOOLEANOS for valor in preenchidos):
+        return [math.nan if nulo else _VALORES_BOOLEANOS[valor] for valor, nulo in zip(valores, nulos)]
+    return [math.nan if nulo else valor for valor, nulo in zip(valores, nulos)]
+
+
+def ler_tabela_csv(caminho_arquivo: str, separador: str) -> Tuple[List[str], List[List[Any]]]:
+    """
+    Lê uma tabela CSV inteira, com inferência de tipos por coluna (como pd.read_csv
+    sem dtype e sem index_col).
+
+    Args:
+        caminho_arquivo: Caminho do CSV (UTF-8, com ou sem BOM).
+        separador: Separador de colunas.
+
+    Returns:
+        Tupla (colunas, linhas), com as linhas como listas de valores
+        (int, float, bool, str ou NaN), na ordem do arquivo.
+
+    Raises:
+        FormatoArquivoInvalidoError: Se alguma linha tiver mais campos que o cabeçalho.
+    """
+    with open(caminho_arquivo, 'r', encoding='utf-8-sig', newline='') as arquivo:
+        linhas = _linhas_csv(arquivo, separador, caminho_arquivo)
+        _, cabecalho = next(linhas, (0, None))
+        if cabecalho is None:
+            return [], []
+        colunas = nomes_colunas(cabecalho)
+        dados = [_ajustar_largura(linha, len(colunas), '', numero, caminho_arquivo) for numero, linha in linhas]
+
+    colunas_convertidas = [_inferir_coluna(list(valores)) for valores in zip(*dados)] if dados else []
+    return colunas, [list(linha) for linha in zip(*colunas_convertidas)]
+
+
+def iterar_blocos_csv(arquivo: TextIO, separador: str, tamanho_bloco: int,
+                      filtro_colunas: Optional[Callable[[str], bool]] = None,
+                      descricao: str = "CSV") -> Iterator[Tuple[List[str], List[List[str]]]]:
+    """
+    Lê um CSV aberto em modo texto (newline='') em blocos de linhas, com todas as células como texto.
+
+    Args:
+        arquivo: Arquivo de texto aberto.
+        separador: Separador de colunas.
+        tamanho_bloco: Quantidade de linhas por bloco.
+        filtro_colunas: Função que decide, pelo nome, se a coluna é lida (None lê todas).
+        descricao: Nome da fonte, para as mensagens.
+
+    Yields:
+        Tuplas (colunas, linhas) de cada bloco; células ausentes em linhas curtas ficam vazias.
+
+    Raises:
+        FormatoArquivoInvalidoError: Se alguma linha tiver mais campos que o cabeçalho.
+    """
+    linhas = _linhas_csv(arquivo, separador, descricao)
+    _, cabecalho = next(linhas, (0, None))
+    if cabecalho is None:
+        return
+    colunas = nomes_colunas(cabecalho)
+    posicoes = [posicao for posicao, nome in enumerate(colunas) if filtro_colunas is None or filtro_colunas(nome)]
+    colunas_lidas = [colunas[posicao] for posicao in posicoes]
+    todas = len(posicoes) == len(colunas)
+
+    bloco: List[List[str]] = []
+    for numero, linha in linhas:
+        linha = _ajustar_largura(linha, len(colunas), '', numero, descricao)
+        bloco.append(linha if todas else [linha[posicao] for posicao in posicoes])
+        if len(bloco) >= tamanho_bloco:
+            yield colunas_lidas, bloco
+            bloco = []
+    if bloco:
+        yield colunas_lidas, bloco
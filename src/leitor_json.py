@@ -0,0 +1,269 @@
+"""
+Leitura em fluxo de registros de dados em JSON.
+
+Formatos aceitos:
+
+- JSON Lines / NDJSON: um objeto por linha, lido linha a linha;
+- array JSON de objetos ([{...}, {...}]), decodificado de forma incremental
+  com json.JSONDecoder.raw_decode sobre um buffer de leitura;
+- um objeto (ou objetos concatenados), como o arquivo de dados de um único caso.
+
+Apenas o registro corrente e o buffer de leitura ficam em memória, de modo
+que o consumo não depende do tamanho do arquivo. O progresso da leitura
+(registros e porcentagem do arquivo) é registrado no log.
+"""
+
+import codecs
+import json
+import os
+import re
+from typing import Any, BinaryIO, Dict, Iterator, Optional
+
+import config
+from src.exceptions import ArquivoNaoEncontradoError, FormatoArquivoInvalidoError, DadosInvalidosError
+from src.logger import logger
+
+# Formatos de arquivo JSON reconhecidos por detectar_formato_json
+FORMATO_NDJSON = "ndjson"
+FORMATO_ARRAY = "array"
+FORMATO_OBJETO = "objeto"
+
+_ESPACOS = " \t\r\n"
+
+# Caracteres que ainda podem continuar um número JSON ("1" de "12", "1e" de "1e5", "1." de "1.5")
+_CONTINUACAO_NUMERO = re.compile(r"[0-9.eE+-]*")
+
+
+class _ProgressoLeitura:
+    """
+    Registra no log o progresso da leitura a cada intervalo de registros.
+    """
+
+    __slots__ = ('descricao', 'tamanho_total', 'intervalo', 'registros', 'bytes_lidos')
+
+    def __init__(self, descricao: str, tamanho_total: Optional[int], intervalo: int):
+        self.descricao = descricao
+        self.tamanho_total = tamanho_total
+        self.intervalo = max(1, intervalo)
+        self.registros = 0
+        self.bytes_lidos = 0
+
+    def registro_lido(self) -> None:
+        self.registros += 1
+        if self.registros % self.intervalo == 0:
+            logger.info(f"{self.descricao}: {self.registros} registros lidos{self._porcentagem()}")
+
+    def concluir(self) -> None:
+        logger.info(f"Leitura em fluxo de {self.descricao} concluída: {self.registros} registros")
+
+    def _porcentagem(self) -> str:
+        if not self.tamanho_total:
+            return ""
+        return f" ({min(100.0, 100.0 * self.bytes_lidos / self.tamanho_total):.0f}% do arquivo)"
+
+
+def detectar_formato_json(arquivo: BinaryIO) -> str:
+    """
+    Detecta o formato pelo início do conteúdo, sem consumir o arquivo
+    (o arquivo precisa aceitar peek, como io.BufferedReader).
+
+    Um arquivo que começa com "[" é um array; um que começa com "{" é NDJSON se
+    a primeira linha já contém um objeto completo, ou um objeto (possivelmente
+    formatado em várias linhas) caso contrário.
+
+    Returns:
+        FORMATO_NDJSON, FORMATO_ARRAY ou FORMATO_OBJETO.
+    """
+    amostra = arquivo.peek(64 * 1024)
+    texto = codecs.decode(amostra, 'utf-8-sig', errors='ignore').lstrip(_ESPACOS)
+    if texto.startswith('['):
+        return FORMATO_ARRAY
+
+    primeira_linha, quebra, _ = texto.partition('\n')
+    if quebra:
+        try:
+            json.loads(primeira_linha)
+            return FORMATO_NDJSON
+        except ValueError:
+            pass
+    return FORMATO_OBJETO
+
+
+def iterar_registros_json(arquivo: BinaryIO, descricao: str = "JSON", formato: Optional[str] = None,
+                          tamanho_total: Optional[int] = None, tamanho_buffer: Optional[int] = None,
+                          intervalo_progresso: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+    """
+    Lê os registros (objetos JSON) de um arquivo binário aberto, em fluxo.
+
+    Args:
+        arquivo: Arquivo aberto em modo binário (arquivo em disco ou sys.stdin.buffer).
+        descricao: Nome da fonte, para as mensagens.
+        formato: FORMATO_NDJSON, FORMATO_ARRAY ou FORMATO_OBJETO. Se None, é detectado.
+        tamanho_total: Tamanho do arquivo em bytes, para a porcentagem do progresso (opcional).
+        tamanho_buffer: Bytes lidos por vez. Se None, usa config.TAMANHO_BUFFER_JSON.
+        intervalo_progresso: Registros entre mensagens de progresso.
+                             Se None, usa config.INTERVALO_PROGRESSO_LEITURA.
+
+    Yields:
+        Cada registro (dicionário), na ordem do arquivo.
+
+    Raises:
+        FormatoArquivoInvalidoError: Se o conteúdo não for JSON válido.
+        DadosInvalidosError: Se algum registro não for um objeto JSON.
+    """
+    formato_final = formato or detectar_formato_json(arquivo)
+    progresso = _ProgressoLeitura(descricao, tamanho_total, intervalo_progresso or config.INTERVALO_PROGRESSO_LEITURA)
+    logger.info(f"Lendo {descricao} em fluxo (formato {formato_final})")
+
+    if formato_final == FORMATO_NDJSON:
+        registros = _iterar_ndjson(arquivo, descricao, progresso)
+    else:
+        registros = _iterar_valores(arquivo, descricao, progresso, tamanho_buffer or config.TAMANHO_BUFFER_JSON,
+                                    dentro_de_array=(formato_final == FORMATO_ARRAY))
+    for registro in registros:
+        if not isinstance(registro, dict):
+            raise DadosInvalidosError(
+                f"Registro {progresso.registros + 1} de {descricao} não é um objeto JSON: {type(registro).__name__}")
+        progresso.registro_lido()
+        yield registro
+    progresso.concluir()
+
+
+def carregar_json_em_fluxo(caminho_arquivo: str, formato: Optional[str] = None,
+                           tamanho_buffer: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+    """
+    Lê os registros de um arquivo JSON, NDJSON ou array JSON em fluxo.
+
+    Args:
+        caminho_arquivo: Caminho do arquivo.
+        formato: Formato do arquivo. Se None, é detectado pelo conteúdo.
+        tamanho_buffer: Bytes lidos por vez. Se None, usa config.TAMANHO_BUFFER_JSON.
+
+    Yields:
+        Cada registro (dicionário), na ordem do arquivo.
+
+    Raises:
+        ArquivoNaoEncontradoError: Se o arquivo não existir.
+        FormatoArquivoInvalidoError: Se o conteúdo não for JSON válido.
+        DadosInvalidosError: Se algum registro não for um objeto JSON.
+    """
+    if not os.path.exists(caminho_arquivo):
+        logger.error(f"Arquivo JSON de dados não encontrado: {caminho_arquivo}")
+        raise ArquivoNaoEncontradoError(f"Arquivo JSON não encontrado: {caminho_arquivo}")
+
+    with open(caminho_arquivo, 'rb') as arquivo:
+        yield from iterar_registros_json(arquivo, descricao=caminho_arquivo, formato=formato,
+                                         tamanho_total=os.path.getsize(caminho_arquivo),
+                                         tamanho_buffer=tamanho_buffer)
+
+
+def _iterar_ndjson(arquivo: BinaryIO, descricao: str, progresso: _ProgressoLeitura) -> Iterator[Any]:
+    """
+    Decodifica um valor JSON por linha; linhas em branco são ignoradas.
+    """
+    for numero_linha, linha in enumerate(arquivo, start=1):
+        progresso.bytes_lidos += len(linha)
+        if numero_linha == 1:
+            linha = linha.removeprefix(codecs.BOM_UTF8)
+        if not linha.strip():
+            continue
+        try:
+            yield json.loads(linha)
+        except ValueError as e:
+            logger.error(f"Erro ao decodificar a linha {numero_linha} de {descricao}: {str(e)}")
+            raise FormatoArquivoInvalidoError(f"Formato inválido na linha {numero_linha} de {descricao}: {str(e)}")
+
+
+def _iterar_valores(arquivo: BinaryIO, descricao: str, progresso: _ProgressoLeitura,
+                    tamanho_buffer: int, dentro_de_array: bool) -> Iterator[Any]:
+    """
+    Decodifica valores JSON consecutivos com raw_decode sobre um buffer de texto.
+
+    Com dentro_de_array, os valores são os elementos de um array no nível
+    superior ("[", valores separados por vírgula, "]"); caso contrário, são
+    valores concatenados (separados apenas por espaços).
+
+    Quando um valor não cabe no buffer, mais conteúdo é lido (em quantidade
+    proporcional ao buffer atual, para não decodificar o mesmo início muitas
+    vezes) e a decodificação é repetida.
+    """
+    decodificador = json.JSONDecoder()
+    decodificador_texto = codecs.getincrementaldecoder('utf-8-sig')()
+    buffer = ""
+    posicao = 0
+    fim_arquivo = False
+    aguardando = '[' if dentro_de_array else None
+    elementos = 0
+
+    def ler_mais(quantidade: int) -> bool:
+        nonlocal buffer, posicao, fim_arquivo
+        if fim_arquivo:
+            return False
+        # read1 entrega o que já está disponível (ex.: pipe), sem aguardar o buffer inteiro
+        dados = arquivo.read1(quantidade) if hasattr(arquivo, 'read1') else arquivo.read(quantidade)
+        progresso.bytes_lidos += len(dados)
+        fim_arquivo = not dados
+        # Descarta o que já foi decodificado
+        buffer = buffer[posicao:] + decodificador_texto.decode(dados, final=fim_arquivo)
+        posicao = 0
+        return not fim_arquivo
+
+    def erro(mensagem: str) -> FormatoArquivoInvalidoError:
+        logger.error(f"Erro ao decodificar {descricao}: {mensagem}")
+        return FormatoArquivoInvalidoError(f"Formato inválido de {descricao}: {mensagem}")
+
+    while True:
+        # Pula espaços (e a pontuação do array) até o próximo valor
+        while True:
+            while posicao < len(buffer) and buffer[posicao] in _ESPACOS:
+                posicao += 1
+            if posicao == len(buffer):
+                if ler_mais(tamanho_buffer):
+                    continue
+                if aguardando is not None and aguardando != 'fim':
+                    raise erro("fim inesperado do arquivo (array não encerrado)")
+                return
+            caractere = buffer[posicao]
+            if aguardando == '[':
+                if caractere != '[':
+                    raise erro(f"esperado '[' no início do array, encontrado {caractere!r}")
+                aguardando = 'valor'
+                posicao += 1
+            elif aguardando == 'valor' and caractere == ']' and elementos == 0:
+                aguardando = 'fim'
+                posicao += 1
+            elif aguardando == 'separador':
+                if caractere == ',':
+                    aguardando = 'valor'
+                elif caractere == ']':
+                    aguardando = 'fim'
+                else:
+                    raise erro(f"esperado ',' ou ']' após o elemento {elementos}, encontrado {caractere!r}")
+                posicao += 1
+            elif aguardando == 'fim':
+                raise erro(f"conteúdo após o fim do array: {caractere!r}")
+            else:
+                break
+
+        # Decodifica o próximo valor, lendo mais conteúdo enquanto ele estiver incompleto
+        while True:
+            try:
+                valor, fim_valor = decodificador.raw_decode(buffer, posicao)
+            except json.JSONDecodeError as e:
+                if not fim_arquivo:
+                    ler_mais(max(tamanho_buffer, len(buffer)))
+                    continue
+                raise erro(str(e))
+            if (not fim_arquivo and not isinstance(valor, (dict, list, str))
+                    and _CONTINUACAO_NUMERO.fullmatch(buffer, fim_valor)):
+                # Número ou literal no fim do buffer pode estar truncado; a decodificação
+                # é repetida mesmo no fim do arquivo, pois ler_mais reposiciona o buffer
+                ler_mais(tamanho_buffer)
+                continue
+            break
+
+        posicao = fim_valor
+        elementos += 1
+        if dentro_de_array:
+            aguardando = 'separador'
+        yield valor
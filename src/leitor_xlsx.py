@@ -0,0 +1,320 @@
+"""
+Leitura em fluxo de planilhas XLSX de entrevistas.
+
+O arquivo XLSX é um pacote ZIP; a planilha é lida diretamente do XML com
+lxml.etree.iterparse, linha a linha, descartando cada elemento <row> após o
+uso, de modo que apenas a tabela de textos compartilhados (sharedStrings.xml)
+e o bloco corrente de linhas ficam em memória.
+
+Cada célula é convertida para o texto que a mesma planilha teria exportada
+como CSV (números sem notação de ponto flutuante desnecessária, datas como
+dd/mm/aaaa, booleanos como true/false), e os blocos de linhas passam pela
+mesma conversão de tipos do ProcessadorCSV (ProcessadorCSV.carregar_xlsx).
+"""
+
+import posixpath
+import re
+import zipfile
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from lxml import etree
+
+from src.exceptions import FormatoArquivoInvalidoError
+from src.logger import logger
+
+# Relacionamentos entre partes do pacote (workbook.xml.rels)
+_NS_RELACOES_PACOTE = "http://schemas.openxmlformats.org/package/2006/relationships"
+
+# Formatos numéricos internos do Excel que representam datas
+_FORMATOS_DATA_INTERNOS = frozenset(range(14, 18)) | frozenset({22}) | frozenset(range(27, 37)) | frozenset(range(50, 59))
+
+# Trechos de um código de formato que não indicam data: texto entre aspas, [cores/condições] e escapes
+_REGEX_TRECHOS_LITERAIS = re.compile(r'"[^"]*"|\[[^\]]*\]|\\.')
+
+# Origem das datas seriais do Excel (sistema 1900, com o dia 29/02/1900 inexistente)
+_ORIGEM_DATAS = datetime(1899, 12, 30)
+_ORIGEM_DATAS_1904 = datetime(1904, 1, 1)
+
+
+def _nome_local(elemento) -> str:
+    """
+    Nome da tag sem namespace (aceita os namespaces transicional e estrito do OOXML).
+    """
+    tag = elemento.tag
+    return tag.rsplit('}', 1)[-1] if isinstance(tag, str) else ""
+
+
+def _texto_rico(elemento) -> str:
+    """
+    Texto de um <si> ou <is>: concatenação dos <t>, ignorando a transcrição fonética (<rPh>).
+    """
+    partes = []
+    for filho in elemento.iter():
+        nome = _nome_local(filho)
+        if nome == 't' and _nome_local(filho.getparent()) != 'rPh':
+            partes.append(filho.text or "")
+    return "".join(partes)
+
+
+def _indice_coluna(referencia: str) -> int:
+    """
+    Posição (0-based) da coluna de uma referência de célula ("C12" -> 2).
+    """
+    indice = 0
+    for caractere in referencia:
+        if 'A' <= caractere <= 'Z':
+            indice = indice * 26 + (ord(caractere) - 64)
+        elif 'a' <= caractere <= 'z':
+            indice = indice * 26 + (ord(caractere) - 96)
+        else:
+            break
+    return indice - 1
+
+
+def _formato_eh_data(codigo_formato: str) -> bool:
+    """
+    Indica se um código de formato numérico personalizado representa uma data.
+    """
+    codigo = _REGEX_TRECHOS_LITERAIS.sub("", codigo_formato).lower()
+    return 'd' in codigo or 'y' in codigo or ('m' in codigo and 'h' not in codigo and 's' not in codigo)
+
+
+def _texto_numero(valor: str) -> str:
+    """
+    Texto de um valor numérico como seria exportado em CSV: inteiros sem ".0" nem notação científica.
+    """
+    try:
+        numero = float(valor)
+    except ValueError:
+        return valor
+    if numero.is_integer() and abs(numero) < 1e15:
+        return str(int(numero))
+    return valor
+
+
+class PlanilhaXLSX:
+    """
+    Planilha de um arquivo XLSX aberta para leitura em fluxo.
+    """
+
+    def __init__(self, caminho_arquivo: str, planilha: Optional[str] = None):
+        """
+        Args:
+            caminho_arquivo: Caminho do arquivo XLSX.
+            planilha: Nome da planilha. Se None, usa a primeira.
+
+        Raises:
+            FormatoArquivoInvalidoError: Se o arquivo não for um XLSX válido ou a planilha não existir.
+        """
+        self.caminho_arquivo = caminho_arquivo
+        try:
+            self._pacote = zipfile.ZipFile(caminho_arquivo)
+        except (OSError, zipfile.BadZipFile) as e:
+            raise FormatoArquivoInvalidoError(f"Arquivo XLSX inválido '{caminho_arquivo}': {str(e)}")
+
+        try:
+            self.nome_planilha, self._parte_planilha, data_1904 = self._localizar_planilha(planilha)
+            self._origem_datas = _ORIGEM_DATAS_1904 if data_1904 else _ORIGEM_DATAS
+            self._estilos_data = self._ler_estilos_data()
+            self._textos_compartilhados = self._ler_textos_compartilhados()
+        except FormatoArquivoInvalidoError:
+            self._pacote.close()
+            raise
+        except (KeyError, etree.XMLSyntaxError) as e:
+            self._pacote.close()
+            raise FormatoArquivoInvalidoError(f"Estrutura inválida no arquivo XLSX '{caminho_arquivo}': {str(e)}")
+
+    def close(self) -> None:
+        self._pacote.close()
+
+    def __enter__(self) -> 'PlanilhaXLSX':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def _localizar_planilha(self, planilha: Optional[str]) -> Tuple[str, str, bool]:
+        """
+        Localiza a parte XML da planilha pelo workbook.xml e seus relacionamentos.
+
+        Returns:
+            Tupla (nome da planilha, caminho da parte no pacote, se usa o sistema de datas 1904).
+        """
+        workbook = etree.fromstring(self._pacote.read('xl/workbook.xml'))
+        data_1904 = any(_nome_local(e) == 'workbookPr' and e.get('date1904') in ('1', 'true')
+                        for e in workbook.iter())
+        folhas = [e for e in workbook.iter() if _nome_local(e) == 'sheet']
+        if not folhas:
+            raise FormatoArquivoInvalidoError(f"Arquivo XLSX sem planilhas: {self.caminho_arquivo}")
+
+        if planilha is None:
+            folha = folhas[0]
+        else:
+            folha = next((e for e in folhas if e.get('name') == planilha), None)
+            if folha is None:
+                nomes = [e.get('name') for e in folhas]
+                raise FormatoArquivoInvalidoError(f"Planilha '{planilha}' não encontrada em {self.caminho_arquivo} (planilhas: {nomes})")
+
+        id_relacao = next((valor for chave, valor in folha.attrib.items() if chave.endswith('}id')), None)
+        relacoes = etree.fromstring(self._pacote.read('xl/_rels/workbook.xml.rels'))
+        for relacao in relacoes.iter(f"{{{_NS_RELACOES_PACOTE}}}Relationship"):
+            if relacao.get('Id') == id_relacao:
+                alvo = relacao.get('Target')
+                parte = alvo.lstrip('/') if alvo.startswith('/') else posixpath.normpath(posixpath.join('xl', alvo))
+                return folha.get('name'), parte, data_1904
+        raise FormatoArquivoInvalidoError(f"Planilha '{folha.get('name')}' sem parte XML em {self.caminho_arquivo}")
+
+    def _ler_estilos_data(self) -> frozenset:
+        """
+        Índices dos estilos de célula (atributo s) com formato numérico de data.
+        """
+        try:
+            estilos = etree.fromstring(self._pacote.read('xl/styles.xml'))
+        except KeyError:
+            return frozenset()
+
+        formatos_data = set(_FORMATOS_DATA_INTERNOS)
+        for elemento in estilos.iter():
+            if _nome_local(elemento) == 'numFmt' and _formato_eh_data(elemento.get('formatCode', '')):
+                formatos_data.add(int(elemento.get('numFmtId', -1)))
+
+        indices = set()
+        for elemento in estilos.iter():
+            if _nome_local(elemento) == 'cellXfs':
+                for indice, xf in enumerate(e for e in elemento if _nome_local(e) == 'xf'):
+                    if int(xf.get('numFmtId', 0)) in formatos_data:
+                        indices.add(indice)
+                break
+        return frozenset(indices)
+
+    def _ler_textos_compartilhados(self) -> List[str]:
+        """
+        Lê a tabela de textos compartilhados em fluxo (iterparse), descartando cada <si> após o uso.
+        """
+        try:
+            fluxo = self._pacote.open('xl/sharedStrings.xml')
+        except KeyError:
+            return []
+
+        textos: List[str] = []
+        with fluxo:
+            for _, elemento in etree.iterparse(fluxo, events=('end',), tag='{*}si'):
+                textos.append(_texto_rico(elemento))
+                elemento.clear(keep_tail=True)
+        return textos
+
+    def _data_serial(self, valor: str) -> str:
+        """
+        Converte uma data serial do Excel para dd/mm/aaaa (ou devolve o valor, se não numérico).
+        """
+        try:
+            return (self._origem_datas + timedelta(days=float(valor))).strftime('%d/%m/%Y')
+        except (ValueError, OverflowError):
+            return valor
+
+    def _texto_celula(self, celula) -> str:
+        """
+        Texto de uma célula <c>, como seria exportado em CSV.
+        """
+        tipo = celula.get('t', 'n')
+        valor = None
+        for filho in celula:
+            nome = _nome_local(filho)
+            if nome == 'v':
+                valor = filho.text or ""
+            elif nome == 'is':
+                return _texto_rico(filho)
+
+        if valor is None:
+            return ""
+        if tipo == 's':
+            return self._textos_compartilhados[int(valor)]
+        if tipo == 'b':
+            return "true" if valor == "1" else "false"
+        if tipo == 'e':
+            return ""
+        if tipo == 'd':
+            try:
+                return datetime.fromisoformat(valor).strftime('%d/%m/%Y')
+            except ValueError:
+                return valor
+        if tipo == 'n':
+            if self._estilos_data and int(celula.get('s', 0)) in self._estilos_data:
+                return self._data_serial(valor)
+            return _texto_numero(valor)
+        return valor
+
+    def iterar_linhas(self) -> Iterator[List[str]]:
+        """
+        Percorre as linhas da planilha em fluxo, como listas de textos
+        (células ausentes entre as preenchidas ficam vazias; linhas vazias são ignoradas).
+        """
+        with self._pacote.open(self._parte_planilha) as fluxo:
+            for _, linha in etree.iterparse(fluxo, events=('end',), tag='{*}row'):
+                valores: List[str] = []
+                for celula in linha:
+                    if _nome_local(celula) != 'c':
+                        continue
+                    referencia = celula.get('r')
+                    if referencia:
+                        coluna = _indice_coluna(referencia)
+                        if coluna > len(valores):
+                            valores.extend([""] * (coluna - len(valores)))
+                    valores.append(self._texto_celula(celula))
+
+                # Libera a linha e as anteriores já processadas
+                linha.clear(keep_tail=True)
+                while linha.getprevious() is not None:
+                    del linha.getparent()[0]
+
+                if any(valores):
+                    yield valores
+
+
+def ler_blocos_xlsx(caminho_arquivo: str, tamanho_bloco: int, planilha: Optional[str] = None,
+                    filtro_colunas: Optional[Callable[[str], bool]] = None) -> Iterator[Tuple[List[str], List[List[str]]]]:
+    """
+    Lê a planilha em blocos de linhas.
+
+    A primeira linha preenchida é o cabeçalho (colunas sem nome recebem
+    "Unnamed: N", como no pandas). Linhas mais curtas que o cabeçalho são
+    completadas com vazios e células além do cabeçalho são descartadas.
+
+    Args:
+        caminho_arquivo: Caminho do arquivo XLSX.
+        tamanho_bloco: Quantidade de linhas por bloco.
+        planilha: Nome da planilha. Se None, usa a primeira.
+        filtro_colunas: Filtro dos nomes de coluna a manter (ex.: ManifestoCampos.filtro_colunas()).
+
+    Yields:
+        Tupla (nomes das colunas, linhas do bloco).
+
+    Raises:
+        FormatoArquivoInvalidoError: Se o arquivo não for um XLSX válido.
+    """
+    with PlanilhaXLSX(caminho_arquivo, planilha) as arquivo:
+        logger.info(f"Lendo a planilha '{arquivo.nome_planilha}' de {caminho_arquivo} em fluxo")
+        linhas = arquivo.iterar_linhas()
+        cabecalho_original = next(linhas, None)
+        if cabecalho_original is None:
+            return
+
+        cabecalho = [nome if nome.strip() else f"Unnamed: {posicao}" for posicao, nome in enumerate(cabecalho_original)]
+        posicoes = [posicao for posicao, nome in enumerate(cabecalho) if filtro_colunas is None or filtro_colunas(nome)]
+        colunas = [cabecalho[posicao] for posicao in posicoes]
+        largura = len(cabecalho)
+
+        bloco: List[List[str]] = []
+        try:
+            for valores in linhas:
+                if len(valores) < largura:
+                    valores.extend([""] * (largura - len(valores)))
+                bloco.append([valores[posicao] for posicao in posicoes])
+                if len(bloco) >= tamanho_bloco:
+                    yield colunas, bloco
+                    bloco = []
+        except etree.XMLSyntaxError as e:
+            raise FormatoArquivoInvalidoError(f"XML inválido na planilha de {caminho_arquivo}: {str(e)}")
+        if bloco:
+            yield colunas, bloco
@@ -0,0 +1,147 @@
+"""
+Limites de linhas e de campos de um CSV, fora de campos entre aspas.
+
+Usado pela verificação de largura das linhas (src/largura_csv.py), pelo índice
+de linhas (src/indice_linhas_csv.py) e pela divisão em faixas da leitura
+paralela (src/leitor_csv_paralelo.py), que precisam saber, sem interpretar o
+CSV inteiro, quais fins de linha e separadores encerram de fato uma linha ou
+um campo.
+
+As aspas seguem as regras do pandas.read_csv e do módulo csv: só abrem um
+campo entre aspas no início do campo (início do arquivo, após o separador ou
+após o fim de linha); no meio de um campo (ex.: monitor 12pol" hd) são um
+caractere comum. Dentro do campo entre aspas, aspas duplicadas ("") são uma
+aspa escapada e uma aspa isolada encerra o campo.
+
+A análise é vetorizada (numpy) sobre as sequências de aspas consecutivas:
+apenas as sequências de tamanho ímpar alteram o estado, e a paridade simples
+só diverge do estado real a partir de uma sequência que estaria abrindo um
+campo fora do início do campo; essas sequências são localizadas por busca
+binária e descartadas, uma a uma.
+"""
+
+from typing import Tuple
+
+import numpy as np
+
+# Códigos dos bytes relevantes para a análise
+_ASPAS = ord('"')
+_FIM_LINHA = ord('\n')
+
+# Marca de ordem de bytes (BOM) UTF-8 no início do arquivo
+_BOM = b'\xef\xbb\xbf'
+
+
+class LimitesCSV:
+    """
+    Localiza, bloco a bloco, os fins de linha e os separadores fora de campos entre aspas.
+    """
+
+    def __init__(self, separador: str = ';', inicio_arquivo: bool = True):
+        """
+        Args:
+            separador: Separador de colunas (um caractere).
+            inicio_arquivo: Se o primeiro bloco começa no início do arquivo (pode
+                            ter o BOM, inteiro no primeiro bloco); caso contrário,
+                            deve começar no início de uma linha.
+        """
+        self._codigo_separador = ord(separador)
+        self._inicio_arquivo = inicio_arquivo
+        # Estado ao final do último bloco: dentro de campo entre aspas, último byte e
+        # sequência de aspas no fim do bloco ainda sem o byte seguinte (tamanho, no início do campo)
+        self.dentro_aspas = False
+        self._anterior = _FIM_LINHA
+        self._aspas_pendentes = 0
+        self._pendentes_no_inicio = False
+
+    def analisar(self, bloco: bytes) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Analisa o próximo bloco de bytes do CSV.
+
+        Returns:
+            Tupla (posições dos fins de linha, posições dos separadores), relativas
+            ao bloco, apenas as que estão fora de campos entre aspas.
+        """
+        dados = np.frombuffer(bloco, dtype=np.uint8)
+        fins = np.flatnonzero(dados == _FIM_LINHA)
+        separadores = np.flatnonzero(dados == self._codigo_separador)
+        aspas = np.flatnonzero(dados == _ASPAS)
+        if not len(dados):
+            return fins, separadores
+
+        inicio_bom = len(_BOM) if self._inicio_arquivo and bloco.startswith(_BOM) else -1
+        self._inicio_arquivo = False
+        if not len(aspas) and not self._aspas_pendentes:
+            # Bloco só com o BOM: o próximo byte ainda é o início do primeiro campo
+            self._anterior = int(dados[-1]) if len(dados) != inicio_bom else _FIM_LINHA
+            if self.dentro_aspas:
+                return fins[:0], separadores[:0]
+            return fins, separadores
+
+        # Sequências de aspas consecutivas: posição, tamanho e se estão no início de um campo
+        quebras = np.flatnonzero(np.diff(aspas) != 1) + 1
+        indices_inicio = np.concatenate(([0], quebras)) if len(aspas) else quebras
+        posicoes = aspas[indices_inicio]
+        tamanhos = np.diff(np.append(indices_inicio, len(aspas)))
+        anteriores = dados[np.maximum(posicoes - 1, 0)].astype(np.int64)
+        if len(posicoes) and posicoes[0] == 0:
+            anteriores[0] = self._anterior
+        no_inicio = (anteriores == _FIM_LINHA) | (anteriores == self._codigo_separador) | (posicoes == inicio_bom)
+        # A sequência que termina no fim do bloco depende do byte seguinte (aspa escapada ou não)
+        termina_no_fim = bool(len(posicoes)) and posicoes[-1] + tamanhos[-1] == len(dados)
+
+        if self._aspas_pendentes:
+            # A sequência do fim do bloco anterior continua neste bloco ou termina antes dele
+            if len(posicoes) and posicoes[0] == 0:
+                tamanhos[0] += self._aspas_pendentes
+                no_inicio[0] = self._pendentes_no_inicio
+            else:
+                posicoes = np.concatenate(([-1], posicoes))
+                tamanhos = np.concatenate(([self._aspas_pendentes], tamanhos))
+                no_inicio = np.concatenate(([self._pendentes_no_inicio], no_inicio))
+
+        if termina_no_fim:
+            self._aspas_pendentes = int(tamanhos[-1])
+            self._pendentes_no_inicio = bool(no_inicio[-1])
+            posicoes, tamanhos, no_inicio = posicoes[:-1], tamanhos[:-1], no_inicio[:-1]
+        else:
+            self._aspas_pendentes = 0
+        self._anterior = int(dados[-1])
+
+        impares = tamanhos % 2 == 1
+        posicoes, no_inicio = posicoes[impares], no_inicio[impares]
+        alternancias = self._alternancias(no_inicio)
+
+        estado_inicial = int(self.dentro_aspas)
+        self.dentro_aspas = bool((estado_inicial + int(np.count_nonzero(alternancias))) % 2)
+        posicoes = posicoes[alternancias]
+        if not len(posicoes) and not estado_inicial:
+            return fins, separadores
+        return (fins[(np.searchsorted(posicoes, fins) + estado_inicial) % 2 == 0],
+                separadores[(np.searchsorted(posicoes, separadores) + estado_inicial) % 2 == 0])
+
+    def _alternancias(self, no_inicio: np.ndarray) -> np.ndarray:
+        """
+        Indica quais sequências ímpares de aspas alternam o estado (abrem ou
+        encerram um campo entre aspas), a partir do estado atual.
+
+        Pela paridade simples, a sequência k é analisada fora de aspas quando
+        k + estado é par; se ela não estiver no início de um campo, é texto
+        comum: não alterna o estado, e a análise recomeça fora de aspas logo após ela.
+        """
+        alternancias = np.ones(len(no_inicio), dtype=bool)
+        fora_do_inicio = np.flatnonzero(~no_inicio)
+        candidatas = (fora_do_inicio[fora_do_inicio % 2 == 0], fora_do_inicio[fora_do_inicio % 2 == 1])
+        inicio = 0
+        estado = int(self.dentro_aspas)
+        while True:
+            # Primeira sequência a partir de inicio analisada fora de aspas e fora do início do campo
+            paridade = (inicio + estado) % 2
+            lista = candidatas[paridade]
+            posicao = np.searchsorted(lista, inicio)
+            if posicao == len(lista):
+                return alternancias
+            indice = int(lista[posicao])
+            alternancias[indice] = False
+            inicio = indice + 1
+            estado = 0
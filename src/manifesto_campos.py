@@ -0,0 +1,91 @@
+"""
+Manifesto dos campos de dados necessários para um template.
+
+Um template usa apenas uma parte das colunas da exportação de entrevistas.
+O manifesto reúne os campos de que a geração do documento depende:
+
+- placeholders do template, segundo o backend de renderização em uso;
+- campos usados pelas regras condicionais (condicionais.json);
+- campos condicionais do mapeamento de seções do processador de documentos.
+
+O ProcessadorCSV usa o manifesto para ler (usecols) e converter apenas essas colunas.
+"""
+
+from typing import Callable, FrozenSet, Iterable, Iterator, Optional
+
+from src.logger import logger
+
+
+class ManifestoCampos:
+    """
+    Conjunto dos campos de dados necessários para gerar documentos de um template.
+    """
+
+    def __init__(self, campos_template: Iterable[str], campos_regras: Iterable[str] = (),
+                 campos_processador: Iterable[str] = ()):
+        """
+        Args:
+            campos_template: Campos referenciados por placeholders do template.
+            campos_regras: Campos usados pelas regras condicionais.
+            campos_processador: Campos consultados pelo processador de documentos
+                                (ex.: campos condicionais do mapeamento de seções).
+        """
+        self.campos_template: FrozenSet[str] = frozenset(campos_template)
+        self.campos_regras: FrozenSet[str] = frozenset(campos_regras)
+        self.campos_processador: FrozenSet[str] = frozenset(campos_processador)
+        self.campos: FrozenSet[str] = self.campos_template | self.campos_regras | self.campos_processador
+
+    def __contains__(self, campo: object) -> bool:
+        return campo in self.campos
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(sorted(self.campos))
+
+    def __len__(self) -> int:
+        return len(self.campos)
+
+    def filtro_colunas(self) -> Callable[[str], bool]:
+        """
+        Retorna o filtro de colunas para pandas.read_csv(usecols=...), que compara
+        o nome da coluna sem espaços nas bordas.
+        """
+        campos = self.campos
+        return lambda coluna: str(coluna).strip() in campos
+
+    def resumo(self) -> str:
+        """
+        Resumo textual do manifesto, para log.
+        """
+        return (f"{len(self.campos)} campos (template: {len(self.campos_template)}, "
+                f"regras: {len(self.campos_regras)}, processador: {len(self.campos_processador)})")
+
+    def __repr__(self) -> str:
+        return f"ManifestoCampos({self.resumo()})"
+
+
+def construir_manifesto(template_path: str, motor_regras, processador_documento: Optional[object] = None) -> ManifestoCampos:
+    """
+    Monta o manifesto de campos de um template.
+
+    Args:
+        template_path: Caminho do template DOCX.
+        motor_regras: MotorRegras com as regras já carregadas.
+        processador_documento: Processador de documentos (DocumentoProcessor ou
+                               DocumentoProcessorXML) que vai renderizar o template:
+                               define os campos dos placeholders e os campos condicionais.
+
+    Returns:
+        ManifestoCampos do template.
+    """
+    if processador_documento is not None:
+        campos_template = processador_documento.campos_template(template_path)
+        campos_processador = processador_documento.campos_condicionais()
+    else:
+        from src.cache_templates import obter_template
+
+        campos_template = obter_template(template_path).plano.campos
+        campos_processador = ()
+
+    manifesto = ManifestoCampos(campos_template, motor_regras.campos_referenciados(), campos_processador)
+    logger.info(f"Manifesto de campos do template {template_path}: {manifesto.resumo()}")
+    return manifesto
@@ -9,17 +9,43 @@ import os
 import sys
 import re
 import json
+import keyword
 from typing import Any, Dict, List, Optional, Union, Callable, Tuple, Set, cast
 
 # Adiciona o diretório pai ao path para importar módulos
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from src.definicao_campos import DefinicaoCampo, RegistroCampos
+from src.formatadores_campos import TabelaFormatadores
 from src.logger import logger
 from src.exceptions import (
     RegraError,
     RegraInvalidaError
 )
 
+# Identificadores em expressões de condição e referências ${campo}
+_REGEX_IDENTIFICADOR = re.compile(r"[A-Za-z_][A-Za-z0-9_]*")
+_REGEX_REFERENCIA = re.compile(r"\$\{([A-Za-z_][A-Za-z0-9_]*)\}")
+_REGEX_TEXTO_LITERAL = re.compile(r"'[^']*'|\"[^\"]*\"")
+
+# Registro sem definições, usado quando o modelo relacional não está em uso
+_REGISTRO_VAZIO = RegistroCampos(())
+
+
+def extrair_campos_expressao(expressao: str) -> Set[str]:
+    """
+    Extrai os nomes de campos usados numa expressão de condição
+    (ex.: "calcular_horas_extras == 'Sim'" -> {"calcular_horas_extras"}).
+    
+    Textos entre aspas, palavras reservadas e literais (True, False, None) são ignorados.
+    """
+    sem_literais = _REGEX_TEXTO_LITERAL.sub(" ", expressao)
+    return {
+        nome for nome in _REGEX_IDENTIFICADOR.findall(sem_literais)
+        if not keyword.iskeyword(nome) and nome not in ('true', 'false', 'null', 'none')
+    }
+
+
 class MotorRegras:
     """
     Motor de avaliação de regras para validação de condições 
@@ -70,6 +96,10 @@ class MotorRegras:
         # Definições de seções e suas regras de ativação
         self.definicoes_secoes: Dict[str, Dict[str, Any]] = {}
         
+        # Adaptador do modelo relacional (compartilhado pelo processo, carregado sob demanda)
+        self._adaptador_modelo = None
+        self._formatadores: Optional[TabelaFormatadores] = None
+        
     def carregar_regras(self, caminho_regras: Optional[str] = None) -> None:
         """
         Carrega as regras condicionais de um arquivo JSON.
@@ -103,6 +133,102 @@ class MotorRegras:
             self.regras = {}
             self.definicoes_secoes = {}
     
+    def _obter_adaptador_modelo(self):
+        """
+        Retorna o adaptador do modelo relacional, carregando-o na primeira chamada.
+        
+        Returns:
+            AdaptadorModeloRelacional, ou None se o modelo relacional não está em uso.
+        """
+        if not self.usar_modelo_relacional:
+            return None
+        if self._adaptador_modelo is None:
+            from src.adaptador_modelo_relacional import obter_adaptador_modelo
+            self._adaptador_modelo = obter_adaptador_modelo()
+        return self._adaptador_modelo
+    
+    def obter_registro_campos(self) -> RegistroCampos:
+        """
+        Obtém o registro de definições de campos do modelo relacional.
+        
+        Returns:
+            RegistroCampos compartilhado (vazio se o modelo relacional não está em uso).
+        """
+        adaptador = self._obter_adaptador_modelo()
+        return adaptador.registro if adaptador is not None else _REGISTRO_VAZIO
+    
+    def obter_definicao_campo(self, nome_campo: str) -> Optional[DefinicaoCampo]:
+        """
+        Obtém a definição de um campo pelo nome.
+        
+        Args:
+            nome_campo: Nome do campo.
+            
+        Returns:
+            DefinicaoCampo, ou None se o campo não está no modelo (ou o modelo não está em uso).
+        """
+        return self.obter_registro_campos().por_nome(nome_campo)
+    
+    def obter_campo_por_nome(self, nome_campo: str) -> Optional[Dict[str, Any]]:
+        """
+        Obtém a definição de um campo pelo nome (tipo, formatação, obrigatoriedade).
+        
+        Só há definições quando o modelo relacional está em uso; o adaptador é
+        carregado na primeira consulta e as respostas são reaproveitadas por ele.
+        
+        Args:
+            nome_campo: Nome do campo.
+            
+        Returns:
+            Dicionário com as informações do campo, ou None se não encontrado.
+        """
+        adaptador = self._obter_adaptador_modelo()
+        return adaptador.obter_campo_por_nome(nome_campo) if adaptador is not None else None
+    
+    def obter_formatadores(self) -> TabelaFormatadores:
+        """
+        Obtém a tabela de formatadores por campo, compilada quando as definições
+        de campos são carregadas.
+        
+        Returns:
+            TabelaFormatadores (vazia se o modelo relacional não está em uso; nesse
+            caso cada campo recebe o formatador padrão decidido pelo nome).
+        """
+        if self._formatadores is None:
+            adaptador = self._obter_adaptador_modelo()
+            self._formatadores = adaptador.formatadores if adaptador is not None else TabelaFormatadores()
+        return self._formatadores
+    
+    def campos_referenciados(self) -> Set[str]:
+        """
+        Obtém os nomes dos campos de dados referenciados pelas regras carregadas
+        (expressões em "condicao", "campo" de condições estruturadas e referências ${campo}).
+        
+        Returns:
+            Conjunto com os nomes dos campos.
+        """
+        campos: Set[str] = set()
+        
+        def visitar(no: Any) -> None:
+            if isinstance(no, dict):
+                for chave, valor in no.items():
+                    if chave == 'condicao' and isinstance(valor, str):
+                        campos.update(extrair_campos_expressao(valor))
+                    elif chave == 'campo' and isinstance(valor, str):
+                        nome = valor[2:-1] if valor.startswith("${") and valor.endswith("}") else valor
+                        if _REGEX_IDENTIFICADOR.fullmatch(nome):
+                            campos.add(nome)
+                    else:
+                        visitar(valor)
+            elif isinstance(no, list):
+                for item in no:
+                    visitar(item)
+            elif isinstance(no, str):
+                campos.update(_REGEX_REFERENCIA.findall(no))
+        
+        visitar(self.regras)
+        return campos
+    
     def avaliar_secoes_ativas(self, dados: Dict[str, Any]) -> List[str]:
         """
         Avalia quais seções devem estar ativas com base nos dados fornecidos.
@@ -0,0 +1,514 @@
+"""
+Plano de renderização pré-compilado para templates DOCX.
+
+Este módulo analisa um template uma única vez e registra onde estão os
+placeholders (parágrafo, run e offset), onde estão os marcadores de seção
+e quais parágrafos são estáticos. O plano é guardado junto com o template
+em cache (ver src/cache_templates.py), indexado pelo caminho do template e
+pela sua data de modificação/tamanho, e é reutilizado por todos os
+registros de um lote.
+"""
+
+import os
+import re
+from itertools import accumulate
+from typing import Dict, List, Any, Optional, Tuple, Iterator, Callable, Iterable, Set
+from lxml import etree
+from docx.document import Document  # Para tipagem
+from docx.oxml.ns import qn, nsmap
+from docx.opc.constants import RELATIONSHIP_TYPE as RT
+
+from src.logger import logger
+
+# Regex pré-compilada para placeholders (permite espaços entre chaves e nome do campo)
+REGEX_PLACEHOLDER = re.compile(r'{{[\s]*([^{}]+?)[\s]*}}')
+
+# Runs de um parágrafo: todas as <w:r> cujo parágrafo mais interno é ele (diretas e dentro de
+# hyperlinks, controles de conteúdo, revisões inseridas etc.), sem as de parágrafos aninhados
+# (caixas de texto). É o mesmo conjunto de nós <w:t> agrupado pelo backend XML.
+XPATH_RUNS = etree.XPath('.//w:r[count(ancestor::w:p) = $nivel]', namespaces={'w': nsmap['w']})
+XPATH_NIVEL_PARAGRAFO = etree.XPath('count(ancestor-or-self::w:p)', namespaces={'w': nsmap['w']})
+
+# Elementos de bloco do corpo considerados no índice de seções
+TAGS_BLOCO = (qn('w:p'), qn('w:tbl'), qn('w:sdt'))
+
+# Edição em um segmento de texto: (início, fim, campo); campo None remove o trecho
+EdicaoSegmento = Tuple[int, int, Optional[str]]
+
+# Identificador da história (story) principal do documento
+HISTORIA_CORPO = 'corpo'
+
+# Tipos de ocorrência registrados no plano
+TIPO_CAMPO = 'campo'
+TIPO_INICIO_SECAO = 'inicio_secao'
+TIPO_FIM_SECAO = 'fim_secao'
+
+# Chave de cache: caminho absoluto, mtime em nanossegundos e tamanho do arquivo
+ChaveTemplate = Tuple[str, int, int]
+
+
+class OcorrenciaPlaceholder:
+    """
+    Posição de um placeholder ou marcador de seção dentro de um parágrafo.
+    """
+
+    def __init__(self, nome: str, tipo: str, inicio: int, fim: int,
+                 run_inicio: int, offset_inicio: int, run_fim: int, offset_fim: int):
+        """
+        Args:
+            nome: Nome do campo ou ID da seção (sem '#' ou '/').
+            tipo: TIPO_CAMPO, TIPO_INICIO_SECAO ou TIPO_FIM_SECAO.
+            inicio: Posição inicial no texto concatenado das runs.
+            fim: Posição final (exclusiva) no texto concatenado das runs.
+            run_inicio: Índice da run que contém o início do placeholder.
+            offset_inicio: Offset do início dentro da run inicial.
+            run_fim: Índice da run que contém o fim do placeholder.
+            offset_fim: Offset (exclusivo) do fim dentro da run final.
+        """
+        self.nome = nome
+        self.tipo = tipo
+        self.inicio = inicio
+        self.fim = fim
+        self.run_inicio = run_inicio
+        self.offset_inicio = offset_inicio
+        self.run_fim = run_fim
+        self.offset_fim = offset_fim
+
+    @property
+    def fragmentado(self) -> bool:
+        """True se o placeholder está distribuído em mais de uma run."""
+        return self.run_inicio != self.run_fim
+
+    def __repr__(self) -> str:
+        return (f"OcorrenciaPlaceholder({self.tipo}:{self.nome} "
+                f"runs {self.run_inicio}:{self.offset_inicio}-{self.run_fim}:{self.offset_fim})")
+
+
+class ParagrafoPlano:
+    """
+    Parágrafo dinâmico (com placeholders ou marcadores) registrado no plano.
+    """
+
+    def __init__(self, indice: int, ocorrencias: List[OcorrenciaPlaceholder],
+                 edicoes: Optional[Dict[int, List[EdicaoSegmento]]] = None):
+        """
+        Args:
+            indice: Índice do parágrafo na ordem de documento da sua história.
+            ocorrencias: Placeholders e marcadores encontrados no parágrafo.
+            edicoes: Edições de substituição por índice de run (ver gerar_edicoes).
+        """
+        self.indice = indice
+        self.ocorrencias = ocorrencias
+        self.edicoes = edicoes if edicoes is not None else {}
+
+    @property
+    def apenas_marcadores(self) -> bool:
+        """True se o parágrafo contém somente marcadores de seção."""
+        return all(o.tipo != TIPO_CAMPO for o in self.ocorrencias)
+
+
+class IntervaloSecao:
+    """
+    Intervalo de uma seção condicional na ordem dos elementos do corpo
+    (parágrafos e tabelas), incluindo os parágrafos de marcador.
+    """
+
+    def __init__(self, secao_id: str, inicio: int, fim: int, nivel: int, incompleta: bool = False):
+        """
+        Args:
+            secao_id: ID da seção (nome usado em {{#ID}} / {{/ID}}).
+            inicio: Índice do elemento com o marcador de início.
+            fim: Índice (inclusivo) do elemento com o marcador de fim.
+            nivel: Profundidade de aninhamento (0 para seções de primeiro nível).
+            incompleta: True se a seção não foi fechada (vai até o fim do corpo).
+        """
+        self.secao_id = secao_id
+        self.inicio = inicio
+        self.fim = fim
+        self.nivel = nivel
+        self.incompleta = incompleta
+
+    def __repr__(self) -> str:
+        return f"IntervaloSecao({self.secao_id}: {self.inicio}-{self.fim}, nível {self.nivel})"
+
+
+class IndiceSecoes:
+    """
+    Índice das seções condicionais do corpo, calculado uma vez por template.
+
+    As posições referem-se à lista de elementos de bloco do corpo
+    (ver listar_elementos_corpo), que não muda com a substituição de campos.
+    """
+
+    def __init__(self):
+        # Intervalos em ordem de início
+        self.intervalos: List[IntervaloSecao] = []
+        # Elementos que contêm marcadores: índice -> True se o parágrafo só tem marcadores
+        self.elementos_marcadores: Dict[int, bool] = {}
+        self.total_elementos = 0
+
+    @property
+    def secoes(self) -> Set[str]:
+        """IDs das seções presentes no corpo."""
+        return {intervalo.secao_id for intervalo in self.intervalos}
+
+    def intervalos_da_secao(self, secao_id: str) -> List[IntervaloSecao]:
+        """Intervalos de uma seção (um mesmo ID pode aparecer mais de uma vez)."""
+        return [intervalo for intervalo in self.intervalos if intervalo.secao_id == secao_id]
+
+    def faixas_inativas(self, secoes_ativas: Iterable[str]) -> List[Tuple[int, int]]:
+        """
+        Calcula as faixas de elementos a descartar para um conjunto de seções ativas.
+
+        Args:
+            secoes_ativas: IDs das seções ativas no registro.
+
+        Returns:
+            Faixas (início, fim inclusivo) disjuntas e ordenadas; seções aninhadas
+            em uma seção inativa ficam contidas na faixa da seção externa.
+        """
+        ativas = set(secoes_ativas)
+        faixas: List[Tuple[int, int]] = []
+        for intervalo in self.intervalos:
+            if intervalo.secao_id in ativas:
+                continue
+            if faixas and intervalo.inicio <= faixas[-1][1]:
+                faixas[-1] = (faixas[-1][0], max(faixas[-1][1], intervalo.fim))
+            else:
+                faixas.append((intervalo.inicio, intervalo.fim))
+        return faixas
+
+
+class PlanoRenderizacao:
+    """
+    Resultado da compilação de um template: parágrafos dinâmicos por história,
+    marcadores de seção e o conjunto de campos referenciados.
+    """
+
+    def __init__(self, chave: Optional[ChaveTemplate] = None):
+        self.chave = chave
+        # História -> lista de parágrafos dinâmicos (em ordem de documento)
+        self.historias: Dict[str, List[ParagrafoPlano]] = {}
+        # Total de parágrafos por história (dinâmicos + estáticos)
+        self.total_paragrafos: Dict[str, int] = {}
+        # Marcadores de seção: (história, índice do parágrafo, ocorrência)
+        self.marcadores: List[Tuple[str, int, OcorrenciaPlaceholder]] = []
+        # Nomes de campos referenciados no template
+        self.campos: List[str] = []
+        # Índice de intervalos das seções condicionais do corpo
+        self.secoes: IndiceSecoes = IndiceSecoes()
+
+    @property
+    def total_paragrafos_dinamicos(self) -> int:
+        return sum(len(p) for p in self.historias.values())
+
+    @property
+    def total_paragrafos_estaticos(self) -> int:
+        return sum(self.total_paragrafos.values()) - self.total_paragrafos_dinamicos
+
+    def resumo(self) -> Dict[str, Any]:
+        """
+        Retorna um resumo do plano para logs e diagnóstico.
+        """
+        return {
+            'historias': len(self.historias),
+            'paragrafos_dinamicos': self.total_paragrafos_dinamicos,
+            'paragrafos_estaticos': self.total_paragrafos_estaticos,
+            'campos': len(self.campos),
+            'marcadores_secao': len(self.marcadores),
+            'secoes': len(self.secoes.intervalos)
+        }
+
+
+def iterar_historias(doc: Document) -> Iterator[Tuple[str, Any]]:
+    """
+    Itera sobre as histórias (corpo, cabeçalhos e rodapés) do documento.
+
+    Cabeçalhos e rodapés são obtidos pelas relações da parte principal, de modo
+    que cada parte é visitada uma única vez mesmo quando compartilhada entre seções.
+
+    Args:
+        doc: Documento a ser percorrido.
+
+    Yields:
+        Tuplas (identificador da história, elemento raiz XML).
+    """
+    yield HISTORIA_CORPO, doc.element.body
+
+    partes = []
+    for rel in doc.part.rels.values():
+        if rel.is_external or rel.reltype not in (RT.HEADER, RT.FOOTER):
+            continue
+        partes.append(rel.target_part)
+
+    for parte in sorted(partes, key=lambda p: str(p.partname)):
+        yield str(parte.partname), parte.element
+
+
+def listar_paragrafos(raiz: Any) -> List[Any]:
+    """
+    Lista os elementos <w:p> de uma história em ordem de documento,
+    incluindo parágrafos dentro de tabelas.
+    """
+    return list(raiz.iter(qn('w:p')))
+
+
+def listar_elementos_corpo(corpo: Any) -> List[Any]:
+    """
+    Lista os elementos de bloco do corpo (parágrafos, tabelas e controles de
+    conteúdo) em ordem de documento, sem descer em tabelas.
+    """
+    return list(corpo.iterchildren(*TAGS_BLOCO))
+
+
+def listar_runs(paragrafo: Any) -> List[Any]:
+    """
+    Lista os elementos <w:r> de um parágrafo (ver XPATH_RUNS), em ordem de documento.
+    """
+    return XPATH_RUNS(paragrafo, nivel=XPATH_NIVEL_PARAGRAFO(paragrafo))
+
+
+def _classificar(nome_bruto: str) -> Tuple[str, str]:
+    """
+    Separa marcadores de seção ({{#ID}} / {{/ID}}) de campos comuns.
+    """
+    nome = nome_bruto.strip()
+    if nome.startswith('#'):
+        return TIPO_INICIO_SECAO, nome[1:].strip()
+    if nome.startswith('/'):
+        return TIPO_FIM_SECAO, nome[1:].strip()
+    return TIPO_CAMPO, nome
+
+
+def tokenizar_segmentos(textos: List[str]) -> List[OcorrenciaPlaceholder]:
+    """
+    Localiza placeholders e marcadores de seção em uma sequência de segmentos
+    de texto (runs de um parágrafo ou nós <w:t> do XML), inteiros ou fragmentados.
+
+    Os segmentos são percorridos uma única vez: como as ocorrências saem em
+    ordem, o segmento corrente só avança.
+
+    Args:
+        textos: Texto de cada segmento, na ordem do parágrafo.
+
+    Returns:
+        Lista de ocorrências com as posições em (segmento, offset).
+    """
+    ocorrencias: List[OcorrenciaPlaceholder] = []
+    texto_completo = "".join(textos)
+    if '{{' not in texto_completo:
+        return ocorrencias
+
+    # Posição final (exclusiva) de cada segmento no texto concatenado
+    limites = list(accumulate(len(texto) for texto in textos))
+    segmento = 0
+
+    for match in REGEX_PLACEHOLDER.finditer(texto_completo):
+        inicio, fim = match.span()
+        while limites[segmento] <= inicio:
+            segmento += 1
+        run_inicio, offset_inicio = segmento, inicio - (limites[segmento] - len(textos[segmento]))
+        while limites[segmento] < fim:
+            segmento += 1
+        run_fim, offset_fim = segmento, fim - (limites[segmento] - len(textos[segmento]))
+
+        tipo, nome = _classificar(match.group(1))
+        ocorrencias.append(OcorrenciaPlaceholder(nome, tipo, inicio, fim,
+                                                 run_inicio, offset_inicio, run_fim, offset_fim))
+    return ocorrencias
+
+
+def gerar_edicoes(ocorrencias: List[OcorrenciaPlaceholder], textos: List[str],
+                  remover_marcadores: bool = False) -> Dict[int, List[EdicaoSegmento]]:
+    """
+    Converte as ocorrências de campos em edições por segmento.
+
+    O segmento onde o placeholder começa recebe o valor no lugar da parte do
+    placeholder que contém; nos segmentos seguintes, o restante do placeholder
+    é removido.
+
+    Args:
+        ocorrencias: Ocorrências retornadas por tokenizar_segmentos.
+        textos: Texto de cada segmento.
+        remover_marcadores: Se True, os marcadores de seção também são removidos
+                            do texto; caso contrário, não geram edições.
+
+    Returns:
+        Dicionário índice do segmento -> edições em ordem crescente de posição.
+    """
+    edicoes: Dict[int, List[EdicaoSegmento]] = {}
+    for ocorrencia in ocorrencias:
+        if ocorrencia.tipo != TIPO_CAMPO and not remover_marcadores:
+            continue
+        campo = ocorrencia.nome if ocorrencia.tipo == TIPO_CAMPO else None
+        fim_primeiro = len(textos[ocorrencia.run_inicio]) if ocorrencia.fragmentado else ocorrencia.offset_fim
+        edicoes.setdefault(ocorrencia.run_inicio, []).append((ocorrencia.offset_inicio, fim_primeiro, campo))
+        for indice in range(ocorrencia.run_inicio + 1, ocorrencia.run_fim + 1):
+            fim_segmento = ocorrencia.offset_fim if indice == ocorrencia.run_fim else len(textos[indice])
+            if fim_segmento > 0:
+                edicoes.setdefault(indice, []).append((0, fim_segmento, None))
+    return edicoes
+
+
+def aplicar_edicoes(texto: str, edicoes: List[EdicaoSegmento], resolver: Callable[[str], str]) -> str:
+    """
+    Aplica as edições de um segmento ao seu texto.
+
+    Args:
+        texto: Texto original do segmento.
+        edicoes: Edições do segmento, em ordem crescente de posição.
+        resolver: Função que retorna o valor de substituição de um campo.
+
+    Returns:
+        Texto do segmento com os campos substituídos.
+    """
+    pedacos = []
+    posicao = 0
+    for inicio, fim, campo in edicoes:
+        pedacos.append(texto[posicao:inicio])
+        if campo is not None:
+            pedacos.append(resolver(campo))
+        posicao = fim
+    pedacos.append(texto[posicao:])
+    return "".join(pedacos)
+
+
+def _apenas_marcadores(ocorrencias: List[OcorrenciaPlaceholder], textos: List[str]) -> bool:
+    """
+    True se o texto do parágrafo, sem os marcadores de seção, está em branco.
+    """
+    texto = "".join(textos)
+    posicao = 0
+    restante = []
+    for ocorrencia in ocorrencias:
+        if ocorrencia.tipo == TIPO_CAMPO:
+            return False
+        restante.append(texto[posicao:ocorrencia.inicio])
+        posicao = ocorrencia.fim
+    restante.append(texto[posicao:])
+    return not "".join(restante).strip()
+
+
+def indexar_secoes(corpo: Any, marcadores_por_paragrafo: Dict[Any, Tuple[List[OcorrenciaPlaceholder], List[str]]]) -> IndiceSecoes:
+    """
+    Monta o índice de seções a partir dos marcadores dos parágrafos de primeiro nível do corpo.
+
+    Marcadores de fim fecham a seção aberta mais recente com o mesmo ID (as
+    seções abertas depois dela e não fechadas também são encerradas ali).
+
+    Args:
+        corpo: Elemento <w:body>.
+        marcadores_por_paragrafo: Elemento <w:p> -> (ocorrências, textos das runs),
+                                  para os parágrafos que contêm marcadores.
+
+    Returns:
+        IndiceSecoes do corpo.
+    """
+    indice = IndiceSecoes()
+    elementos = listar_elementos_corpo(corpo)
+    indice.total_elementos = len(elementos)
+    abertas: List[Tuple[str, int]] = []
+    intervalos: List[IntervaloSecao] = []
+
+    for posicao, elemento in enumerate(elementos):
+        if elemento not in marcadores_por_paragrafo:
+            continue
+        ocorrencias, textos = marcadores_por_paragrafo[elemento]
+        indice.elementos_marcadores[posicao] = _apenas_marcadores(ocorrencias, textos)
+
+        for ocorrencia in ocorrencias:
+            if ocorrencia.tipo == TIPO_INICIO_SECAO:
+                abertas.append((ocorrencia.nome, posicao))
+            elif ocorrencia.tipo == TIPO_FIM_SECAO:
+                ids_abertos = [secao_id for secao_id, _ in abertas]
+                if ocorrencia.nome not in ids_abertos:
+                    logger.warning(f"Marcador de FIM para seção não aberta: '{ocorrencia.nome}'")
+                    continue
+                while abertas:
+                    secao_id, inicio = abertas.pop()
+                    intervalos.append(IntervaloSecao(secao_id, inicio, posicao, len(abertas),
+                                                     incompleta=secao_id != ocorrencia.nome))
+                    if secao_id == ocorrencia.nome:
+                        break
+
+    # Seções não fechadas vão até o fim do corpo
+    while abertas:
+        secao_id, inicio = abertas.pop()
+        logger.warning(f"ALERTA: Seção '{secao_id}' foi aberta mas não fechada (elemento {inicio + 1})")
+        intervalos.append(IntervaloSecao(secao_id, inicio, len(elementos) - 1, len(abertas), incompleta=True))
+
+    indice.intervalos = sorted(intervalos, key=lambda intervalo: (intervalo.inicio, intervalo.nivel))
+    return indice
+
+
+def compilar_plano(doc: Document, chave: Optional[ChaveTemplate] = None) -> PlanoRenderizacao:
+    """
+    Analisa o documento e monta o plano de renderização.
+
+    Args:
+        doc: Documento (template) a ser analisado.
+        chave: Chave de cache associada ao template, se houver.
+
+    Returns:
+        PlanoRenderizacao com as posições de placeholders e marcadores.
+    """
+    plano = PlanoRenderizacao(chave)
+    campos_vistos = set()
+    marcadores_corpo: Dict[Any, Tuple[List[OcorrenciaPlaceholder], List[str]]] = {}
+
+    for historia, raiz in iterar_historias(doc):
+        paragrafos = listar_paragrafos(raiz)
+        plano.total_paragrafos[historia] = len(paragrafos)
+        dinamicos: List[ParagrafoPlano] = []
+
+        for indice, p in enumerate(paragrafos):
+            textos = [run.text for run in listar_runs(p)]
+            ocorrencias = tokenizar_segmentos(textos)
+            if not ocorrencias:
+                continue
+
+            for ocorrencia in ocorrencias:
+                if ocorrencia.tipo == TIPO_CAMPO:
+                    if ocorrencia.nome not in campos_vistos:
+                        campos_vistos.add(ocorrencia.nome)
+                        plano.campos.append(ocorrencia.nome)
+                else:
+                    plano.marcadores.append((historia, indice, ocorrencia))
+
+            # Parágrafos de primeiro nível do corpo só com marcadores são removidos
+            # inteiros na poda de seções; nos demais, o texto dos marcadores é apagado
+            remover_marcadores = False
+            if any(o.tipo != TIPO_CAMPO for o in ocorrencias):
+                if historia == HISTORIA_CORPO:
+                    marcadores_corpo[p] = (ocorrencias, textos)
+                remover_marcadores = not (historia == HISTORIA_CORPO and p.getparent() == raiz
+                                          and _apenas_marcadores(ocorrencias, textos))
+
+            dinamicos.append(ParagrafoPlano(indice, ocorrencias,
+                                            gerar_edicoes(ocorrencias, textos, remover_marcadores)))
+
+        if dinamicos:
+            plano.historias[historia] = dinamicos
+
+        if historia == HISTORIA_CORPO and marcadores_corpo:
+            plano.secoes = indexar_secoes(raiz, marcadores_corpo)
+            ignorados = len(marcadores_corpo) - len(plano.secoes.elementos_marcadores)
+            if ignorados:
+                logger.warning(f"{ignorados} parágrafo(s) com marcadores de seção dentro de tabelas ou caixas de texto foram ignorados no índice de seções")
+
+    return plano
+
+
+def chave_template(template_path: str) -> ChaveTemplate:
+    """
+    Calcula a chave de cache de um template (caminho, mtime e tamanho).
+
+    Args:
+        template_path: Caminho do template.
+
+    Returns:
+        Tupla usada como chave no cache de planos.
+    """
+    caminho = os.path.abspath(template_path)
+    info = os.stat(caminho)
+    return caminho, info.st_mtime_ns, info.st_size
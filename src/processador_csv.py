@@ -1,13 +1,14 @@
 """
 Processador de arquivos CSV para o sistema de peticionamento.
 """
+import io
 import os
 import sys
-import pandas as pd
 import csv
+import math
 import re
 from datetime import datetime
-from typing import Dict, Any, List, Optional, Hashable # <--- ADICIONADO Hashable
+from typing import TYPE_CHECKING, Dict, Any, BinaryIO, List, Mapping, Optional, Iterator, Tuple, Union, Hashable # <--- ADICIONADO Hashable
 
 # Adiciona o diretório pai ao path para importar módulos
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -18,73 +19,134 @@ from src.exceptions import (
     DadosInvalidosError
 )
 from src.logger import logger
+from src.registro_lote import RegistroLote
+from src.manifesto_campos import ManifestoCampos
+from src.definicao_campos import obter_registro_campos
+from src.leitor_csv_simples import iterar_blocos_csv
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+# Carregadores de CSV aceitos (ver config.CARREGADOR_CSV)
+CARREGADORES_CSV = ('auto', 'pandas', 'csv')
+
+# Tipos de campo (tipo_dado_programacao) agrupados pela conversão aplicada
+TIPOS_INTEIROS = ['int', 'inteiro', 'integer']
+TIPOS_DECIMAIS = ['float', 'decimal', 'numero', 'number', 'moeda', 'dinheiro']
+TIPOS_DATA = ['data', 'date']
+TIPOS_BOOLEANOS = ['bool', 'booleano', 'logico']
+
+# Formatos de data aceitos, na ordem de tentativa
+FORMATOS_DATA = ('%d/%m/%Y', '%Y-%m-%d', '%d-%m-%Y', '%Y/%m/%d', '%d.%m.%Y', '%m/%d/%Y', '%d%m%Y')
+
+# Valores interpretados como verdadeiro em campos booleanos
+VALORES_VERDADEIROS = ['sim', 'true', '1', 's', 'yes', 'verdadeiro', 'v']
+
+# Textos tratados como célula vazia
+VALORES_NULOS = ['nan', 'none', '<na>']
+
+# Símbolos removidos de valores numéricos antes da conversão (R$ e espaços)
+_REGEX_SIMBOLOS_NUMERO = re.compile(r"[R$\s]")
+
+
+def normalizar_texto_numerico(valor_str: str) -> str:
+    """
+    Remove R$ e espaços e normaliza os separadores de um número em texto para o
+    formato aceito por float(): 1.234,56 / 1,234.56 / 1234,56 -> 1234.56.
+    
+    Returns:
+        Texto normalizado (vazio se não restar nada após a limpeza).
+    """
+    valor_limpo = _REGEX_SIMBOLOS_NUMERO.sub("", valor_str.strip())
+    if ',' in valor_limpo and '.' in valor_limpo:
+        if valor_limpo.rfind('.') < valor_limpo.rfind(','):
+            return valor_limpo.replace('.', '').replace(',', '.')
+        return valor_limpo.replace(',', '')
+    if ',' in valor_limpo:
+        return valor_limpo.replace(',', '.')
+    return valor_limpo
+
+
+def _texto_para_float(valor_str: str) -> float:
+    """
+    Converte como limpar_e_converter_float, sem registrar avisos; NaN indica
+    valor que não pôde ser convertido (ou não finito, tratado pela conversão individual).
+    """
+    valor_processado = normalizar_texto_numerico(valor_str)
+    if not valor_processado:
+        return 0.0
+    try:
+        numero = float(valor_processado)
+    except ValueError:
+        return math.nan
+    return numero if math.isfinite(numero) else math.nan
+
+
+def _formatar_data_texto(valor_str: str, formatos: Tuple[str, ...]) -> Optional[str]:
+    """
+    Formata a data como dd/mm/aaaa com o primeiro dos formatos que a reconhece (None se nenhum).
+    """
+    for formato in formatos:
+        try:
+            return datetime.strptime(valor_str, formato).strftime('%d/%m/%Y')
+        except ValueError:
+            continue
+    return None
 
 class ProcessadorCSV:
     """
     Classe responsável por carregar e processar arquivos CSV de entrevistas.
     """
     
-    def __init__(self, modo_estrito: Optional[bool] = None):
+    def __init__(self, modo_estrito: Optional[bool] = None, campos_definicao: Optional[Dict[str, Dict[str, Any]]] = None,
+                 carregador: Optional[str] = None):
+        # campos_definicao: tipagem já carregada (ex.: repassada aos processos da leitura paralela)
+        # carregador: leitura em fluxo com o pandas ou com o módulo csv (ver config.CARREGADOR_CSV)
         self.modo_estrito = modo_estrito if modo_estrito is not None else config.MODO_ESTRITO
+        self.carregador = carregador or config.CARREGADOR_CSV
+        if self.carregador not in CARREGADORES_CSV:
+            raise ValueError(f"Carregador de CSV inválido: '{self.carregador}' (use {', '.join(CARREGADORES_CSV)})")
         self.campos_definicao: Dict[str, Dict[str, Any]] = {}
-        self._carregar_definicao_campos()
+        if campos_definicao is not None:
+            self.campos_definicao = campos_definicao
+        else:
+            self._carregar_definicao_campos()
     
     def _carregar_definicao_campos(self):
-        # ... (código como na sua última versão, garantindo que self.campos_definicao é sempre um dict)
+        # Tipagem dos campos a partir do registro de definições compartilhado (src/definicao_campos.py)
+        if not os.path.exists(config.DEFINICAO_CAMPOS_CSV):
+            logger.warning(f"Arquivo de definição de campos não encontrado: {config.DEFINICAO_CAMPOS_CSV}")
+            self.campos_definicao = {}
+            return
         try:
-            if os.path.exists(config.DEFINICAO_CAMPOS_CSV):
-                separador = config.CSV_SEPARATOR
-                try:
-                    df_definicao = pd.read_csv(
-                        config.DEFINICAO_CAMPOS_CSV, 
-                        sep=separador, 
-                        encoding='utf-8-sig'
-                    )
-                    if df_definicao.shape[1] <= 1 and separador != ',':
-                        df_definicao = pd.read_csv(
-                            config.DEFINICAO_CAMPOS_CSV, 
-                            sep=",", 
-                            encoding='utf-8-sig'
-                        )
-                except Exception:
-                    df_definicao = pd.read_csv(
-                        config.DEFINICAO_CAMPOS_CSV, 
-                        sep=None, 
-                        engine='python', 
-                        encoding='utf-8-sig'
-                    )
-                
-                nome_campo_col = next((col for col in ['nome_campo', 'NOME_CAMPO'] if col in df_definicao.columns), None)
-                tipo_col = next((col for col in ['tipo_dado_programacao', 'tipo'] if col in df_definicao.columns), 'tipo_dado_programacao')
-                obrigatorio_col = next((col for col in ['obrigatorio_quando_ativo', 'obrigatorio'] if col in df_definicao.columns), 'obrigatorio_quando_ativo')
-
-                if nome_campo_col:
-                    temp_campos_definicao = {}
-                    for _, row in df_definicao.iterrows():
-                        nome_campo_val = row.get(nome_campo_col)
-                        if pd.notna(nome_campo_val):
-                            temp_campos_definicao[str(nome_campo_val)] = {
-                                'tipo': str(row.get(tipo_col, 'texto')).lower(),
-                                'obrigatorio': str(row.get(obrigatorio_col, 'N')).strip().lower() in ['s', 'sim', 'true', '1']
-                            }
-                    self.campos_definicao = temp_campos_definicao
-                    logger.info(f"Definição de campos carregada: {len(self.campos_definicao)} campos")
-                else:
-                    logger.warning(f"Coluna 'nome_campo' (ou 'NOME_CAMPO') não encontrada em {config.DEFINICAO_CAMPOS_CSV}.")
-                    self.campos_definicao = {}
-            else:
-                logger.warning(f"Arquivo de definição de campos não encontrado: {config.DEFINICAO_CAMPOS_CSV}")
-                self.campos_definicao = {}
+            registro = obter_registro_campos()
         except Exception as e:
             logger.error(f"Erro ao carregar definição de campos: {str(e)}", exc_info=True)
             self.campos_definicao = {}
+            return
+        
+        # A obrigatoriedade vem apenas da própria tabela de campos (a das regras depende da ativação)
+        self.campos_definicao = {}
+        for definicao in registro:
+            if definicao.nome_campo is None:
+                continue
+            obrigatorio = definicao.obter('obrigatorio_quando_ativo', definicao.obter('obrigatorio', 'N'))
+            self.campos_definicao[str(definicao.nome_campo)] = {
+                'tipo': str(definicao.tipo_dado_programacao or 'texto').lower(),
+                'obrigatorio': str(obrigatorio).strip().lower() in ['s', 'sim', 'true', '1']
+            }
+        logger.info(f"Definição de campos carregada: {len(self.campos_definicao)} campos")
 
-    def _detectar_separador(self, caminho_arquivo: str, separador: Optional[str] = None) -> str:
+    def _detectar_separador(self, caminho_arquivo: Optional[str], separador: Optional[str] = None,
+                            amostra: Optional[str] = None) -> str:
+        # amostra: início do conteúdo já lido (entrada sem caminho, ex.: stdin); dispensa caminho_arquivo
         if separador is not None:
             return separador
+        amostra_fornecida = amostra is not None
         try:
-            with open(caminho_arquivo, 'r', encoding='utf-8-sig') as f:
-                amostra = f.read(4096)
+            if not amostra_fornecida:
+                with open(caminho_arquivo, 'r', encoding='utf-8-sig') as f:
+                    amostra = f.read(4096)
             sniffer = csv.Sniffer()
             dialect = sniffer.sniff(amostra, delimiters=',;\t|') 
             logger.info(f"Separador detectado pelo Sniffer: '{dialect.delimiter}'")
@@ -92,8 +154,11 @@ class ProcessadorCSV:
         except csv.Error as e:
             logger.warning(f"Sniffer não pôde determinar o delimitador: {str(e)}. Tentando contagem manual.")
             try:
-                with open(caminho_arquivo, 'r', encoding='utf-8-sig') as f:
-                    primeira_linha = f.readline().strip()
+                if amostra_fornecida:
+                    primeira_linha = amostra.split('\n', 1)[0].strip()
+                else:
+                    with open(caminho_arquivo, 'r', encoding='utf-8-sig') as f:
+                        primeira_linha = f.readline().strip()
                 
                 separadores_comuns_str = ';,|\t|' # String de delimitadores para iteração
                 contagem: Dict[str, int] = {sep_cand: primeira_linha.count(sep_cand) for sep_cand in separadores_comuns_str}
@@ -140,68 +205,553 @@ class ProcessadorCSV:
                  return valor_str 
 
         original = valor_str
-        valor_limpo = valor_str.strip()
-        valor_limpo = re.sub(r"[R$\s]", "", valor_limpo) 
+        valor_processado = normalizar_texto_numerico(valor_str)
         
         try:
-            if not valor_limpo: return 0.0 
-            if ',' in valor_limpo and '.' in valor_limpo:
-                if valor_limpo.rfind('.') < valor_limpo.rfind(','): 
-                    valor_processado = valor_limpo.replace('.', '').replace(',', '.')
-                else: 
-                    valor_processado = valor_limpo.replace(',', '')
-            elif ',' in valor_limpo: 
-                valor_processado = valor_limpo.replace(',', '.')
-            else: 
-                valor_processado = valor_limpo
+            if not valor_processado: return 0.0 
             return float(valor_processado)
         except ValueError:
             logger.warning(f"Não foi possível converter '{original}' para float após limpeza e processamento.")
             return original
     
-    def carregar_arquivo(self, caminho_arquivo: Optional[str] = None, separador: Optional[str] = None) -> List[Dict[str, Any]]:
+    def carregar_arquivo(self, caminho_arquivo: Optional[str] = None, separador: Optional[str] = None,
+                         manifesto: Optional[ManifestoCampos] = None) -> List[Mapping[str, Any]]:
+        caminho_arquivo_final = caminho_arquivo or config.ENTREVISTAS_CSV
+        registros_processados = list(self.carregar_em_fluxo(caminho_arquivo_final, separador=separador, manifesto=manifesto))
+        
+        if not registros_processados:
+            logger.warning(f"Arquivo CSV '{caminho_arquivo_final}' está vazio.")
+            return []
+        
+        logger.info(f"Arquivo CSV carregado: {len(registros_processados)} registros com {len(registros_processados[0])} colunas")
+        logger.info(f"Amostra das chaves do primeiro registro processado: {list(registros_processados[0].keys())[:10]}")
+        return registros_processados
+    
+    def carregar_em_fluxo(self, caminho_arquivo: Optional[str] = None, chunksize: Optional[int] = None,
+                          separador: Optional[str] = None,
+                          manifesto: Optional[ManifestoCampos] = None) -> Iterator[Mapping[str, Any]]:
+        """
+        Lê o CSV em blocos de linhas e entrega os registros já convertidos, um a um.
+        
+        Apenas um bloco fica em memória por vez, de modo que o consumo não depende
+        da quantidade de linhas do arquivo e o consumidor pode começar a trabalhar
+        (ex.: renderizar documentos) enquanto o arquivo ainda está sendo lido.
+        
+        Args:
+            caminho_arquivo: Caminho do CSV. Se None, usa config.ENTREVISTAS_CSV.
+            chunksize: Quantidade de linhas lidas por bloco. Se None, usa config.TAMANHO_BLOCO_CSV.
+            separador: Separador de colunas. Se None, é detectado a partir do arquivo.
+            manifesto: Campos necessários para o template. Se informado, apenas essas
+                       colunas são lidas e convertidas (ignorado no modo estrito, que
+                       valida todas as colunas).
+            
+        Yields:
+            Registros convertidos, na ordem do arquivo (visões RegistroLinha do
+            RegistroLote de cada bloco, que se comportam como dicionários somente leitura).
+            
+        Raises:
+            ArquivoNaoEncontradoError: Se o arquivo não existir.
+            FormatoArquivoInvalidoError: Se o arquivo não puder ser lido ou processado.
+        """
         caminho_arquivo_final = caminho_arquivo or config.ENTREVISTAS_CSV
         if not os.path.exists(caminho_arquivo_final):
             logger.error(f"Arquivo CSV não encontrado: {caminho_arquivo_final}")
             raise ArquivoNaoEncontradoError(f"Arquivo CSV não encontrado: {caminho_arquivo_final}")
         
+        tamanho_bloco = chunksize or config.TAMANHO_BLOCO_CSV
+        logger.info(f"Carregando arquivo CSV: {caminho_arquivo_final}")
+        separador_final = self._detectar_separador(caminho_arquivo_final, separador)
+        logger.info(f"Usando separador '{separador_final}' para ler o arquivo CSV (blocos de {tamanho_bloco} linhas)")
+        yield from self._ler_em_fluxo(caminho_arquivo_final, caminho_arquivo_final, separador_final,
+                                      tamanho_bloco, manifesto)
+    
+    def carregar_de_fluxo(self, arquivo: BinaryIO, chunksize: Optional[int] = None,
+                          separador: Optional[str] = None,
+                          manifesto: Optional[ManifestoCampos] = None,
+                          descricao: str = "<stdin>") -> Iterator[Mapping[str, Any]]:
+        """
+        Lê um CSV de um arquivo binário já aberto (ex.: sys.stdin.buffer), como carregar_em_fluxo.
+        
+        Args:
+            arquivo: Arquivo binário aberto. Para detectar o separador, precisa aceitar
+                     peek (io.BufferedReader); informe separador caso contrário.
+            chunksize: Quantidade de linhas lidas por bloco. Se None, usa config.TAMANHO_BLOCO_CSV.
+            separador: Separador de colunas. Se None, é detectado pelo início do conteúdo.
+            manifesto: Campos necessários para o template (ver carregar_em_fluxo).
+            descricao: Nome da fonte, para as mensagens.
+            
+        Yields:
+            Registros convertidos, na ordem do conteúdo.
+            
+        Raises:
+            FormatoArquivoInvalidoError: Se o conteúdo não puder ser lido ou processado.
+        """
+        tamanho_bloco = chunksize or config.TAMANHO_BLOCO_CSV
+        if separador is None:
+            amostra = arquivo.peek(4096)[:4096].decode('utf-8-sig', errors='ignore')
+            separador = self._detectar_separador(None, amostra=amostra)
+        logger.info(f"Lendo CSV de {descricao} com separador '{separador}' (blocos de {tamanho_bloco} linhas)")
+        yield from self._ler_em_fluxo(arquivo, descricao, separador, tamanho_bloco, manifesto)
+    
+    def _ler_em_fluxo(self, fonte: Union[str, BinaryIO], descricao: str, separador: str,
+                      tamanho_bloco: int, manifesto: Optional[ManifestoCampos]) -> Iterator[Mapping[str, Any]]:
+        """
+        Leitura em blocos comum a carregar_em_fluxo e carregar_de_fluxo.
+        """
+        colunas_usadas = None
+        if manifesto is not None:
+            if self.modo_estrito:
+                logger.info("Modo estrito: o manifesto de campos é ignorado e todas as colunas são lidas")
+            else:
+                colunas_usadas = manifesto.filtro_colunas()
+                logger.info(f"Lendo apenas as colunas do manifesto de campos ({len(manifesto)} campos)")
+        
+        total_registros = 0
         try:
-            logger.info(f"Carregando arquivo CSV: {caminho_arquivo_final}")
-            separador_final = self._detectar_separador(caminho_arquivo_final, separador)
-            logger.info(f"Usando separador '{separador_final}' para ler o arquivo CSV")
+            if self._usar_leitor_simples(fonte):
+                # Arquivos pequenos: módulo csv e conversão em Python puro, sem importar pandas e numpy
+                for colunas, linhas in self._ler_blocos_simples(fonte, descricao, separador,
+                                                                tamanho_bloco, colunas_usadas):
+                    registros_convertidos = self._converter_linhas(colunas, linhas, total_registros)
+                    total_registros += len(linhas)
+                    del linhas
+                    yield from registros_convertidos
+            else:
+                import pandas as pd
+                
+                fonte_pandas = self._fonte_pandas(fonte, descricao, separador, colunas_usadas)
+                try:
+                    leitor = pd.read_csv(fonte_pandas, sep=separador, encoding='utf-8-sig', dtype=str,
+                                         keep_default_na=False, na_filter=False, chunksize=tamanho_bloco,
+                                         usecols=colunas_usadas)
+                    with leitor:
+                        for df in leitor:
+                            # Conversão coluna a coluna do bloco, sem materializar o arquivo inteiro
+                            registros_convertidos = self._converter_bloco(df, total_registros)
+                            total_registros += len(df)
+                            del df
+                            yield from registros_convertidos
+                finally:
+                    if fonte_pandas is not fonte:
+                        fonte_pandas.close()
+        except (ArquivoNaoEncontradoError, FormatoArquivoInvalidoError):
+            raise
+        except Exception as e:
+            logger.error(f"Erro crítico ao carregar ou processar CSV '{descricao}': {str(e)}", exc_info=True)
+            raise FormatoArquivoInvalidoError(f"Erro ao processar CSV: {str(e)}")
+        
+        logger.info(f"Leitura em fluxo do CSV concluída: {total_registros} registros")
+    
+    def _usar_leitor_simples(self, fonte: Union[str, BinaryIO]) -> bool:
+        """
+        Decide se a leitura em fluxo usa o módulo csv (src/leitor_csv_simples.py) em vez do pandas:
+        sempre com o carregador "csv"; no modo "auto", apenas para arquivos de até
+        config.LIMITE_CARREGADOR_SIMPLES_CSV bytes (fluxos de tamanho desconhecido usam o pandas).
+        """
+        if self.carregador != 'auto':
+            return self.carregador == 'csv'
+        return isinstance(fonte, str) and os.path.getsize(fonte) <= config.LIMITE_CARREGADOR_SIMPLES_CSV
+    
+    @staticmethod
+    def _fonte_pandas(fonte: Union[str, BinaryIO], descricao: str, separador: str,
+                      colunas_usadas: Optional[Any]) -> Union[str, BinaryIO]:
+        """
+        Fonte entregue ao pandas.read_csv. Com projeção de colunas (usecols), o pandas
+        descarta campos excedentes sem erro: a fonte passa a conferir a largura de cada
+        linha (src/largura_csv.py), para rejeitar as mesmas linhas que a leitura completa.
+        """
+        if colunas_usadas is None:
+            return fonte
+        from src.largura_csv import FluxoLarguraVerificada, VerificadorLarguraCSV
+        
+        verificador = VerificadorLarguraCSV(separador, descricao)
+        if isinstance(fonte, str):
+            return io.BufferedReader(FluxoLarguraVerificada(open(fonte, 'rb'), verificador, fechar_fonte=True))
+        return io.BufferedReader(FluxoLarguraVerificada(fonte, verificador))
+    
+    @staticmethod
+    def _ler_blocos_simples(fonte: Union[str, BinaryIO], descricao: str, separador: str, tamanho_bloco: int,
+                            filtro_colunas: Optional[Any]) -> Iterator[Tuple[List[str], List[List[str]]]]:
+        """
+        Blocos de linhas (todas as células como texto) lidos com o módulo csv.
+        """
+        if isinstance(fonte, str):
+            with open(fonte, 'r', encoding='utf-8-sig', newline='') as arquivo:
+                yield from iterar_blocos_csv(arquivo, separador, tamanho_bloco, filtro_colunas, descricao)
+            return
+        
+        # Fluxo binário já aberto (ex.: sys.stdin.buffer): desacoplado ao final, sem fechá-lo
+        arquivo_texto = io.TextIOWrapper(fonte, encoding='utf-8-sig', newline='')
+        try:
+            yield from iterar_blocos_csv(arquivo_texto, separador, tamanho_bloco, filtro_colunas, descricao)
+        finally:
+            arquivo_texto.detach()
+    
+    def carregar_em_paralelo(self, caminho_arquivo: Optional[str] = None, workers: Optional[int] = None,
+                             tamanho_faixa: Optional[int] = None, separador: Optional[str] = None,
+                             manifesto: Optional[ManifestoCampos] = None,
+                             debug: bool = False) -> Iterator[Mapping[str, Any]]:
+        """
+        Lê o CSV dividindo-o em faixas de linhas convertidas em vários processos.
+        
+        Entrega os mesmos registros, na mesma ordem, que carregar_em_fluxo; indicado
+        para exportações de vários GB, em que a leitura de um único processo limita
+        o início da renderização.
+        
+        Args:
+            caminho_arquivo: Caminho do CSV. Se None, usa config.ENTREVISTAS_CSV.
+            workers: Quantidade de processos. Se None, usa a quantidade de CPUs.
+            tamanho_faixa: Bytes por faixa. Se None, usa config.TAMANHO_FAIXA_CSV_PARALELO.
+            separador: Separador de colunas. Se None, é detectado a partir do arquivo.
+            manifesto: Campos necessários para o template (ver carregar_em_fluxo).
+            debug: Ativa logs de depuração nos processos.
             
-            df = pd.read_csv(caminho_arquivo_final, sep=separador_final, encoding='utf-8-sig', dtype=str, keep_default_na=False, na_filter=False)
+        Yields:
+            Registros convertidos, na ordem do arquivo.
             
-            if df.empty:
-                logger.warning(f"Arquivo CSV '{caminho_arquivo_final}' está vazio.")
-                return []
+        Raises:
+            ArquivoNaoEncontradoError: Se o arquivo não existir.
+            FormatoArquivoInvalidoError: Se o arquivo não puder ser lido ou processado.
+        """
+        from src.leitor_csv_paralelo import ler_csv_em_paralelo
+        
+        caminho_arquivo_final = caminho_arquivo or config.ENTREVISTAS_CSV
+        if not os.path.exists(caminho_arquivo_final):
+            logger.error(f"Arquivo CSV não encontrado: {caminho_arquivo_final}")
+            raise ArquivoNaoEncontradoError(f"Arquivo CSV não encontrado: {caminho_arquivo_final}")
+        
+        separador_final = self._detectar_separador(caminho_arquivo_final, separador)
+        logger.info(f"Usando separador '{separador_final}' para ler o arquivo CSV em paralelo")
+        if manifesto is not None and self.modo_estrito:
+            logger.info("Modo estrito: o manifesto de campos é ignorado e todas as colunas são lidas")
+            manifesto = None
+        
+        try:
+            yield from ler_csv_em_paralelo(
+                self, caminho_arquivo_final, separador_final,
+                workers=workers or os.cpu_count() or 1,
+                tamanho_faixa=tamanho_faixa or config.TAMANHO_FAIXA_CSV_PARALELO,
+                manifesto=manifesto,
+                debug=debug
+            )
+        except (ArquivoNaoEncontradoError, FormatoArquivoInvalidoError):
+            raise
+        except Exception as e:
+            logger.error(f"Erro crítico ao carregar ou processar CSV '{caminho_arquivo_final}': {str(e)}", exc_info=True)
+            raise FormatoArquivoInvalidoError(f"Erro ao processar CSV: {str(e)}")
+    
+    def carregar_xlsx(self, caminho_arquivo: str, planilha: Optional[str] = None,
+                      chunksize: Optional[int] = None,
+                      manifesto: Optional[ManifestoCampos] = None) -> Iterator[Mapping[str, Any]]:
+        """
+        Lê uma planilha XLSX em fluxo e entrega os registros com a mesma conversão
+        de tipos da leitura de CSV (a primeira linha preenchida é o cabeçalho).
+        
+        Args:
+            caminho_arquivo: Caminho do arquivo XLSX.
+            planilha: Nome da planilha. Se None, usa a primeira.
+            chunksize: Quantidade de linhas convertidas por bloco. Se None, usa config.TAMANHO_BLOCO_CSV.
+            manifesto: Campos necessários para o template (ver carregar_em_fluxo).
             
-            logger.info(f"Arquivo CSV carregado: {len(df)} registros com {df.shape[1]} colunas")
+        Yields:
+            Registros convertidos, na ordem da planilha.
             
-            # CORREÇÃO de tipo para a chamada de _processar_registros
-            # df.to_dict(orient='records') retorna List[Dict[str, Any]] porque os valores são mistos inicialmente.
-            # Mas como lemos com dtype=str, os valores serão strings.
-            # O Pylance pode inferir Any para os valores se não for explícito.
-            # Vamos garantir que as chaves são strings.
-            registros_lidos: List[Dict[str, str]] = []
-            for record in df.to_dict(orient='records'):
-                registros_lidos.append({str(k): str(v) for k, v in record.items()})
-
-            registros_processados = self._processar_registros(registros_lidos) # <--- Linha 177
+        Raises:
+            ArquivoNaoEncontradoError: Se o arquivo não existir.
+            FormatoArquivoInvalidoError: Se o arquivo não puder ser lido ou processado.
+        """
+        from src.leitor_xlsx import ler_blocos_xlsx
+        
+        if not os.path.exists(caminho_arquivo):
+            logger.error(f"Arquivo XLSX não encontrado: {caminho_arquivo}")
+            raise ArquivoNaoEncontradoError(f"Arquivo XLSX não encontrado: {caminho_arquivo}")
+        
+        filtro_colunas = None
+        if manifesto is not None:
+            if self.modo_estrito:
+                logger.info("Modo estrito: o manifesto de campos é ignorado e todas as colunas são lidas")
+            else:
+                filtro_colunas = manifesto.filtro_colunas()
+        
+        total_registros = 0
+        try:
+            for colunas, linhas in ler_blocos_xlsx(caminho_arquivo, chunksize or config.TAMANHO_BLOCO_CSV,
+                                                   planilha, filtro_colunas):
+                registros_convertidos = self._converter_linhas(colunas, linhas, total_registros)
+                total_registros += len(linhas)
+                del linhas
+                yield from registros_convertidos
+        except (ArquivoNaoEncontradoError, FormatoArquivoInvalidoError, DadosInvalidosError):
+            raise
+        except Exception as e:
+            logger.error(f"Erro crítico ao carregar ou processar XLSX '{caminho_arquivo}': {str(e)}", exc_info=True)
+            raise FormatoArquivoInvalidoError(f"Erro ao processar XLSX: {str(e)}")
+        
+        logger.info(f"Leitura em fluxo do XLSX concluída: {total_registros} registros")
+    
+    def carregar_intervalo(self, caminho_arquivo: Optional[str] = None, primeiro: int = 0,
+                           ultimo: Optional[int] = None, chunksize: Optional[int] = None,
+                           separador: Optional[str] = None,
+                           manifesto: Optional[ManifestoCampos] = None,
+                           persistir_indice: Optional[bool] = None) -> Iterator[Mapping[str, Any]]:
+        """
+        Lê apenas os registros primeiro..ultimo do CSV, posicionando a leitura
+        diretamente nas linhas pelo índice de linhas ("<csv>.idx").
+        
+        Os registros e as mensagens (numeração dos registros) são os mesmos da
+        leitura do arquivo inteiro com carregar_em_fluxo.
+        
+        Args:
+            caminho_arquivo: Caminho do CSV. Se None, usa config.ENTREVISTAS_CSV.
+            primeiro: Posição (0-based) do primeiro registro.
+            ultimo: Posição (0-based, inclusive) do último registro. Se None, vai até o fim do arquivo.
+            chunksize: Quantidade de linhas lidas por bloco. Se None, usa config.TAMANHO_BLOCO_CSV.
+            separador: Separador de colunas. Se None, é detectado a partir do arquivo.
+            manifesto: Campos necessários para o template (ver carregar_em_fluxo).
+            persistir_indice: Se True, grava o índice construído ao lado do CSV.
+                              Se None, usa config.PERSISTIR_INDICE_CSV.
             
-            if registros_processados:
-                 logger.info(f"Amostra das chaves do primeiro registro processado: {list(registros_processados[0].keys())[:10]}")
-            return registros_processados
+        Yields:
+            Registros convertidos, na ordem do arquivo.
+            
+        Raises:
+            ArquivoNaoEncontradoError: Se o arquivo não existir.
+            DadosInvalidosError: Se o intervalo estiver fora do arquivo.
+            FormatoArquivoInvalidoError: Se o arquivo não puder ser lido ou processado.
+        """
+        from src.indice_linhas_csv import obter_indice
+        from src.leitor_csv_paralelo import ler_faixa
+        
+        caminho_arquivo_final = caminho_arquivo or config.ENTREVISTAS_CSV
+        if not os.path.exists(caminho_arquivo_final):
+            logger.error(f"Arquivo CSV não encontrado: {caminho_arquivo_final}")
+            raise ArquivoNaoEncontradoError(f"Arquivo CSV não encontrado: {caminho_arquivo_final}")
+        
+        separador_final = self._detectar_separador(caminho_arquivo_final, separador)
+        if persistir_indice is None:
+            persistir_indice = config.PERSISTIR_INDICE_CSV
+        indice = obter_indice(caminho_arquivo_final, separador_final, persistir=persistir_indice)
+        ultimo_final = indice.total_registros - 1 if ultimo is None else ultimo
+        if not 0 <= primeiro <= ultimo_final < indice.total_registros:
+            raise DadosInvalidosError(
+                f"Registros {primeiro + 1}-{ultimo_final + 1} fora do arquivo CSV "
+                f"'{caminho_arquivo_final}' ({indice.total_registros} registros)")
+        
+        tamanho_bloco = chunksize or config.TAMANHO_BLOCO_CSV
+        logger.info(f"Lendo os registros {primeiro + 1}-{ultimo_final + 1} de {caminho_arquivo_final} "
+                    f"(separador '{separador_final}')")
+        if manifesto is not None and self.modo_estrito:
+            logger.info("Modo estrito: o manifesto de campos é ignorado e todas as colunas são lidas")
+            manifesto = None
+        
+        try:
+            cabecalho = indice.ler_cabecalho()
+            for inicio_bloco in range(primeiro, ultimo_final + 1, tamanho_bloco):
+                fim_bloco = min(inicio_bloco + tamanho_bloco, ultimo_final + 1) - 1
+                inicio_bytes, fim_bytes = indice.faixa_bytes(inicio_bloco, fim_bloco)
+                df = ler_faixa(caminho_arquivo_final, inicio_bytes, fim_bytes, cabecalho, separador_final, manifesto)
+                registros_convertidos = self._converter_bloco(df, inicio_bloco)
+                del df
+                yield from registros_convertidos
+        except (ArquivoNaoEncontradoError, FormatoArquivoInvalidoError, DadosInvalidosError):
+            raise
         except Exception as e:
             logger.error(f"Erro crítico ao carregar ou processar CSV '{caminho_arquivo_final}': {str(e)}", exc_info=True)
             raise FormatoArquivoInvalidoError(f"Erro ao processar CSV: {str(e)}")
     
+    def _converter_bloco(self, df: 'pd.DataFrame', indice_inicial: int = 0) -> RegistroLote:
+        """
+        Converte um bloco do CSV (lido com dtype=str) coluna a coluna, segundo o
+        tipo de cada campo em campos_definicao.
+        
+        Produz os mesmos registros de _processar_registros: cada coluna é
+        fatorada em valores distintos, que são convertidos uma única vez e
+        espalhados de volta às linhas; apenas as células que não puderam ser
+        convertidas (ou obrigatórias vazias) passam pela conversão individual, na
+        ordem das linhas, com as mesmas mensagens e o mesmo comportamento no
+        modo estrito.
+        
+        Args:
+            df: Bloco do CSV, com todas as colunas como texto.
+            indice_inicial: Posição (0-based) da primeira linha do bloco no arquivo.
+            
+        Returns:
+            RegistroLote com os registros convertidos, na ordem das linhas.
+        """
+        registros, pendentes = self._converter_colunas(df)
+        self._aplicar_conversao_individual(registros, pendentes, indice_inicial)
+        return registros
+    
+    def _converter_colunas(self, df: 'pd.DataFrame') -> Tuple[RegistroLote, List[Tuple[int, int, str, str]]]:
+        """
+        Etapa vetorizada de _converter_bloco: converte as colunas e lista as células
+        que ficam para a conversão individual, sem registrar mensagens.
+        
+        Args:
+            df: Bloco do CSV, com todas as colunas como texto.
+            
+        Returns:
+            Tupla (RegistroLote, pendentes), com pendentes em ordem de linha e
+            coluna como (linha, posição da coluna, nome do campo, valor limpo).
+        """
+        import numpy as np
+        import pandas as pd
+        
+        chaves = [str(coluna).strip() for coluna in df.columns]
+        colunas_convertidas: List[List[Any]] = []
+        pendentes: List[Tuple[int, int, str, str]] = []
+        
+        for posicao, chave in enumerate(chaves):
+            codigos, unicos = pd.factorize(df.iloc[:, posicao].to_numpy(dtype=object), use_na_sentinel=False)
+            limpos = [self._limpar_celula(valor) for valor in unicos]
+            convertidos, falhas = self._converter_valores_distintos(chave, limpos)
+            
+            # Valores distintos -> linhas (indexação numpy pelos códigos da fatoração)
+            tabela = np.empty(len(convertidos), dtype=object)
+            tabela[:] = convertidos
+            colunas_convertidas.append(tabela[codigos].tolist())
+            if any(falhas):
+                linhas_com_falha = np.flatnonzero(np.asarray(falhas, dtype=bool)[codigos])
+                pendentes.extend((linha, posicao, chave, limpos[codigos[linha]]) for linha in linhas_com_falha.tolist())
+        
+        pendentes.sort(key=lambda pendente: (pendente[0], pendente[1]))
+        return RegistroLote(chaves, colunas_convertidas, len(df)), pendentes
+    
+    def _converter_linhas(self, colunas: List[str], linhas: List[List[Any]], indice_inicial: int = 0) -> RegistroLote:
+        """
+        Equivalente de _converter_bloco para linhas em listas (leitura com o módulo csv
+        e planilhas XLSX), sem pandas e numpy: a fatoração em valores distintos é
+        feita com um dicionário por coluna.
+        
+        Args:
+            colunas: Nomes das colunas.
+            linhas: Valores de cada linha, na ordem das colunas.
+            indice_inicial: Posição (0-based) da primeira linha do bloco no arquivo.
+            
+        Returns:
+            RegistroLote com os registros convertidos, na ordem das linhas.
+        """
+        chaves = [str(coluna).strip() for coluna in colunas]
+        colunas_convertidas: List[List[Any]] = []
+        pendentes: List[Tuple[int, int, str, str]] = []
+        
+        for posicao, chave in enumerate(chaves):
+            codigos_por_valor: Dict[Any, int] = {}
+            codigos = [codigos_por_valor.setdefault(linha[posicao], len(codigos_por_valor)) for linha in linhas]
+            limpos = [self._limpar_celula(valor) for valor in codigos_por_valor]
+            convertidos, falhas = self._converter_valores_distintos(chave, limpos)
+            
+            colunas_convertidas.append([convertidos[codigo] for codigo in codigos])
+            if any(falhas):
+                pendentes.extend((linha, posicao, chave, limpos[codigo])
+                                 for linha, codigo in enumerate(codigos) if falhas[codigo])
+        
+        pendentes.sort(key=lambda pendente: (pendente[0], pendente[1]))
+        registros = RegistroLote(chaves, colunas_convertidas, len(linhas))
+        self._aplicar_conversao_individual(registros, pendentes, indice_inicial)
+        return registros
+    
+    def _aplicar_conversao_individual(self, registros: RegistroLote,
+                                      pendentes: List[Tuple[int, int, str, str]],
+                                      indice_inicial: int) -> None:
+        """
+        Converte as células pendentes com _validar_e_converter_valor_individual,
+        na ordem das linhas, gravando o resultado na coluna do lote.
+        
+        Args:
+            registros: Lote produzido por _converter_colunas.
+            pendentes: Células pendentes (linha, posição da coluna, nome do campo, valor limpo).
+            indice_inicial: Posição (0-based) da primeira linha do lote no arquivo.
+            
+        Raises:
+            DadosInvalidosError: No modo estrito, no primeiro valor inválido.
+        """
+        for linha, posicao, chave, valor_limpo in pendentes:
+            num_registro = indice_inicial + linha
+            try:
+                valor = self._validar_e_converter_valor_individual(chave, valor_limpo, num_registro)
+            except DadosInvalidosError as die:
+                logger.warning(f"Erro de dados inválidos no registro {num_registro+1}: {str(die)}. Modo estrito: {self.modo_estrito}")
+                raise
+            registros.colunas[posicao][linha] = valor
+    
+    @staticmethod
+    def _limpar_celula(valor: Any) -> str:
+        """
+        Limpeza de _processar_registros: remove espaços e trata nulos textuais como vazio.
+        """
+        if valor is None:
+            return ""
+        texto = str(valor).strip()
+        return "" if texto.lower() in VALORES_NULOS else texto
+    
+    def _converter_valores_distintos(self, chave: str, valores: List[str]) -> Tuple[List[Any], List[bool]]:
+        """
+        Converte os valores distintos (já limpos) de uma coluna para o tipo do campo.
+        
+        Args:
+            chave: Nome do campo.
+            valores: Valores distintos da coluna ("" para célula vazia).
+            
+        Returns:
+            Tupla (valores convertidos, indicação dos valores que precisam da conversão individual).
+        """
+        definicao = self.campos_definicao.get(chave)
+        tipo_esperado = 'texto'
+        obrigatorio = False
+        if definicao:
+            tipo_esperado = definicao.get('tipo', 'texto').lower()
+            obrigatorio = definicao.get('obrigatorio', False)
+        
+        if tipo_esperado in TIPOS_INTEIROS or tipo_esperado in TIPOS_DECIMAIS:
+            numeros = [_texto_para_float(valor) if valor else 0.0 for valor in valores]
+            falhas = [numero != numero for numero in numeros]
+            if tipo_esperado in TIPOS_INTEIROS:
+                convertidos = [0 if falha else int(numero) for numero, falha in zip(numeros, falhas)]
+            else:
+                convertidos = numeros
+        elif tipo_esperado in TIPOS_DATA:
+            formatos = self._inferir_formatos_data(valores)
+            convertidos = [_formatar_data_texto(valor, formatos) if valor else None for valor in valores]
+            falhas = [bool(valor) and data is None for valor, data in zip(valores, convertidos)]
+        elif tipo_esperado in TIPOS_BOOLEANOS:
+            convertidos = [valor.lower() in VALORES_VERDADEIROS if valor else "" for valor in valores]
+            falhas = [False] * len(valores)
+        else:
+            convertidos = list(valores)
+            falhas = [False] * len(valores)
+        
+        if obrigatorio:
+            # Obrigatórios vazios geram aviso (ou erro no modo estrito) na conversão individual
+            falhas = [falha or not valor for valor, falha in zip(valores, falhas)]
+        return convertidos, falhas
+    
+    @staticmethod
+    def _inferir_formatos_data(valores: List[str]) -> Tuple[str, ...]:
+        """
+        Infere o formato de data da coluna pelo primeiro valor preenchido.
+        
+        Retorna os formatos de FORMATOS_DATA até o inferido (inclusive), para que
+        cada valor continue sendo reconhecido pelo primeiro formato que serve, como
+        na conversão individual; valores que não se encaixam ficam para ela.
+        """
+        for valor in valores:
+            if valor:
+                for posicao, formato in enumerate(FORMATOS_DATA):
+                    try:
+                        datetime.strptime(valor, formato)
+                        return FORMATOS_DATA[:posicao + 1]
+                    except ValueError:
+                        continue
+                break
+        return FORMATOS_DATA[:1]
+    
     # Assinatura de _processar_registros já espera List[Dict[str, str]]
     # e retorna List[Dict[str, Any]], o que está correto.
-    def _processar_registros(self, registros: List[Dict[str, str]]) -> List[Dict[str, Any]]:
-        # ... (código como na sua última versão) ...
+    def _processar_registros(self, registros: List[Dict[str, str]], indice_inicial: int = 0) -> List[Dict[str, Any]]:
+        # indice_inicial: posição (0-based) do primeiro registro no arquivo, para as mensagens de erro
         resultados = []
-        for i, registro_linha_str in enumerate(registros):
+        for i, registro_linha_str in enumerate(registros, start=indice_inicial):
             registro_convertido_atual: Dict[str, Any] = {}
             try:
                 for chave_original, valor_original_str in registro_linha_str.items():
@@ -210,7 +760,7 @@ class ProcessadorCSV:
                     valor_str_processar = "" 
                     if valor_original_str is not None:
                         temp_val = str(valor_original_str).strip()
-                        if temp_val.lower() not in ['nan', 'none', '<na>']: 
+                        if temp_val.lower() not in VALORES_NULOS: 
                             valor_str_processar = temp_val
                     
                     registro_convertido_atual[chave_campo] = self._validar_e_converter_valor_individual(chave_campo, valor_str_processar, i)
@@ -244,25 +794,25 @@ class ProcessadorCSV:
                 if self.modo_estrito: raise DadosInvalidosError(msg_erro_obr)
                 logger.warning(msg_erro_obr) 
             
-            if tipo_esperado in ['int', 'inteiro', 'integer']: return 0
-            if tipo_esperado in ['float', 'decimal', 'numero', 'number', 'moeda', 'dinheiro']: return 0.0
-            if tipo_esperado in ['data', 'date']: return None
+            if tipo_esperado in TIPOS_INTEIROS: return 0
+            if tipo_esperado in TIPOS_DECIMAIS: return 0.0
+            if tipo_esperado in TIPOS_DATA: return None
             return "" 
 
         try:
-            if tipo_esperado in ['int', 'inteiro', 'integer']:
+            if tipo_esperado in TIPOS_INTEIROS:
                 val_float = self.limpar_e_converter_float(valor_str_limpo)
                 if isinstance(val_float, (int, float)): return int(val_float)
                 raise ValueError("Valor não pôde ser convertido para numérico antes de int.")
-            elif tipo_esperado in ['float', 'decimal', 'numero', 'number', 'moeda', 'dinheiro']:
+            elif tipo_esperado in TIPOS_DECIMAIS:
                 return self.limpar_e_converter_float(valor_str_limpo)
-            elif tipo_esperado in ['data', 'date']:
-                for fmt in ('%d/%m/%Y', '%Y-%m-%d', '%d-%m-%Y', '%Y/%m/%d', '%d.%m.%Y', '%m/%d/%Y', '%d%m%Y'):
+            elif tipo_esperado in TIPOS_DATA:
+                for fmt in FORMATOS_DATA:
                     try: return datetime.strptime(valor_str_limpo, fmt).strftime('%d/%m/%Y')
                     except ValueError: continue
                 raise ValueError(f"Formato de data '{valor_str_limpo}' não reconhecido para campo '{chave}'.")
-            elif tipo_esperado in ['bool', 'booleano', 'logico']:
-                return valor_str_limpo.lower() in ['sim', 'true', '1', 's', 'yes', 'verdadeiro', 'v']
+            elif tipo_esperado in TIPOS_BOOLEANOS:
+                return valor_str_limpo.lower() in VALORES_VERDADEIROS
             else:  
                 return str(valor_str_limpo)
         except ValueError as e: 
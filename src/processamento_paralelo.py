@@ -0,0 +1,159 @@
+"""
+Processamento paralelo de lotes de registros.
+
+Os registros são divididos em blocos e distribuídos entre processos de um
+ProcessPoolExecutor. Cada processo carrega uma única vez, no inicializador,
+o MotorRegras (com as regras e o modelo relacional), o processador de
+documentos e o template já analisado; depois apenas recebe blocos de
+registros e devolve os resultados.
+
+Os resultados são entregues na ordem dos registros, com a mesma numeração
+do processamento serial, e no máximo alguns blocos por processo ficam em
+trânsito ao mesmo tempo, de modo que a memória não cresce com o lote.
+"""
+
+import os
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from itertools import islice
+from typing import Any, Deque, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from src.logger import logger, configurar_logger
+
+# Blocos em trânsito por processo (um em execução e outro na fila)
+_BLOCOS_POR_WORKER = 2
+
+# Estado de cada processo worker, preenchido pelo inicializador
+_processador_worker: Optional[Any] = None
+_template_worker: Optional[str] = None
+_padrao_saida_worker: Optional[str] = None
+_em_memoria_worker: bool = False
+
+
+def _classe_processador(backend: str):
+    """
+    Retorna a classe de processador de documentos do backend ("docx" ou "xml").
+    """
+    if backend == 'xml':
+        from src.documento_processor_xml import DocumentoProcessorXML
+        return DocumentoProcessorXML
+    from src.documento_processor import DocumentoProcessor
+    return DocumentoProcessor
+
+
+def _inicializar_worker(template_path: str, padrao_saida: str, backend: str, debug: bool,
+                        em_memoria: bool = False) -> None:
+    """
+    Inicializador de cada processo: carrega regras, modelo relacional,
+    formatadores e template uma única vez.
+    """
+    global _processador_worker, _template_worker, _padrao_saida_worker, _em_memoria_worker
+
+    configurar_logger(debug)
+
+    from src.motor_regras import MotorRegras
+    from src.cache_templates import obter_template
+
+    motor_regras = MotorRegras(usar_modelo_relacional=True)
+    motor_regras.carregar_regras()
+
+    # O construtor do processador compila a tabela de formatadores (carrega o modelo relacional)
+    _processador_worker = _classe_processador(backend)(motor_regras=motor_regras)
+    _template_worker = template_path
+    _padrao_saida_worker = padrao_saida
+    _em_memoria_worker = em_memoria
+
+    if backend == 'xml':
+        from src.documento_processor_xml import obter_template_xml
+        if obter_template_xml(template_path).total_marcadores_secao:
+            obter_template(template_path)
+    else:
+        obter_template(template_path)
+
+    logger.debug(f"Worker {os.getpid()} inicializado (backend {backend})")
+
+
+def _processar_bloco(indice_inicial: int, registros: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Processa um bloco de registros no processo worker.
+
+    Args:
+        indice_inicial: Número do primeiro registro do bloco no lote.
+        registros: Registros do bloco.
+
+    Returns:
+        Resultados de processar_lote de cada registro, na ordem do bloco.
+    """
+    return list(_processador_worker.processar_lote(
+        _template_worker, registros, _padrao_saida_worker, indice_inicial=indice_inicial,
+        em_memoria=_em_memoria_worker
+    ))
+
+
+def _dividir_em_blocos(registros_iteravel: Iterable[Dict[str, Any]],
+                       tamanho_bloco: int,
+                       indice_inicial: int = 1) -> Iterator[Tuple[int, List[Dict[str, Any]]]]:
+    """
+    Divide os registros em blocos (número do primeiro registro, registros do bloco).
+    """
+    iterador = iter(registros_iteravel)
+    while True:
+        bloco = list(islice(iterador, tamanho_bloco))
+        if not bloco:
+            return
+        yield indice_inicial, bloco
+        indice_inicial += len(bloco)
+
+
+def processar_lote_paralelo(template_path: str,
+                            registros_iteravel: Iterable[Dict[str, Any]],
+                            padrao_saida: str,
+                            workers: int,
+                            backend: str = 'docx',
+                            tamanho_bloco: int = 32,
+                            indice_inicial: int = 1,
+                            em_memoria: bool = False,
+                            debug: bool = False) -> Iterator[Dict[str, Any]]:
+    """
+    Processa os registros em vários processos, entregando os resultados em ordem.
+
+    Equivale a DocumentoProcessor.processar_lote: mesmos caminhos de saída
+    (padrao_saida com "{indice}") e mesmos resultados por registro.
+
+    Args:
+        template_path: Caminho para o arquivo de template DOCX.
+        registros_iteravel: Registros de dados (consumidos à medida que há processos livres).
+        padrao_saida: Caminho de saída de cada documento; "{indice}" é substituído
+                      pelo número do registro (a partir de indice_inicial).
+        workers: Quantidade de processos.
+        backend: Backend de renderização ("docx" ou "xml").
+        tamanho_bloco: Quantidade de registros enviados a um processo por vez.
+        indice_inicial: Número do primeiro registro (usado nos caminhos de saída).
+        em_memoria: Se True, os documentos voltam dos processos como bytes ('conteudo'),
+                    sem gravação em disco (ver DocumentoProcessor.processar_lote).
+        debug: Ativa logs de depuração nos processos.
+
+    Yields:
+        Dicionário com 'indice', 'caminho', 'secoes_ativas' e 'estatisticas' de cada registro.
+    """
+    blocos = _dividir_em_blocos(registros_iteravel, max(1, tamanho_bloco), indice_inicial)
+    limite_em_transito = max(1, workers) * _BLOCOS_POR_WORKER
+    em_transito: Deque[Future] = deque()
+
+    logger.info(f"Processamento paralelo: {workers} processo(s), blocos de {tamanho_bloco} registro(s)")
+
+    with ProcessPoolExecutor(max_workers=workers,
+                             initializer=_inicializar_worker,
+                             initargs=(template_path, padrao_saida, backend, debug, em_memoria)) as executor:
+        try:
+            for inicio_bloco, bloco in blocos:
+                em_transito.append(executor.submit(_processar_bloco, inicio_bloco, bloco))
+                if len(em_transito) >= limite_em_transito:
+                    yield from em_transito.popleft().result()
+
+            while em_transito:
+                yield from em_transito.popleft().result()
+        finally:
+            # Em caso de erro (ou gerador abandonado), descarta os blocos ainda não iniciados
+            for futuro in em_transito:
+                futuro.cancel()
@@ -0,0 +1,107 @@
+"""
+Registros de dados em formato colunar.
+
+Um RegistroLote guarda os valores de um bloco de registros por coluna, com um
+único índice nome do campo -> coluna compartilhado por todas as linhas (nomes
+internados com sys.intern). Cada registro é uma visão leve (RegistroLinha,
+com __slots__) que implementa a interface Mapping consumida por
+DocumentoProcessor, MotorRegras e AvaliadorCondicoes, sem criar um
+dicionário de centenas de chaves por linha.
+"""
+
+import sys
+from collections.abc import Mapping
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Union
+
+
+class RegistroLote:
+    """
+    Bloco de registros armazenado por coluna.
+    """
+
+    __slots__ = ('chaves', 'indice_chaves', 'colunas', 'total_linhas')
+
+    def __init__(self, chaves: Sequence[str], colunas: List[List[Any]], total_linhas: Optional[int] = None):
+        """
+        Args:
+            chaves: Nome do campo de cada coluna. Com nomes repetidos, vale a
+                    última coluna (como em dict(zip(chaves, linha))).
+            colunas: Valores de cada coluna, todas com o mesmo tamanho.
+            total_linhas: Quantidade de linhas (necessária apenas se não há colunas).
+        """
+        indice_chaves: Dict[str, int] = {}
+        for posicao, chave in enumerate(chaves):
+            indice_chaves[sys.intern(chave)] = posicao
+        self.indice_chaves = indice_chaves
+        self.chaves = tuple(indice_chaves)
+        self.colunas = colunas
+        self.total_linhas = len(colunas[0]) if colunas else (total_linhas or 0)
+
+    def __len__(self) -> int:
+        return self.total_linhas
+
+    def __getitem__(self, linha: Union[int, slice]) -> Union['RegistroLinha', List['RegistroLinha']]:
+        if isinstance(linha, slice):
+            return [RegistroLinha(self, i) for i in range(*linha.indices(self.total_linhas))]
+        if linha < 0:
+            linha += self.total_linhas
+        if not 0 <= linha < self.total_linhas:
+            raise IndexError(f"Registro {linha} fora do lote ({self.total_linhas} registros)")
+        return RegistroLinha(self, linha)
+
+    def __iter__(self) -> Iterator['RegistroLinha']:
+        for linha in range(self.total_linhas):
+            yield RegistroLinha(self, linha)
+
+    def __repr__(self) -> str:
+        return f"RegistroLote({self.total_linhas} registros, {len(self.chaves)} campos)"
+
+
+class RegistroLinha(Mapping):
+    """
+    Visão de uma linha de um RegistroLote como mapeamento nome do campo -> valor.
+
+    É somente leitura; copy() devolve um dicionário independente. Ao ser
+    serializada (pickle, ex.: envio a outro processo), é convertida em dicionário,
+    para não levar o bloco inteiro junto.
+    """
+
+    __slots__ = ('_lote', '_linha')
+
+    def __init__(self, lote: RegistroLote, linha: int):
+        self._lote = lote
+        self._linha = linha
+
+    def __getitem__(self, chave: str) -> Any:
+        lote = self._lote
+        return lote.colunas[lote.indice_chaves[chave]][self._linha]
+
+    def get(self, chave: str, padrao: Any = None) -> Any:
+        lote = self._lote
+        posicao = lote.indice_chaves.get(chave)
+        if posicao is None:
+            return padrao
+        return lote.colunas[posicao][self._linha]
+
+    def __contains__(self, chave: object) -> bool:
+        return chave in self._lote.indice_chaves
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._lote.chaves)
+
+    def __len__(self) -> int:
+        return len(self._lote.chaves)
+
+    def copy(self) -> Dict[str, Any]:
+        """
+        Copia o registro para um dicionário.
+        """
+        lote = self._lote
+        linha = self._linha
+        return {chave: lote.colunas[posicao][linha] for chave, posicao in lote.indice_chaves.items()}
+
+    def __reduce__(self):
+        return (dict, (self.copy(),))
+
+    def __repr__(self) -> str:
+        return f"RegistroLinha({self.copy()!r})"
@@ -0,0 +1,134 @@
+"""
+Snapshot compilado do modelo relacional de campos.
+
+Carregar o modelo a partir dos CSVs de data/campos_definicao/ custa a
+leitura das cinco tabelas com o pandas, a validação e a associação por
+campo, em todo processo (cada execução da linha de comando e cada worker).
+O snapshot guarda o resultado dessa carga (as linhas das tabelas e o
+RegistroCampos já associado) em um único arquivo pickle, gravado ao lado
+dos CSVs (config.SNAPSHOT_MODELO_CAMPOS) e lido em poucos milissegundos.
+
+O snapshot é invalidado quando algum CSV muda: tamanho e mtime iguais aos
+registrados dispensam a leitura dos arquivos; se diferirem (ex.: arquivos
+tocados por um checkout), o conteúdo é conferido pelo hash SHA-256. Uma
+mudança no formato do snapshot (VERSAO_SNAPSHOT) também o invalida.
+
+O arquivo é gerado pelo próprio sistema e não deve vir de fontes externas:
+como todo pickle, a leitura executa o que estiver serializado nele.
+"""
+
+import hashlib
+import os
+import pickle
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.definicao_campos import RegistroCampos
+from src.logger import logger
+
+# Início do arquivo de snapshot, seguido do pickle
+_ASSINATURA = b"PETMOD01"
+
+# Versão do conteúdo do snapshot; incrementada quando a estrutura gravada muda
+VERSAO_SNAPSHOT = 1
+
+# Tamanho, mtime (ns) e SHA-256 de cada CSV do modelo
+AssinaturaArquivo = Tuple[int, int, str]
+
+
+def _hash_arquivo(caminho: str) -> str:
+    with open(caminho, 'rb') as arquivo:
+        return hashlib.sha256(arquivo.read()).hexdigest()
+
+
+def assinar_tabelas(caminhos: Dict[str, str]) -> Dict[str, AssinaturaArquivo]:
+    """
+    Calcula a assinatura (tamanho, mtime, SHA-256) de cada tabela do modelo.
+
+    Args:
+        caminhos: Nome da tabela -> caminho do CSV.
+
+    Returns:
+        Nome da tabela -> assinatura do arquivo.
+    """
+    assinaturas = {}
+    for nome, caminho in caminhos.items():
+        estado = os.stat(caminho)
+        assinaturas[nome] = (estado.st_size, estado.st_mtime_ns, _hash_arquivo(caminho))
+    return assinaturas
+
+
+class SnapshotModelo:
+    """
+    Modelo relacional já carregado: linhas das tabelas e registro de definições.
+
+    Atributos:
+        assinaturas: Assinatura de cada CSV quando o snapshot foi gerado.
+        tabelas: Nome da tabela -> (colunas, linhas), com as linhas como listas
+                 de valores nativos (células vazias como NaN, como no pandas).
+        registro: RegistroCampos associado a partir das tabelas.
+    """
+
+    __slots__ = ('assinaturas', 'tabelas', 'registro')
+
+    def __init__(self, assinaturas: Dict[str, AssinaturaArquivo],
+                 tabelas: Dict[str, Tuple[List[str], List[List[Any]]]], registro: RegistroCampos):
+        self.assinaturas = assinaturas
+        self.tabelas = tabelas
+        self.registro = registro
+
+    def valido_para(self, caminhos: Dict[str, str]) -> bool:
+        """
+        Verifica se o snapshot corresponde ao conteúdo atual dos CSVs.
+
+        Arquivos com tamanho e mtime iguais aos registrados são aceitos sem
+        leitura; os demais, se o SHA-256 do conteúdo for o mesmo.
+        """
+        if set(caminhos) != set(self.assinaturas):
+            return False
+        for nome, caminho in caminhos.items():
+            tamanho, mtime_ns, hash_registrado = self.assinaturas[nome]
+            try:
+                estado = os.stat(caminho)
+                if estado.st_size != tamanho:
+                    return False
+                if estado.st_mtime_ns != mtime_ns and _hash_arquivo(caminho) != hash_registrado:
+                    return False
+            except OSError:
+                return False
+        return True
+
+    def salvar(self, caminho_snapshot: str) -> None:
+        """
+        Grava o snapshot (escrita em arquivo temporário e troca atômica).
+        """
+        temporario = f"{caminho_snapshot}.{os.getpid()}.tmp"
+        with open(temporario, 'wb') as arquivo:
+            arquivo.write(_ASSINATURA)
+            pickle.dump((VERSAO_SNAPSHOT, self.assinaturas, self.tabelas, self.registro),
+                        arquivo, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temporario, caminho_snapshot)
+
+    @classmethod
+    def abrir(cls, caminho_snapshot: str, caminhos: Dict[str, str]) -> Optional['SnapshotModelo']:
+        """
+        Lê um snapshot gravado; retorna None se o arquivo não existir, estiver
+        corrompido, for de outra versão ou não corresponder mais aos CSVs.
+        """
+        try:
+            with open(caminho_snapshot, 'rb') as arquivo:
+                if arquivo.read(len(_ASSINATURA)) != _ASSINATURA:
+                    return None
+                versao, assinaturas, tabelas, registro = pickle.load(arquivo)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"Snapshot do modelo de campos ilegível ({caminho_snapshot}): {str(e)}")
+            return None
+
+        if versao != VERSAO_SNAPSHOT:
+            return None
+        snapshot = cls(assinaturas, tabelas, registro)
+        return snapshot if snapshot.valido_para(caminhos) else None
+
+    def __repr__(self) -> str:
+        return f"SnapshotModelo({len(self.registro)} campos, tabelas={sorted(self.tabelas)})"
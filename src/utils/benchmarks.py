@@ -0,0 +1,381 @@
+"""
+Benchmarks do sistema de peticionamento.
+
+Cada benchmark é um subcomando que mede o tempo de uma parte do pipeline e
+confere se as implementações comparadas produzem o mesmo resultado.
+
+Uso:
+    python -m src.utils.benchmarks renderizacao --template <template.docx> --dados <dados.json> --registros 200
+    python -m src.utils.benchmarks formatacao --valores 1000000
+    python -m src.utils.benchmarks leitura_csv --linhas 1000000 --workers 8
+    python -m src.utils.benchmarks formato_legado --repeticoes 5
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+from typing import Dict, List, Any, Callable
+
+from docx.oxml.ns import qn
+
+# Adiciona o diretório pai ao path para importar módulos
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+import config
+from src.logger import configurar_logger
+
+
+def _cronometrar(funcao: Callable[[], Any], repeticoes: int) -> float:
+    """
+    Executa a função repetidas vezes e retorna o tempo total em segundos.
+    """
+    inicio = time.perf_counter()
+    for _ in range(repeticoes):
+        funcao()
+    return time.perf_counter() - inicio
+
+
+def extrair_textos_partes(caminho: str) -> Dict[str, List[str]]:
+    """
+    Extrai, do XML bruto de cada parte de texto do pacote (word/*.xml: corpo,
+    cabeçalhos, rodapés, notas), o texto de cada nó <w:t> em ordem de documento,
+    para comparação entre backends. Inclui os nós fora do alcance do
+    python-docx (controles de conteúdo, revisões, caixas de texto).
+
+    Args:
+        caminho: Caminho do documento DOCX.
+
+    Returns:
+        Dicionário nome da parte -> lista com o texto de cada nó <w:t>.
+    """
+    import zipfile
+    import xml.etree.ElementTree as ET
+
+    tag_texto = qn('w:t')
+    textos = {}
+    with zipfile.ZipFile(caminho) as pacote:
+        for nome in sorted(pacote.namelist()):
+            if not (nome.startswith('word/') and nome.endswith('.xml') and nome.count('/') == 1):
+                continue
+            raiz = ET.fromstring(pacote.read(nome))
+            nos = [no.text or "" for no in raiz.iter(tag_texto)]
+            if nos:
+                textos[nome] = nos
+    return textos
+
+
+def benchmark_renderizacao(args: argparse.Namespace) -> int:
+    """
+    Compara os backends de renderização "docx" e "xml" no mesmo template e registro.
+    """
+    from src.motor_regras import MotorRegras
+    from src.documento_processor import DocumentoProcessor
+    from src.documento_processor_xml import DocumentoProcessorXML
+
+    with open(args.dados, 'r', encoding='utf-8') as f:
+        dados = json.load(f)
+
+    motor_regras = MotorRegras(usar_modelo_relacional=True)
+    motor_regras.carregar_regras()
+    secoes_ativas = motor_regras.avaliar_secoes_ativas(dados)
+
+    resultados = {}
+    with tempfile.TemporaryDirectory() as diretorio:
+        for backend, classe in (('docx', DocumentoProcessor), ('xml', DocumentoProcessorXML)):
+            saida = os.path.join(diretorio, f"saida_{backend}.docx")
+            processador = classe(motor_regras=motor_regras)
+
+            def renderizar():
+                processador.processar_documento(args.template, dict(dados), list(secoes_ativas), saida)
+
+            # Primeira execução fora da medição: carrega e compila o template
+            renderizar()
+            tempo = _cronometrar(renderizar, args.registros)
+            resultados[backend] = {
+                'tempo': tempo,
+                'textos': extrair_textos_partes(saida),
+                'tamanho': os.path.getsize(saida)
+            }
+
+    print(f"\nRenderização de {args.registros} registro(s): {args.template}")
+    for backend, resultado in resultados.items():
+        por_registro = resultado['tempo'] / args.registros * 1000
+        print(f"  {backend:5s} {resultado['tempo']:8.3f} s  ({por_registro:.2f} ms/registro, {resultado['tamanho']} bytes)")
+    print(f"  Aceleração: {resultados['docx']['tempo'] / resultados['xml']['tempo']:.1f}x")
+
+    textos_docx = resultados['docx']['textos']
+    textos_xml = resultados['xml']['textos']
+    if textos_docx == textos_xml:
+        print("  Saídas equivalentes: texto idêntico em todos os nós <w:t> de todas as partes.")
+        return 0
+
+    print("  DIVERGÊNCIA entre as saídas:")
+    for parte in sorted(set(textos_docx) | set(textos_xml)):
+        a, b = textos_docx.get(parte, []), textos_xml.get(parte, [])
+        for indice in range(max(len(a), len(b))):
+            texto_a = a[indice] if indice < len(a) else None
+            texto_b = b[indice] if indice < len(b) else None
+            if texto_a != texto_b:
+                print(f"    [{parte} <w:t> #{indice}] docx={texto_a!r} xml={texto_b!r}")
+    return 1
+
+
+def benchmark_formatacao(args: argparse.Namespace) -> int:
+    """
+    Mede a vazão da formatação monetária (#.##0,00) e por extenso e confere
+    alguns valores de referência.
+    """
+    import random
+    from src.formatacao import formatar_moeda, formatar_moedas, valor_por_extenso
+
+    referencias = {
+        1234.5: ("R$ 1.234,50", "mil duzentos e trinta e quatro reais e cinquenta centavos"),
+        1000000: ("R$ 1.000.000,00", "um milhão de reais"),
+        2500000000.01: ("R$ 2.500.000.000,01", "dois bilhões e quinhentos milhões de reais e um centavo"),
+    }
+    divergencias = 0
+    for valor, (moeda, extenso) in referencias.items():
+        if formatar_moeda(valor) != moeda or valor_por_extenso(valor) != extenso:
+            print(f"  DIVERGÊNCIA em {valor}: {formatar_moeda(valor)!r} / {valor_por_extenso(valor)!r}")
+            divergencias += 1
+
+    gerador = random.Random(42)
+    valores = [round(gerador.uniform(0, 10_000_000), 2) for _ in range(args.valores)]
+
+    print(f"\nFormatação de {args.valores} valores")
+    for nome, funcao in (('moeda', formatar_moeda), ('extenso', valor_por_extenso)):
+        inicio = time.perf_counter()
+        for valor in valores:
+            funcao(valor)
+        tempo = time.perf_counter() - inicio
+        print(f"  {nome:13s} {tempo:8.3f} s  ({args.valores / tempo:,.0f} valores/s)")
+
+    inicio = time.perf_counter()
+    formatadas = formatar_moedas(valores)
+    tempo = time.perf_counter() - inicio
+    print(f"  {'moeda (lote)':13s} {tempo:8.3f} s  ({args.valores / tempo:,.0f} valores/s)")
+    if formatadas[:1000] != [formatar_moeda(valor) for valor in valores[:1000]]:
+        print("  DIVERGÊNCIA entre formatar_moedas e formatar_moeda")
+        divergencias += 1
+
+    return 1 if divergencias else 0
+
+
+def gerar_csv_sintetico(caminho: str, linhas: int, campos_definicao: Dict[str, Dict[str, Any]],
+                        separador: str = ';', semente: int = 42) -> List[str]:
+    """
+    Gera um CSV de entrevistas sintético com campos de cada tipo de campos_definicao
+    (inteiros, decimais, datas e textos, inclusive textos entre aspas com quebra de linha).
+
+    Returns:
+        Nomes das colunas geradas.
+    """
+    import csv
+    import random
+
+    gerador = random.Random(semente)
+    por_tipo: Dict[str, List[str]] = {}
+    for nome, definicao in campos_definicao.items():
+        por_tipo.setdefault(definicao.get('tipo', 'texto'), []).append(nome)
+
+    amostras = {
+        'integer': [str(n) for n in range(0, 5000, 7)] + ["", "null"],
+        'decimal': [f"{gerador.uniform(0, 20000):.2f}".replace('.', ',') for _ in range(500)] + ["R$ 1.234,56", "", "null"],
+        'date': [f"{gerador.randint(1, 28):02d}/{gerador.randint(1, 12):02d}/{gerador.randint(1990, 2024)}" for _ in range(500)] + [""],
+        'string': ["Sim", "Não", "São Paulo", "demissão sem justa causa", "texto; com separador",
+                   "linha 1\nlinha 2", 'aspas "internas"', ""],
+    }
+    colunas: List[str] = []
+    valores_coluna: List[List[str]] = []
+    for tipo, quantidade in (('integer', 4), ('decimal', 8), ('date', 2), ('string', 6)):
+        for nome in sorted(por_tipo.get(tipo, []))[:quantidade]:
+            colunas.append(nome)
+            valores_coluna.append(amostras[tipo])
+    colunas.append('coluna_fora_do_modelo')
+    valores_coluna.append(["a", "b", ""])
+
+    with open(caminho, 'w', encoding='utf-8', newline='') as arquivo:
+        escritor = csv.writer(arquivo, delimiter=separador, lineterminator='\n')
+        escritor.writerow(colunas)
+        escolher = gerador.choice
+        for _ in range(linhas):
+            escritor.writerow([escolher(valores) for valores in valores_coluna])
+    return colunas
+
+
+def benchmark_leitura_csv(args: argparse.Namespace) -> int:
+    """
+    Compara a leitura em fluxo (um processo) com a leitura paralela do
+    ProcessadorCSV num CSV sintético e confere se os registros são os mesmos.
+    """
+    from src.processador_csv import ProcessadorCSV
+
+    processador = ProcessadorCSV()
+    with tempfile.TemporaryDirectory() as diretorio:
+        caminho = args.arquivo or os.path.join(diretorio, "entrevistas_sinteticas.csv")
+        if not args.arquivo:
+            inicio = time.perf_counter()
+            colunas = gerar_csv_sintetico(caminho, args.linhas, processador.campos_definicao)
+            print(f"\nCSV sintético: {args.linhas} linhas, {len(colunas)} colunas, "
+                  f"{os.path.getsize(caminho) / 1e6:.1f} MB (gerado em {time.perf_counter() - inicio:.1f} s)")
+
+        resultados = {}
+        leituras = (
+            ('fluxo', lambda: processador.carregar_em_fluxo(caminho, separador=';')),
+            (f'paralela ({args.workers} proc.)', lambda: processador.carregar_em_paralelo(
+                caminho, workers=args.workers, separador=';',
+                tamanho_faixa=args.tamanho_faixa * 1024 * 1024 if args.tamanho_faixa else None)),
+        )
+        for nome, leitura in leituras:
+            inicio = time.perf_counter()
+            valores = [list(registro.values()) for registro in leitura()]
+            resultados[nome] = (time.perf_counter() - inicio, valores)
+
+    tempo_fluxo = resultados['fluxo'][0]
+    for nome, (tempo, valores) in resultados.items():
+        print(f"  {nome:22s} {tempo:8.2f} s  ({len(valores) / tempo:,.0f} linhas/s, {tempo_fluxo / tempo:.1f}x)")
+
+    listas = [valores for _, valores in resultados.values()]
+    if all(valores == listas[0] for valores in listas[1:]):
+        print("  Registros idênticos nas duas leituras.")
+        return 0
+    print("  DIVERGÊNCIA entre as leituras.")
+    return 1
+
+
+def _campo_por_filtros(adaptador: Any, campo_id: int) -> Any:
+    """
+    Informações de um campo montadas com filtros sobre os DataFrames do
+    adaptador, como em obter_campo_por_id antes do registro de definições.
+    """
+    import pandas as pd
+
+    campo = adaptador.campos[adaptador.campos['campo_id'] == campo_id]
+    if len(campo) == 0:
+        return None
+    resultado = campo.iloc[0].to_dict()
+    if 'tipo_dado_id' in resultado and pd.notna(resultado['tipo_dado_id']):
+        tipo = adaptador.tipos[adaptador.tipos['tipo_dado_id'] == int(resultado['tipo_dado_id'])]
+        if len(tipo) > 0:
+            resultado['tipo_dado_programacao'] = tipo.iloc[0]['nome_tipo']
+            resultado['mascara_formato'] = tipo.iloc[0]['mascara_formato'] if 'mascara_formato' in tipo.columns else ''
+    regras_campo = adaptador.regras[adaptador.regras['campo_id'] == campo_id]
+    if len(regras_campo) > 0:
+        resultado['obrigatorio_quando_ativo'] = regras_campo.iloc[0]['obrigatorio_quando_ativo'] == 'sim'
+        if pd.notna(regras_campo.iloc[0]['campo_vinculo_id']):
+            resultado['campo_vinculo_id'] = regras_campo.iloc[0]['campo_vinculo_id']
+            resultado['condicao_vinculo_tipo'] = regras_campo.iloc[0]['condicao_vinculo_tipo']
+            resultado['condicao_vinculo_valor'] = regras_campo.iloc[0]['condicao_vinculo_valor']
+    categorias_campo = adaptador.categorias[adaptador.categorias['campo_id'] == campo_id]
+    if len(categorias_campo) > 0:
+        resultado['categoria'] = categorias_campo.iloc[0]['categoria_1']
+        resultado['subcategoria'] = categorias_campo.iloc[0]['subcategoria_1'] if 'subcategoria_1' in categorias_campo.columns else ''
+    if 'campo_id' in adaptador.opcoes.columns:
+        opcoes_campo = adaptador.opcoes[adaptador.opcoes['campo_id'] == campo_id]
+        if len(opcoes_campo) > 0 and 'valor' in opcoes_campo.columns:
+            resultado['opcoes_lista_selecao'] = ';'.join(opcoes_campo['valor'].tolist())
+    return resultado
+
+
+def formato_legado_por_filtros(adaptador: Any) -> Dict[str, Any]:
+    """
+    Formato legado montado linha a linha, com um conjunto de filtros por campo
+    (a implementação de converter_para_formato_legado antes do registro de
+    definições), como referência de tempo e de resultado.
+    """
+    resultado: Dict[str, Any] = {"campos": {}, "campos_por_id": {}, "campos_por_categoria": {}}
+    for _, linha in adaptador.campos.iterrows():
+        campo_id = int(linha['campo_id'])
+        campo = _campo_por_filtros(adaptador, campo_id)
+        if campo and 'nome_campo' in campo:
+            resultado["campos"][campo['nome_campo']] = campo
+            resultado["campos_por_id"][str(campo_id)] = campo
+            if 'categoria' in campo and campo['categoria']:
+                resultado["campos_por_categoria"].setdefault(campo['categoria'], []).append(campo)
+    return resultado
+
+
+def _normalizar_valores(valor: Any) -> Any:
+    """
+    Converte recursivamente escalares do numpy/pandas para tipos nativos (NaN vira None).
+    """
+    from src.definicao_campos import valor_nativo
+
+    if isinstance(valor, dict):
+        return {valor_nativo(chave): _normalizar_valores(item) for chave, item in valor.items()}
+    if isinstance(valor, list):
+        return [_normalizar_valores(item) for item in valor]
+    return valor_nativo(valor)
+
+
+def benchmark_formato_legado(args: argparse.Namespace) -> int:
+    """
+    Compara converter_para_formato_legado (uma passagem pelo registro de
+    definições) com a montagem por filtros sobre os DataFrames e confere se
+    os mapeamentos são os mesmos.
+    """
+    from src.adaptador_modelo_relacional import AdaptadorModeloRelacional
+
+    adaptador = AdaptadorModeloRelacional()
+    print(f"\nFormato legado de {len(adaptador.campos)} campos ({args.repeticoes} repetições)")
+
+    referencia: Dict[str, Any] = {}
+    resultado: Dict[str, Any] = {}
+    tempos = {}
+    for nome, funcao in (('filtros', lambda: referencia.update(formato_legado_por_filtros(adaptador))),
+                         ('registro', lambda: resultado.update(adaptador.converter_para_formato_legado()))):
+        tempos[nome] = _cronometrar(funcao, args.repeticoes) / args.repeticoes
+    for nome, tempo in tempos.items():
+        print(f"  {nome:10s} {tempo * 1000:10.2f} ms  ({tempos['filtros'] / tempo:.0f}x)")
+
+    # A montagem por filtros mantém NaN e escalares do numpy; o registro, valores nativos.
+    # Categorias vazias (NaN) eram agrupadas pela referência e não existem no registro.
+    referencia_normalizada = _normalizar_valores(referencia)
+    referencia_normalizada["campos_por_categoria"].pop(None, None)
+    divergentes = [chave for chave in ("campos", "campos_por_id", "campos_por_categoria")
+                   if referencia_normalizada[chave] != resultado[chave]]
+    if divergentes:
+        print(f"  DIVERGÊNCIA em: {', '.join(divergentes)}")
+        return 1
+    print("  Mapeamentos idênticos nas duas implementações.")
+    return 0
+
+
+def main() -> int:
+    """
+    Função principal dos benchmarks.
+    """
+    parser = argparse.ArgumentParser(description="Benchmarks do sistema de peticionamento")
+    parser.add_argument('--debug', action='store_true', help='Ativa modo de depuração com logs mais detalhados')
+    subparsers = parser.add_subparsers(dest='benchmark', required=True)
+
+    parser_renderizacao = subparsers.add_parser('renderizacao', help='Compara os backends de renderização docx e xml')
+    parser_renderizacao.add_argument('--template', default=config.TEMPLATE_DOCX, help='Template DOCX')
+    parser_renderizacao.add_argument('--dados', default=config.DADOS_JSON, help='Arquivo JSON com um registro de dados')
+    parser_renderizacao.add_argument('--registros', type=int, default=100, help='Quantidade de registros renderizados por backend')
+    parser_renderizacao.set_defaults(funcao=benchmark_renderizacao)
+
+    parser_formatacao = subparsers.add_parser('formatacao', help='Mede a formatação monetária e por extenso')
+    parser_formatacao.add_argument('--valores', type=int, default=1000000, help='Quantidade de valores formatados')
+    parser_formatacao.set_defaults(funcao=benchmark_formatacao)
+
+    parser_leitura = subparsers.add_parser('leitura_csv', help='Compara a leitura de CSV em fluxo e em paralelo')
+    parser_leitura.add_argument('--linhas', type=int, default=1000000, help='Linhas do CSV sintético')
+    parser_leitura.add_argument('--arquivo', help='CSV existente (separador ";") em vez do sintético')
+    parser_leitura.add_argument('--workers', type=int, default=os.cpu_count() or 1, help='Processos da leitura paralela')
+    parser_leitura.add_argument('--tamanho-faixa', type=int, default=None, help='MB por faixa na leitura paralela')
+    parser_leitura.set_defaults(funcao=benchmark_leitura_csv)
+
+    parser_legado = subparsers.add_parser('formato_legado', help='Mede a conversão do modelo relacional para o formato legado')
+    parser_legado.add_argument('--repeticoes', type=int, default=3, help='Repetições de cada conversão')
+    parser_legado.set_defaults(funcao=benchmark_formato_legado)
+
+    args = parser.parse_args()
+    configurar_logger(args.debug)
+    return args.funcao(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
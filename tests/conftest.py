@@ -0,0 +1,45 @@
+"""
+Fixtures compartilhadas pelos testes.
+"""
+import docx
+import pytest
+from docx.oxml import parse_xml
+
+_W = 'xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"'
+
+
+@pytest.fixture
+def template_runs_aninhadas(tmp_path) -> str:
+    """
+    Template com placeholders em runs diretas, em controle de conteúdo (w:sdt),
+    em revisão inserida (w:ins, fragmentado com a run seguinte), em hyperlink e
+    em caixa de texto (parágrafo aninhado).
+    """
+    documento = docx.Document()
+    documento.sections[0].header.paragraphs[0].text = "Vara {{numero_vara}}"
+    documento.add_paragraph("Autor: {{nome_autor}}")
+
+    paragrafo = documento.add_paragraph()
+    paragrafo._p.append(parse_xml(f'<w:r {_W}><w:t xml:space="preserve">Cidade: </w:t></w:r>'))
+    paragrafo._p.append(parse_xml(f'<w:sdt {_W}><w:sdtPr/><w:sdtContent>'
+                                  f'<w:r><w:t>{{{{cidade_vara}}}}</w:t></w:r></w:sdtContent></w:sdt>'))
+
+    paragrafo = documento.add_paragraph()
+    paragrafo._p.append(parse_xml(f'<w:ins {_W} w:id="1" w:author="teste">'
+                                  f'<w:r><w:t xml:space="preserve">UF {{{{uf_</w:t></w:r></w:ins>'))
+    paragrafo._p.append(parse_xml(f'<w:r {_W}><w:t xml:space="preserve">vara}}}} fim</w:t></w:r>'))
+
+    paragrafo = documento.add_paragraph()
+    paragrafo._p.append(parse_xml(f'<w:hyperlink {_W}><w:r><w:t>{{{{numero_vara}}}}</w:t></w:r></w:hyperlink>'))
+
+    paragrafo = documento.add_paragraph()
+    paragrafo._p.append(parse_xml(f'<w:r {_W}><w:t xml:space="preserve">Antes {{{{nome_</w:t></w:r>'))
+    paragrafo._p.append(parse_xml(
+        f'<w:r {_W} xmlns:v="urn:schemas-microsoft-com:vml"><w:pict><v:shape><v:textbox><w:txbxContent>'
+        f'<w:p><w:r><w:t>Caixa {{{{cidade_vara}}}}</w:t></w:r></w:p>'
+        f'</w:txbxContent></v:textbox></v:shape></w:pict></w:r>'))
+    paragrafo._p.append(parse_xml(f'<w:r {_W}><w:t xml:space="preserve">autor}}}} depois</w:t></w:r>'))
+
+    caminho = str(tmp_path / 'template_runs_aninhadas.docx')
+    documento.save(caminho)
+    return caminho
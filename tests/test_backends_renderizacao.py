@@ -0,0 +1,45 @@
+"""
+Testes de equivalência dos backends de renderização docx e xml.
+"""
+import docx
+import pytest
+
+from src.documento_processor import DocumentoProcessor
+from src.documento_processor_xml import DocumentoProcessorXML
+from src.motor_regras import MotorRegras
+from src.plano_renderizacao import listar_paragrafos, listar_runs
+from src.utils.benchmarks import extrair_textos_partes
+
+_DADOS = {'nome_autor': 'Ana', 'cidade_vara': 'Campinas', 'uf_vara': 'SP', 'numero_vara': '2'}
+
+
+@pytest.fixture(scope='module')
+def motor_regras() -> MotorRegras:
+    return MotorRegras(usar_modelo_relacional=True)
+
+
+def _renderizar(classe, motor_regras, template: str, destino) -> None:
+    classe(motor_regras=motor_regras).processar_documento(template, dict(_DADOS), [], str(destino))
+
+
+def test_backends_preenchem_as_mesmas_runs(tmp_path, template_runs_aninhadas, motor_regras):
+    _renderizar(DocumentoProcessor, motor_regras, template_runs_aninhadas, tmp_path / 'docx.docx')
+    _renderizar(DocumentoProcessorXML, motor_regras, template_runs_aninhadas, tmp_path / 'xml.docx')
+
+    textos_docx = extrair_textos_partes(str(tmp_path / 'docx.docx'))
+    textos_xml = extrair_textos_partes(str(tmp_path / 'xml.docx'))
+    assert textos_docx == textos_xml
+
+    corpo = "|".join(textos_docx['word/document.xml'])
+    assert '{{' not in corpo and '}}' not in corpo
+    for esperado in ('Cidade: |Campinas', 'UF SP| fim', 'Antes Ana|Caixa Campinas| depois'):
+        assert esperado in corpo
+    assert textos_docx['word/header1.xml'] == ['Vara 2']
+
+
+def test_listar_runs_exclui_paragrafos_aninhados(template_runs_aninhadas):
+    documento = docx.Document(template_runs_aninhadas)
+    textos = ["".join(run.text for run in listar_runs(p)) for p in listar_paragrafos(documento.element.body)]
+    assert 'Cidade: {{cidade_vara}}' in textos
+    assert 'Antes {{nome_autor}} depois' in textos
+    assert 'Caixa {{cidade_vara}}' in textos
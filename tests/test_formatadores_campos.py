@@ -0,0 +1,34 @@
+"""
+Testes dos formatadores pré-compilados por campo (src/formatadores_campos.py).
+"""
+import math
+
+import pytest
+
+from src.formatadores_campos import (
+    FORMATO_EXTENSO, FORMATO_MONETARIO, FormatadorCampo, compilar_formatador, compilar_mascara
+)
+
+_NAO_NUMERICOS = [math.nan, math.inf, -math.inf, True, False, 10 ** 400]
+
+
+@pytest.mark.parametrize('valor', _NAO_NUMERICOS)
+def test_monetario_apresenta_nao_numericos_como_texto(valor):
+    assert FormatadorCampo('valor_causa', FORMATO_MONETARIO)(valor) == str(valor)
+
+
+@pytest.mark.parametrize('valor', _NAO_NUMERICOS + [1e15, 10 ** 20])
+def test_extenso_apresenta_nao_numericos_e_valores_grandes_como_texto(valor):
+    assert FormatadorCampo('valor_extenso', FORMATO_EXTENSO)(valor) == str(valor)
+
+
+@pytest.mark.parametrize('valor', _NAO_NUMERICOS)
+def test_mascara_de_digitos_apresenta_nao_numericos_como_texto(valor):
+    assert compilar_mascara('xxx.xxx.xxx-xx')(valor) == str(valor)
+
+
+def test_valores_numericos():
+    assert FormatadorCampo('valor_causa', FORMATO_MONETARIO)(1234.5) == "R$ 1.234,50"
+    assert FormatadorCampo('valor_extenso', FORMATO_EXTENSO)(999e12) == "novecentos e noventa e nove trilhões de reais"
+    assert compilar_mascara('xxx.xxx.xxx-xx')(12345678901) == "123.456.789-01"
+    assert compilar_formatador('salario_base')(None) == ""
@@ -0,0 +1,96 @@
+"""
+Testes do índice de linhas do CSV (src/indice_linhas_csv.py).
+"""
+import io
+import os
+import random
+
+import pandas as pd
+import pytest
+
+from src.indice_linhas_csv import IndiceLinhasCSV, caminho_indice, construir_indice, obter_indice
+from tests.test_largura_csv import csv_sorteado
+
+_CONTEUDOS = {
+    'aspas_isoladas': b'a;b\n1;tela 12" hd\n2;x\n3;y\n4;z\n',
+    'campo_com_quebra': b'a;b\n1;"x\ny"\n2;"aspas "" e ;"\n3;z',
+    'aspas_isoladas_e_campo_com_quebra': b'a;b\n1;tela 12" hd\n2;"x\ny"\n3;w\n',
+    'linhas_vazias_e_crlf': b'\xef\xbb\xbfa;b\r\n\r\n1;x\r\n\r\n2;y\r\n\n',
+    'so_cabecalho': b'a;b\n',
+}
+
+
+def _ler_todos(caminho: str) -> list:
+    return pd.read_csv(caminho, sep=';', dtype=str, keep_default_na=False,
+                       encoding='utf-8-sig').values.tolist()
+
+
+def _ler_pelo_indice(indice: IndiceLinhasCSV, caminho: str) -> list:
+    cabecalho = indice.ler_cabecalho()
+    registros = []
+    with open(caminho, 'rb') as arquivo:
+        for posicao in range(indice.total_registros):
+            inicio, fim = indice.faixa_bytes(posicao, posicao)
+            arquivo.seek(inicio)
+            df = pd.read_csv(io.BytesIO(cabecalho + arquivo.read(fim - inicio)), sep=';', dtype=str,
+                             keep_default_na=False, encoding='utf-8-sig')
+            assert len(df) == 1
+            registros.extend(df.values.tolist())
+    return registros
+
+
+@pytest.mark.parametrize('nome', sorted(_CONTEUDOS))
+def test_registros_do_indice_iguais_aos_do_pandas(tmp_path, nome):
+    caminho = str(tmp_path / 'dados.csv')
+    with open(caminho, 'wb') as arquivo:
+        arquivo.write(_CONTEUDOS[nome])
+
+    indice = construir_indice(caminho, ';')
+    esperados = _ler_todos(caminho)
+    assert indice.total_registros == len(esperados)
+    assert _ler_pelo_indice(indice, caminho) == esperados
+
+
+def test_faixa_fora_do_arquivo(tmp_path):
+    caminho = str(tmp_path / 'dados.csv')
+    with open(caminho, 'wb') as arquivo:
+        arquivo.write(_CONTEUDOS['aspas_isoladas'])
+
+    indice = construir_indice(caminho, ';')
+    assert indice.faixa_bytes(2, 3)[1] == os.path.getsize(caminho)
+    with pytest.raises(IndexError, match='Registros 4-5 fora do arquivo'):
+        indice.faixa_bytes(3, 4)
+
+
+def test_indice_gravado_reaproveitado_e_invalidado(tmp_path):
+    caminho = str(tmp_path / 'dados.csv')
+    with open(caminho, 'wb') as arquivo:
+        arquivo.write(_CONTEUDOS['campo_com_quebra'])
+
+    indice = obter_indice(caminho, ';', persistir=True)
+    assert os.path.exists(caminho_indice(caminho))
+    reaberto = IndiceLinhasCSV.abrir(caminho_indice(caminho), caminho, ';')
+    assert reaberto is not None
+    assert list(reaberto.inicios) == list(indice.inicios)
+    assert reaberto.fim_cabecalho == indice.fim_cabecalho
+
+    # Outro separador define outros limites de campos: o índice não é reaproveitado
+    assert IndiceLinhasCSV.abrir(caminho_indice(caminho), caminho, ',') is None
+
+    with open(caminho, 'ab') as arquivo:
+        arquivo.write(b'\n4;novo\n')
+    assert IndiceLinhasCSV.abrir(caminho_indice(caminho), caminho, ';') is None
+    assert obter_indice(caminho, ';', persistir=False).total_registros == 4
+
+
+@pytest.mark.parametrize('semente', range(50))
+def test_csv_sorteado_registros_iguais_aos_do_pandas(tmp_path, semente):
+    sorteio = random.Random(semente)
+    caminho = str(tmp_path / 'dados.csv')
+    with open(caminho, 'wb') as arquivo:
+        arquivo.write(csv_sorteado(sorteio, sorteio.randint(1, 4), com_excedente=False))
+
+    indice = construir_indice(caminho, ';')
+    esperados = _ler_todos(caminho)
+    assert indice.total_registros == len(esperados)
+    assert _ler_pelo_indice(indice, caminho) == esperados
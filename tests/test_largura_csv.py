@@ -0,0 +1,116 @@
+"""
+Testes da verificação de largura das linhas do CSV (src/largura_csv.py).
+"""
+import io
+import random
+
+import pandas as pd
+import pytest
+
+from src.exceptions import FormatoArquivoInvalidoError
+from src.largura_csv import FluxoLarguraVerificada, VerificadorLarguraCSV, largura_cabecalho
+
+
+def _verificar_em_blocos(conteudo: bytes, tamanho_bloco: int, separador: str = ';') -> None:
+    verificador = VerificadorLarguraCSV(separador, 'teste.csv')
+    for inicio in range(0, len(conteudo), tamanho_bloco):
+        verificador.verificar(conteudo[inicio:inicio + tamanho_bloco])
+
+
+def _ler_com_projecao(conteudo: bytes, usecols, separador: str = ';') -> pd.DataFrame:
+    fluxo = io.BufferedReader(FluxoLarguraVerificada(io.BytesIO(conteudo),
+                                                     VerificadorLarguraCSV(separador, 'teste.csv')))
+    return pd.read_csv(fluxo, sep=separador, dtype=str, keep_default_na=False, usecols=usecols)
+
+
+def test_largura_cabecalho_com_bom_e_aspas():
+    assert largura_cabecalho('﻿a;"b;c";d\n'.encode('utf-8'), ';') == 3
+
+
+@pytest.mark.parametrize('tamanho_bloco', [1, 2, 3, 7, 1024])
+def test_aspas_no_meio_do_campo_sao_texto(tamanho_bloco):
+    # Aspas isoladas no meio de campos não utilizados (regressão: abriam um campo entre aspas)
+    conteudo = (b'id;descricao;obs;nome\n'
+                b'1;x;monitor 12pol" hd;Ana\n'
+                b'2;tela 15" e cabo;y;Bia\n'
+                b'3;z;w;Caio\n')
+    _verificar_em_blocos(conteudo, tamanho_bloco)
+
+    projecao = _ler_com_projecao(conteudo, ['id', 'nome'])
+    completo = pd.read_csv(io.BytesIO(conteudo), sep=';', dtype=str, keep_default_na=False)
+    assert len(projecao) == 3
+    assert projecao.to_dict('records') == completo[['id', 'nome']].to_dict('records')
+
+
+@pytest.mark.parametrize('tamanho_bloco', [1, 2, 5, 1024])
+def test_campos_entre_aspas_nao_contam_separadores(tamanho_bloco):
+    conteudo = (b'a;b;c\n'
+                b'"1;2";"linha\nquebrada";"aspas "" e ;"\n'
+                b'"";x"y;"z"\n')
+    _verificar_em_blocos(conteudo, tamanho_bloco)
+
+
+@pytest.mark.parametrize('tamanho_bloco', [1, 4, 1024])
+def test_linha_com_campo_excedente(tamanho_bloco):
+    conteudo = b'a;b;c\n1;2;3\n4;5;6;7\n'
+    with pytest.raises(FormatoArquivoInvalidoError, match='esperados 3 campos na linha 3, encontrados 4'):
+        _verificar_em_blocos(conteudo, tamanho_bloco)
+
+
+def test_campo_excedente_apos_aspas_isoladas():
+    conteudo = b'a;b;c\n1;12" tela;3\n4;5;6;7\n'
+    with pytest.raises(FormatoArquivoInvalidoError, match='na linha 3, encontrados 4'):
+        _ler_com_projecao(conteudo, ['a'])
+
+
+def test_posicao_em_bytes_sem_numero_da_linha():
+    verificador = VerificadorLarguraCSV(';', 'teste.csv', largura=2, linha_inicial=None, posicao_inicial=100)
+    with pytest.raises(FormatoArquivoInvalidoError, match='na linha iniciada no byte 104'):
+        verificador.verificar(b'1;2\n3;4;5\n')
+
+
+def test_linhas_curtas_e_vazias_sao_aceitas():
+    _verificar_em_blocos(b'\n\na;b;c\n1\n\n2;3\n', 1024)
+
+
+# Campos válidos para o pandas: aspas isoladas no meio do campo, campos entre aspas com
+# separador, quebra de linha e aspas escapadas, e texto após o fechamento das aspas
+_CAMPOS_SORTEADOS = [b'x', b'12', b'', b'12" hd', b'a"', b'x"y"z', b'"q;r"', b'"a\nb"', b'"aa""b"',
+                     b'""', b'"x"resto', b'"\r\n;"']
+
+
+def csv_sorteado(sorteio, largura: int, com_excedente: bool) -> bytes:
+    """
+    CSV sorteado com cabeçalho de largura colunas; linhas curtas, vazias, CRLF e,
+    com com_excedente, talvez uma linha com um campo a mais (nunca a primeira de dados).
+    """
+    fim = sorteio.choice([b'\n', b'\r\n'])
+    linhas = [b';'.join(b'c%d' % coluna for coluna in range(largura))]
+    for _ in range(sorteio.randint(1, 8)):
+        if sorteio.random() < 0.1:
+            linhas.append(b'')
+            continue
+        quantidade = sorteio.randint(1, largura)
+        # Com um campo a mais na primeira linha de dados, o pandas usa a primeira coluna como índice
+        if com_excedente and any(linhas[1:]) and sorteio.random() < 0.2:
+            quantidade = largura + 1
+        linhas.append(b';'.join(sorteio.choice(_CAMPOS_SORTEADOS) for _ in range(quantidade)))
+    return fim.join(linhas) + fim * sorteio.randint(0, 1)
+
+
+@pytest.mark.parametrize('semente', range(100))
+def test_csv_sorteado_rejeitado_como_na_leitura_completa(semente):
+    sorteio = random.Random(semente)
+    conteudo = csv_sorteado(sorteio, sorteio.randint(1, 4), com_excedente=True)
+    try:
+        pd.read_csv(io.BytesIO(conteudo), sep=';', dtype=str, keep_default_na=False)
+        rejeitado = False
+    except pd.errors.ParserError:
+        rejeitado = True
+
+    for tamanho_bloco in (1, sorteio.randint(2, 9), 1024):
+        if rejeitado:
+            with pytest.raises(FormatoArquivoInvalidoError):
+                _verificar_em_blocos(conteudo, tamanho_bloco)
+        else:
+            _verificar_em_blocos(conteudo, tamanho_bloco)
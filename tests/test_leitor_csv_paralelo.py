@@ -0,0 +1,42 @@
+"""
+Testes da divisão do CSV em faixas da leitura paralela (src/leitor_csv_paralelo.py).
+"""
+import pandas as pd
+import pytest
+
+from src.leitor_csv_paralelo import dividir_em_faixas, ler_faixa
+
+_CONTEUDOS = {
+    'aspas_isoladas_e_campo_com_quebra': b'a;b\n1;tela 12" hd\n2;"x\ny"\n3;z\n4;"w;\n"""\n5;fim',
+    'aspas_escapadas': b'\xef\xbb\xbfa;b\n"1";"""x"""\n"2";"y\n""\n"\n3;12"\n',
+    'so_cabecalho': b'a;b',
+}
+
+
+@pytest.mark.parametrize('nome', sorted(_CONTEUDOS))
+def test_faixas_reproduzem_a_leitura_do_arquivo_inteiro(tmp_path, nome):
+    caminho = str(tmp_path / 'dados.csv')
+    with open(caminho, 'wb') as arquivo:
+        arquivo.write(_CONTEUDOS[nome])
+    esperados = pd.read_csv(caminho, sep=';', dtype=str, keep_default_na=False,
+                            encoding='utf-8-sig').values.tolist()
+
+    for tamanho_faixa in range(1, len(_CONTEUDOS[nome]) + 2):
+        cabecalho, faixas = dividir_em_faixas(caminho, tamanho_faixa, ';')
+        registros = []
+        for inicio, fim in faixas:
+            registros.extend(ler_faixa(caminho, inicio, fim, cabecalho, ';').values.tolist())
+        assert registros == esperados, (tamanho_faixa, faixas)
+
+
+def test_faixas_contiguas_a_partir_do_cabecalho(tmp_path):
+    caminho = str(tmp_path / 'dados.csv')
+    conteudo = b'a;b\n' + b''.join(b'%d;linha %d"\n' % (i, i) for i in range(100))
+    with open(caminho, 'wb') as arquivo:
+        arquivo.write(conteudo)
+
+    cabecalho, faixas = dividir_em_faixas(caminho, 64, ';')
+    assert cabecalho == b'a;b\n'
+    assert faixas[0][0] == len(cabecalho) and faixas[-1][1] == len(conteudo)
+    assert all(fim == inicio for (_, fim), (inicio, _) in zip(faixas, faixas[1:]))
+    assert all(conteudo[fim - 1:fim] == b'\n' for _, fim in faixas)
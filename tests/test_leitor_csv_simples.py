@@ -0,0 +1,122 @@
+"""
+Testes de paridade da leitura de CSV com o módulo csv (src/leitor_csv_simples.py)
+com o pandas.read_csv.
+"""
+import io
+import math
+import random
+
+import pandas as pd
+import pytest
+
+from src.exceptions import FormatoArquivoInvalidoError
+from src.leitor_csv_simples import VALORES_NA_PADRAO, iterar_blocos_csv, ler_tabela_csv, nomes_colunas
+
+_TABELAS = {
+    'inteiros': 'id;quantidade\n1;10\n2;-3\n3;+7\n',
+    'inteiros_com_nulos': 'id;quantidade\n1;10\n2;\n3;NA\n4;null\n',
+    'decimais': 'valor;taxa;limite\n1.5;1e3;inf\n.5;-2.25E-2;-inf\n3;7.;Infinity\n',
+    'booleanos': 'ativo;misto;com_nulo\nTrue;true;FALSE\nfalse;TRUE;\nTRUE;False;false\n',
+    'textos': 'nome;obs\nAna;"a;b"\nBia;"linha\nquebrada"\nCaio;"aspas "" internas"\n',
+    'textos_e_numeros': 'codigo;valor\n001;1\nabc;2.5\n7;x\n',
+    'nulos_padrao': 'texto;numero\n' + ''.join(f'{valor};{numero}\n' for numero, valor in
+                                                enumerate(sorted(VALORES_NA_PADRAO - {''}))),
+    'so_nulos': 'a;b\n;NA\n;\n',
+    'cabecalho_vazio_e_repetido': 'a;;a;b;a;\n1;2;3;4;5;6\n',
+    'linhas_vazias_e_curtas': '\na;b;c\n\n1;2;3\n4\n\n5;6\n',
+    'linhas_so_com_espacos': '  \na;b\n1;2\n \t \n"  "\n  ;\n3;4\n',
+    'bom_e_crlf': '﻿a;b\r\n1;x\r\n2;y\r\n',
+    'aspas_isoladas': 'a;b\n1;tela 12" hd\n2;x\n',
+    'so_cabecalho': 'a;b\n',
+}
+
+
+def _valores(linhas):
+    """Valores comparáveis: NaN (de qualquer tipo) vira a string 'NaN'."""
+    return [['NaN' if isinstance(valor, float) and math.isnan(valor) else valor for valor in linha]
+            for linha in linhas]
+
+
+def _escrever(tmp_path, conteudo: str) -> str:
+    caminho = str(tmp_path / 'tabela.csv')
+    with open(caminho, 'w', encoding='utf-8', newline='') as arquivo:
+        arquivo.write(conteudo)
+    return caminho
+
+
+@pytest.mark.parametrize('nome', sorted(_TABELAS))
+def test_ler_tabela_csv_como_pandas(tmp_path, nome):
+    caminho = _escrever(tmp_path, _TABELAS[nome])
+    df = pd.read_csv(caminho, sep=';', encoding='utf-8-sig')
+
+    colunas, linhas = ler_tabela_csv(caminho, ';')
+    assert colunas == list(df.columns)
+    assert _valores(linhas) == _valores(df.astype(object).values.tolist())
+    # Mesmos tipos nativos que o pandas devolve por coluna (int, float, bool ou texto)
+    for posicao, coluna in enumerate(colunas):
+        tipos = {type(linha[posicao]) for linha in linhas if linha[posicao] == linha[posicao]}
+        tipos_pandas = {type(valor) for valor in df[coluna].tolist() if valor == valor}
+        assert tipos == tipos_pandas, coluna
+
+
+@pytest.mark.parametrize('nome', sorted(_TABELAS))
+@pytest.mark.parametrize('tamanho_bloco', [1, 2, 1000])
+def test_iterar_blocos_csv_como_pandas(nome, tamanho_bloco):
+    conteudo = _TABELAS[nome]
+    blocos_pandas = pd.read_csv(io.StringIO(conteudo), sep=';', dtype=str, keep_default_na=False,
+                                na_filter=False, chunksize=tamanho_bloco)
+    esperados = [(list(df.columns), df.values.tolist()) for df in blocos_pandas]
+
+    arquivo = io.StringIO(conteudo.removeprefix('﻿'), newline='')
+    obtidos = list(iterar_blocos_csv(arquivo, ';', tamanho_bloco))
+    if not esperados[0][1]:
+        # Sem linhas de dados, o pandas ainda entrega um bloco vazio
+        assert obtidos == []
+    else:
+        assert obtidos == esperados
+
+
+def test_iterar_blocos_csv_com_filtro_de_colunas():
+    conteudo = _TABELAS['cabecalho_vazio_e_repetido'] + '7;8;9;10;11;12\n'
+    filtro = lambda coluna: coluna in {'a.1', 'b', 'Unnamed: 5'}
+    df = pd.read_csv(io.StringIO(conteudo), sep=';', dtype=str, keep_default_na=False, usecols=filtro)
+
+    assert list(iterar_blocos_csv(io.StringIO(conteudo, newline=''), ';', 10, filtro)) == \
+        [(list(df.columns), df.values.tolist())]
+
+
+@pytest.mark.parametrize('conteudo', ['a;b\n1;2\n3;4;5\n', 'a;b\n1;2\n3;"4;x";5\n'])
+def test_linha_com_campo_excedente(tmp_path, conteudo):
+    with pytest.raises(pd.errors.ParserError, match='Expected 2 fields in line 3, saw 3'):
+        pd.read_csv(io.StringIO(conteudo), sep=';')
+
+    with pytest.raises(FormatoArquivoInvalidoError, match='esperados 2 campos na linha 3, encontrados 3'):
+        ler_tabela_csv(_escrever(tmp_path, conteudo), ';')
+    with pytest.raises(FormatoArquivoInvalidoError, match='esperados 2 campos na linha 3, encontrados 3'):
+        list(iterar_blocos_csv(io.StringIO(conteudo, newline=''), ';', 10))
+
+
+@pytest.mark.parametrize('cabecalho', ['a;;a;a.1;a', 'a;a;a.1', 'a.1;a;a', 'a;a;a;a.1;a.2',
+                                       'x;;Unnamed: 1', 'Unnamed: 1;', ';;b;b'])
+def test_nomes_colunas_como_pandas(cabecalho):
+    assert nomes_colunas(cabecalho.split(';')) == list(
+        pd.read_csv(io.StringIO(cabecalho + '\n'), sep=';').columns)
+
+
+_VALORES_SORTEADOS = ['0', '12', '-7', '+3', '007', '1.5', '-.25', '3.', '1e5', '2E-3', 'inf', '-Infinity',
+                      'True', 'false', 'TRUE', 'NA', 'null', 'nan', '', 'abc', '1,5', ' 4', '2.5\t', 'iNf',
+                      ' inf', ' True', 'NA ', '  ', '٣', 'x y', '"q;r"']
+
+
+@pytest.mark.parametrize('semente', range(100))
+def test_ler_tabela_csv_sorteada_como_pandas(tmp_path, semente):
+    sorteio = random.Random(semente)
+    # Cada coluna sorteia valores de um subconjunto (colunas só numéricas, só booleanas, mistas...)
+    opcoes = [sorteio.sample(_VALORES_SORTEADOS, sorteio.randint(1, 4)) for _ in range(5)]
+    linhas = [';'.join(sorteio.choice(opcao) for opcao in opcoes) for _ in range(sorteio.randint(1, 8))]
+    caminho = _escrever(tmp_path, 'a;b;c;d;e\n' + '\n'.join(linhas) + '\n')
+    df = pd.read_csv(caminho, sep=';')
+
+    colunas, obtidas = ler_tabela_csv(caminho, ';')
+    assert colunas == list(df.columns)
+    assert _valores(obtidas) == _valores(df.astype(object).values.tolist())
@@ -0,0 +1,123 @@
+"""
+Testes da leitura em fluxo de JSON (src/leitor_json.py): o resultado não pode
+depender de onde as leituras cortam o conteúdo (números, literais, strings e
+caracteres UTF-8 de vários bytes divididos entre leituras).
+"""
+import io
+import json
+import random
+
+import pytest
+
+from src.exceptions import DadosInvalidosError, FormatoArquivoInvalidoError
+from src.leitor_json import (FORMATO_ARRAY, FORMATO_NDJSON, FORMATO_OBJETO, _iterar_valores, _ProgressoLeitura,
+                             detectar_formato_json, iterar_registros_json)
+
+_TAMANHOS_BUFFER = [1, 2, 3, 5, 7, 16, 4096]
+
+_VALORES = [
+    {"nome": "João Ação", "emoji": "😀", "escape": "ç\"]},", "vazio": ""},
+    12345,
+    -0.5e+10,
+    1.5,
+    0,
+    1e-3,
+    123456789012345678901234567890,
+    True,
+    False,
+    None,
+    [],
+    {},
+    [1, [2.25, {"a": [None]}], "x"],
+    "texto com ] , e \" no meio",
+]
+
+
+def _ler_valores(conteudo: bytes, tamanho_buffer: int, dentro_de_array: bool, ler_tudo: bool = False):
+    # Fluxo que devolve no máximo tamanho_buffer bytes por leitura, com ou sem read1
+    arquivo = io.BytesIO(conteudo)
+    if ler_tudo:
+        arquivo = io.BufferedReader(io.BytesIO(conteudo), buffer_size=1)
+    progresso = _ProgressoLeitura("teste", len(conteudo), 1000)
+    return list(_iterar_valores(arquivo, "teste", progresso, tamanho_buffer, dentro_de_array))
+
+
+@pytest.mark.parametrize('tamanho_buffer', _TAMANHOS_BUFFER)
+@pytest.mark.parametrize('bom', [b'', b'\xef\xbb\xbf'])
+def test_array_em_qualquer_corte(tamanho_buffer, bom):
+    for separadores, recuo in [((',', ':'), None), ((', ', ': '), None), ((',', ': '), 2)]:
+        conteudo = bom + json.dumps(_VALORES, ensure_ascii=False, separators=separadores, indent=recuo).encode()
+        assert _ler_valores(conteudo, tamanho_buffer, True) == _VALORES
+        assert _ler_valores(conteudo, tamanho_buffer, True, ler_tudo=True) == _VALORES
+
+
+@pytest.mark.parametrize('tamanho_buffer', _TAMANHOS_BUFFER)
+def test_valores_concatenados_em_qualquer_corte(tamanho_buffer):
+    conteudo = '\n'.join(json.dumps(valor, ensure_ascii=False) for valor in _VALORES).encode()
+    assert _ler_valores(conteudo, tamanho_buffer, False) == _VALORES
+    # Números e literais separados só por um espaço, cortados em qualquer byte
+    assert _ler_valores(b'12 345 1e5 1.25 -7 true null 0', tamanho_buffer, False) == \
+        [12, 345, 1e5, 1.25, -7, True, None, 0]
+    assert _ler_valores(b'[] [1.5e2,2] []', tamanho_buffer, False) == [[], [150.0, 2], []]
+
+
+@pytest.mark.parametrize('semente', range(30))
+def test_conteudo_sorteado_em_qualquer_corte(semente):
+    sorteio = random.Random(semente)
+
+    def valor_sorteado(profundidade=0):
+        tipo = sorteio.randrange(8 if profundidade < 3 else 6)
+        if tipo == 0:
+            return sorteio.randint(-10 ** 6, 10 ** 6)
+        if tipo == 1:
+            return sorteio.choice([0.5, -1e-7, 3.14159, 2.5e300, -0.0])
+        if tipo == 2:
+            return sorteio.choice([True, False, None])
+        if tipo in (3, 4, 5):
+            return ''.join(sorteio.choice('aç"\\]},:😀 ') for _ in range(sorteio.randint(0, 6)))
+        if tipo == 6:
+            return [valor_sorteado(profundidade + 1) for _ in range(sorteio.randint(0, 3))]
+        return {f"c{i}": valor_sorteado(profundidade + 1) for i in range(sorteio.randint(0, 3))}
+
+    valores = [valor_sorteado() for _ in range(sorteio.randint(0, 10))]
+    conteudo = json.dumps(valores, ensure_ascii=sorteio.random() < 0.5,
+                          indent=sorteio.choice([None, 1])).encode()
+    assert _ler_valores(conteudo, sorteio.randint(1, 20), True) == json.loads(conteudo)
+
+
+@pytest.mark.parametrize('tamanho_buffer', _TAMANHOS_BUFFER)
+@pytest.mark.parametrize('conteudo, mensagem', [
+    (b'[1, 2', 'array não encerrado'),
+    (b'[{"a": 1}', 'array não encerrado'),
+    (b'[1 2]', "esperado ',' ou ']' após o elemento 1"),
+    (b'[1] x', 'conteúdo após o fim do array'),
+    (b'[1,]', 'Expecting value'),
+    (b'[1e]', "esperado ',' ou ']' após o elemento 1"),
+    (b'[{"a": 1,}]', 'Expecting'),
+    (b'x[1]', "esperado '\\[' no início do array"),
+])
+def test_array_invalido(tamanho_buffer, conteudo, mensagem):
+    with pytest.raises(ValueError):
+        json.loads(conteudo)
+    with pytest.raises(FormatoArquivoInvalidoError, match=mensagem):
+        _ler_valores(conteudo, tamanho_buffer, True)
+
+
+@pytest.mark.parametrize('tamanho_buffer', [1, 3, 4096])
+def test_iterar_registros_json_por_formato(tamanho_buffer):
+    registros = [{"id": 1, "nome": "Ana"}, {"id": 2, "nome": "Bia 😀", "valor": 1.5e3}]
+    conteudos = {
+        FORMATO_ARRAY: json.dumps(registros, ensure_ascii=False, indent=2),
+        FORMATO_NDJSON: '\n'.join(json.dumps(registro, ensure_ascii=False) for registro in registros) + '\n',
+        FORMATO_OBJETO: json.dumps(registros[0], indent=2) + '\n' + json.dumps(registros[1], indent=2),
+    }
+    for formato, texto in conteudos.items():
+        arquivo = io.BufferedReader(io.BytesIO(texto.encode()))
+        assert detectar_formato_json(arquivo) == formato
+        assert list(iterar_registros_json(arquivo, "teste", tamanho_buffer=tamanho_buffer)) == registros
+
+
+def test_iterar_registros_json_registro_que_nao_e_objeto():
+    arquivo = io.BufferedReader(io.BytesIO(b'[{"id": 1}, 2]'))
+    with pytest.raises(DadosInvalidosError, match='Registro 2 de teste não é um objeto JSON: int'):
+        list(iterar_registros_json(arquivo, "teste", tamanho_buffer=2))
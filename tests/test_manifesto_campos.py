@@ -0,0 +1,27 @@
+"""
+Testes do manifesto de campos do template (src/manifesto_campos.py).
+"""
+import pytest
+
+from src.documento_processor_xml import DocumentoProcessorXML
+from src.manifesto_campos import ManifestoCampos, construir_manifesto
+from src.motor_regras import MotorRegras
+
+
+@pytest.fixture(scope='module')
+def motor_regras() -> MotorRegras:
+    return MotorRegras(usar_modelo_relacional=True)
+
+
+def test_manifesto_do_backend_xml_inclui_campos_em_sdt_e_ins(template_runs_aninhadas, motor_regras):
+    processador = DocumentoProcessorXML(motor_regras=motor_regras)
+    manifesto = construir_manifesto(template_runs_aninhadas, motor_regras, processador)
+
+    assert {'nome_autor', 'cidade_vara', 'uf_vara', 'numero_vara'} <= manifesto.campos_template
+    assert manifesto.campos_processador == processador.campos_condicionais()
+
+
+def test_filtro_colunas_ignora_espacos_nas_bordas():
+    filtro = ManifestoCampos(['cidade_vara'], ['uf_vara']).filtro_colunas()
+    assert filtro(' cidade_vara ') and filtro('uf_vara')
+    assert not filtro('numero_vara')
@@ -0,0 +1,85 @@
+"""
+Testes dos registros colunares (src/registro_lote.py): cada RegistroLinha deve
+se comportar como o dicionário dict(zip(chaves, linha)) que substitui.
+"""
+import math
+import pickle
+
+import pytest
+
+from src.registro_lote import RegistroLinha, RegistroLote
+
+_CHAVES = ['nome', 'idade', 'ativo', 'salario', 'idade']
+_LINHAS = [
+    ['Ana', 30, True, 1500.5, 31],
+    ['Bia', None, False, math.nan, 42],
+    ['Caio', 25, True, 0.0, 26],
+]
+
+
+def _lote() -> RegistroLote:
+    return RegistroLote(_CHAVES, [list(coluna) for coluna in zip(*_LINHAS)])
+
+
+@pytest.mark.parametrize('indice', range(len(_LINHAS)))
+def test_registro_linha_como_dicionario(indice):
+    registro = _lote()[indice]
+    esperado = dict(zip(_CHAVES, _LINHAS[indice]))
+
+    assert isinstance(registro, RegistroLinha)
+    assert list(registro) == list(esperado)
+    assert len(registro) == len(esperado)
+    assert list(registro.keys()) == list(esperado.keys())
+    assert list(registro.items()) == list(esperado.items())
+    assert list(registro.values()) == list(esperado.values())
+    for chave in esperado:
+        assert chave in registro
+        assert registro[chave] is esperado[chave]
+        assert registro.get(chave, 'padrao') is esperado[chave]
+    # Com nomes repetidos, vale a última coluna
+    assert registro['idade'] == _LINHAS[indice][4]
+
+    assert 'inexistente' not in registro
+    assert registro.get('inexistente') is None
+    assert registro.get('inexistente', 'padrao') == 'padrao'
+    with pytest.raises(KeyError):
+        registro['inexistente']
+
+
+def test_registro_linha_copia_independente():
+    lote = _lote()
+    copia = lote[0].copy()
+    assert type(copia) is dict
+    assert copia == dict(zip(_CHAVES, _LINHAS[0]))
+
+    copia['nome'] = 'Outra'
+    assert lote[0]['nome'] == 'Ana'
+    assert lote[0] == dict(zip(_CHAVES, _LINHAS[0]))
+
+
+def test_registro_linha_pickle_vira_dicionario():
+    registro = _lote()[2]
+    restaurado = pickle.loads(pickle.dumps(registro))
+    assert type(restaurado) is dict
+    assert restaurado == dict(zip(_CHAVES, _LINHAS[2]))
+
+
+def test_registro_lote_indices():
+    lote = _lote()
+    assert len(lote) == 3
+    assert [registro['nome'] for registro in lote] == ['Ana', 'Bia', 'Caio']
+    assert lote[-1]['nome'] == 'Caio'
+    assert lote[-3]['nome'] == 'Ana'
+    assert [registro['nome'] for registro in lote[1:]] == ['Bia', 'Caio']
+    assert [registro['nome'] for registro in lote[::-2]] == ['Caio', 'Ana']
+    assert lote[5:] == []
+    for indice in (3, -4):
+        with pytest.raises(IndexError, match='fora do lote'):
+            lote[indice]
+
+
+def test_registro_lote_sem_colunas():
+    lote = RegistroLote([], [], total_linhas=2)
+    assert len(lote) == 2
+    assert [dict(registro) for registro in lote] == [{}, {}]
+    assert len(RegistroLote([], [])) == 0